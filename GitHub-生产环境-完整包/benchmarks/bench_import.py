@@ -0,0 +1,72 @@
+"""模块导入耗时基准
+
+在新的解释器进程中用 -X importtime 导入各入口模块，输出多次运行的中位耗时和
+自身之外开销最大的依赖，用于跟踪命令行任务的启动开销。
+给出 --max-ms 时任一模块超过上限即返回非零状态。
+
+用法：python benchmarks/bench_import.py --repeat 5 --max-ms 1500
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "src.cli",
+    "src.models.database",
+    "src.processors.analysis",
+    "src.processors.paper_processor",
+]
+
+def import_times(module: str):
+    """导入一个模块，返回 {模块名: 累计耗时(微秒)}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description="模块导入耗时基准")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="每个模块列出的最慢顶层依赖数")
+    parser.add_argument("--max-ms", type=float, default=None, help="单个模块导入耗时上限（毫秒）")
+    args = parser.parse_args()
+
+    failed = []
+    for module in MODULES:
+        runs = [import_times(module) for _ in range(args.repeat)]
+        total = statistics.median(run[module] for run in runs) / 1000
+        print(f"{module:<34} {total:8.1f} ms")
+
+        # 顶层第三方依赖（不含本项目模块）按中位耗时排序
+        dependencies = {}
+        for name in runs[-1]:
+            top = name.split(".")[0]
+            if name == top and top != "src":
+                dependencies[top] = statistics.median(run.get(top, 0) for run in runs) / 1000
+        for name, elapsed in sorted(dependencies.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"    {name:<30} {elapsed:8.1f} ms")
+
+        if args.max_ms is not None and total > args.max_ms:
+            failed.append(module)
+
+    if failed:
+        print(f"over {args.max_ms} ms: {', '.join(failed)}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""基准测试套件
+
+在 benchmarks/synthetic.py 生成的确定性语料上，按多个规模测量热点路径：
+逐篇入库（add_paper）、本地论文管理器的搜索查询、文本预处理、主题建模、
+引文网络和作者合作网络分析、综合报告和每日报告生成，另记录入口模块的导入耗时。
+
+除入库只测一次外，每项取 --repeat 次运行中的最短耗时。缺少 NLTK 数据等资源的
+基准记为跳过（结果中为 {"skipped": 原因}），不参与比较。结果写入 JSON；
+给出 --baseline（之前某次运行的结果文件）时，耗时超过基线 (1 + tolerance) 倍
+且差值超过 min_delta 秒的项视为回归；thresholds.json 中的 limits 为每项每篇
+论文的耗时上限（毫秒）。存在回归或超限时返回非零状态。
+
+用法：python benchmarks/run.py --scales 100 500 2000 --baseline old.json --output new.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+from sqlalchemy.orm import selectinload
+from benchmarks.bench_import import MODULES, import_times
+from benchmarks.synthetic import generate_corpus
+from src.models.database import DatabaseManager, Paper
+from src.processors.analysis import PaperAnalyzer
+from src.processors.paper_processor import PaperProcessor
+from src.processors.report_dag import to_records
+from src.tools.paper_queries import query_papers, search_papers
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SEARCH_KEYWORDS = {
+    "computer_vision": ["segmentation", "transformer", "stereo"],
+    "industrial_vision": ["defect", "inspection", "weld"],
+    "medical_imaging": ["mri", "lesion", "tumor"],
+}
+
+class Context:
+    """一个规模下各项基准共用的语料、数据库和工作目录"""
+
+    def __init__(self, scale: int, seed: int, workdir: str, workers):
+        self.scale = scale
+        self.workers = workers
+        self.workdir = workdir
+        # 发布日期集中在约 scale / 50 天内，使每日报告的规模接近实际的日更量
+        self.corpus = generate_corpus(scale, seed, days=max(30, scale // 50))
+        self.db = DatabaseManager(f"sqlite:///{os.path.join(workdir, 'papers.db')}")
+        self.records = None
+        self.analyzers: List[PaperAnalyzer] = []
+
+    def analyzer(self, db_manager=None, **options) -> PaperAnalyzer:
+        """创建不缓存分析结果的分析器，在本轮计时结束后关闭其预处理进程池"""
+        analyzer = PaperAnalyzer(db_manager, result_cache_bytes=0, **options)
+        self.analyzers.append(analyzer)
+        return analyzer
+
+    def close_analyzers(self):
+        for analyzer in self.analyzers:
+            analyzer.close()
+        self.analyzers.clear()
+
+    def processor_config(self) -> Dict:
+        """论文处理器配置：分类模型和突发词状态指向工作目录中不存在的文件，只使用关键词规则"""
+        return {
+            "classification": {"categories": [], "model_path": os.path.join(self.workdir, "no_model.joblib")},
+            "search": {"keywords": SEARCH_KEYWORDS},
+            "burst": {"state_path": os.path.join(self.workdir, "no_bursts.npz")},
+        }
+
+    def tempdir(self) -> str:
+        return tempfile.mkdtemp(dir=self.workdir)
+
+    def load_records(self):
+        """入库后一次性读出全部论文（含作者、参考文献）"""
+        session = self.db.Session()
+        try:
+            papers = session.query(Paper).options(
+                selectinload(Paper.authors), selectinload(Paper.references), selectinload(Paper.keywords)
+            ).order_by(Paper.id).all()
+            self.records = to_records(papers)
+        finally:
+            session.close()
+
+# 每项基准接收 Context，完成准备工作后返回被计时的函数，以及处理的条目数
+
+def bench_add_paper(ctx: Context):
+    def run():
+        for paper in ctx.corpus:
+            ctx.db.add_paper(paper)
+    return run, ctx.scale
+
+def bench_viewer_search(ctx: Context):
+    author = Counter(a for p in ctx.corpus for a in p['authors']).most_common(1)[0][0]
+    queries = ["segmentation", "thermal runaway", "zzz-no-match", author]
+
+    def run():
+        session = ctx.db.Session()
+        try:
+            query_papers(session).all()
+            for text in queries:
+                search_papers(session, text).all()
+        finally:
+            session.close()
+    return run, len(queries) + 1
+
+def bench_preprocess_text(ctx: Context):
+    analyzer = ctx.analyzer()
+    analyzer.stop_words  # NLTK 资源的加载不计入
+    documents = [f"{p['title']} {p['abstract']}" for p in ctx.corpus]
+
+    def run():
+        for document in documents:
+            analyzer.preprocess_text(document)
+    return run, len(documents)
+
+def bench_topic_modeling(ctx: Context):
+    analyzer = ctx.analyzer(cache_dir=ctx.tempdir())
+    return lambda: analyzer.topic_modeling(ctx.records), len(ctx.records)
+
+def bench_citation_network(ctx: Context):
+    analyzer = ctx.analyzer()
+    return lambda: analyzer.citation_network_analysis(ctx.records), len(ctx.records)
+
+def bench_author_network(ctx: Context):
+    analyzer = ctx.analyzer()
+    return lambda: analyzer.author_collaboration_analysis(ctx.records), len(ctx.records)
+
+def bench_comprehensive_report(ctx: Context):
+    # 每次使用新的缓存目录；分词结果缓存在数据库中，重复运行时命中
+    analyzer = ctx.analyzer(ctx.db, cache_dir=ctx.tempdir())
+    output_dir = ctx.tempdir()
+    return (lambda: analyzer.generate_comprehensive_report(ctx.records, output_dir, max_workers=ctx.workers),
+            len(ctx.records))
+
+def bench_daily_report(ctx: Context):
+    processor = PaperProcessor(ctx.processor_config(), ctx.db)
+    days = Counter(p.published_date.date() for p in ctx.records)
+    day, count = days.most_common(1)[0]
+    output_dir = ctx.tempdir()
+    day = datetime.combine(day, datetime.min.time())
+    return (lambda: processor.generate_daily_report_from_db(output_dir, day, ('md', 'html', 'json'), bursts=[]),
+            count)
+
+BENCHMARKS: List[tuple] = [
+    ("add_paper", bench_add_paper),
+    ("viewer_search", bench_viewer_search),
+    ("preprocess_text", bench_preprocess_text),
+    ("topic_modeling", bench_topic_modeling),
+    ("citation_network", bench_citation_network),
+    ("author_network", bench_author_network),
+    ("comprehensive_report", bench_comprehensive_report),
+    ("daily_report", bench_daily_report),
+]
+
+# 修改数据库、只能运行一次的基准
+SINGLE_RUN = {"add_paper"}
+
+def measure(setup: Callable, ctx: Context, repeat: int) -> Dict:
+    best = None
+    for _ in range(repeat):
+        func, items = setup(ctx)
+        try:
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        finally:
+            ctx.close_analyzers()
+        best = elapsed if best is None else min(best, elapsed)
+    return {"seconds": best, "items": items, "ms_per_item": best * 1000 / max(items, 1)}
+
+def run_suite(args) -> Dict:
+    selected = [(name, setup) for name, setup in BENCHMARKS if not args.only or name in args.only]
+    results: Dict[str, Dict[str, Dict]] = {name: {} for name, _ in selected}
+    for scale in args.scales:
+        workdir = tempfile.mkdtemp(prefix=f"bench_{scale}_")
+        try:
+            ctx = Context(scale, args.seed, workdir, args.workers)
+            # 其余基准需要已入库的数据；未选中 add_paper 时批量入库（不计时）
+            if "add_paper" not in results:
+                ctx.db.add_papers(ctx.corpus)
+            for name, setup in selected:
+                if name != "add_paper" and ctx.records is None:
+                    ctx.load_records()
+                repeat = 1 if name in SINGLE_RUN else args.repeat
+                try:
+                    result = measure(setup, ctx, repeat)
+                except LookupError as e:
+                    # 缺少 NLTK 数据等外部资源：记为跳过，不影响其余基准
+                    lines = [line.strip() for line in str(e).splitlines() if line.strip().strip('*')]
+                    reason = lines[0] if lines else type(e).__name__
+                    results[name][str(scale)] = {"skipped": reason}
+                    print(f"{name:<22} n={scale:<7} skipped: {reason}", flush=True)
+                    continue
+                results[name][str(scale)] = result
+                print(f"{name:<22} n={scale:<7} {result['seconds']:9.3f}s {result['ms_per_item']:10.3f} ms/item",
+                      flush=True)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if not args.skip_import:
+        results["import"] = {}
+        for module in MODULES:
+            seconds = min(import_times(module)[module] for _ in range(args.repeat)) / 1e6
+            results["import"][module] = {"seconds": seconds, "items": 1, "ms_per_item": seconds * 1000}
+            print(f"{'import':<22} {module:<30} {seconds:9.3f}s", flush=True)
+    return results
+
+def check(results: Dict, baseline: Dict, thresholds: Dict) -> List[str]:
+    """与基线和绝对上限比较，返回回归说明列表"""
+    tolerance = thresholds.get("tolerance", 0.3)
+    min_delta = thresholds.get("min_delta", 0.05)
+    limits = thresholds.get("limits", {})
+    failures = []
+    for name, by_scale in results.items():
+        for scale, result in by_scale.items():
+            if "skipped" in result:
+                continue
+            old = baseline.get(name, {}).get(scale)
+            if old is not None and "skipped" not in old:
+                limit = old["seconds"] * (1 + tolerance)
+                if result["seconds"] > limit and result["seconds"] - old["seconds"] > min_delta:
+                    failures.append(
+                        f"{name} n={scale}: {result['seconds']:.3f}s > baseline {old['seconds']:.3f}s "
+                        f"(+{tolerance:.0%})"
+                    )
+            limit = limits.get(name)
+            if limit is not None and result["ms_per_item"] > limit:
+                failures.append(f"{name} n={scale}: {result['ms_per_item']:.3f} ms/item > limit {limit} ms/item")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="合成语料基准测试套件")
+    parser.add_argument("--scales", type=int, nargs="+", default=[100, 500, 2000], help="语料规模（论文数）")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=None, help="综合报告的进程数，默认为 CPU 核数")
+    parser.add_argument("--only", nargs="+", choices=[name for name, _ in BENCHMARKS], help="只运行指定的基准")
+    parser.add_argument("--skip-import", action="store_true", help="不测量导入耗时")
+    parser.add_argument("--output", default="bench_results.json", help="结果文件")
+    parser.add_argument("--baseline", default=None, help="作为基线的结果文件")
+    parser.add_argument("--thresholds", default=os.path.join(HERE, "thresholds.json"), help="阈值配置")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    results = run_suite(args)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "scales": args.scales,
+                "repeat": args.repeat,
+                "seed": args.seed,
+            },
+            "results": results,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"results written to {args.output}")
+
+    thresholds = {}
+    if os.path.exists(args.thresholds):
+        with open(args.thresholds, "r", encoding="utf-8") as f:
+            thresholds = json.load(f)
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    failures = check(results, baseline, thresholds)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1 +1,138 @@
- 
\ No newline at end of file
+"""论文库命令行工具
+
+用法：python -m src.cli <命令> [参数]
+"""
+import argparse
+import os
+import sys
+
+def _db_manager(args):
+    from .models.database import DatabaseManager
+    return DatabaseManager(args.db)
+
+def cmd_snapshot(args):
+    """导出论文库列式快照"""
+    from .processors.snapshot import CorpusSnapshot
+
+    snapshot = CorpusSnapshot(args.out, format=args.format)
+    exported = snapshot.export(_db_manager(args), incremental=not args.full)
+    if args.compact:
+        snapshot.compact()
+    print(f"导出 {exported} 篇论文到 {args.out}")
+
+def cmd_resolve_references(args):
+    """解析历史参考文献，链接到库内论文"""
+    linked = _db_manager(args).resolve_references()
+    print(f"新链接 {linked} 条参考文献")
+
+def cmd_daily_report(args):
+    """由数据库生成日报"""
+    import yaml
+    from datetime import datetime
+    from .processors.paper_processor import PaperProcessor
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    day = datetime.strptime(args.day, "%Y-%m-%d") if args.day else None
+    processor = PaperProcessor(config, _db_manager(args))
+    for fmt, path in processor.generate_daily_report_from_db(args.out, day, args.format).items():
+        print(f"{fmt}: {path}")
+
+def cmd_rebuild_trends(args):
+    """按论文表重新统计按日词频"""
+    counted = _db_manager(args).rebuild_term_counts()
+    print(f"统计 {counted} 篇论文的按日词频")
+
+def cmd_index_similarity(args):
+    """把新增或变化的论文加入相似论文索引"""
+    from .processors.analysis import PaperAnalyzer
+
+    with PaperAnalyzer(_db_manager(args), cache_dir=args.cache_dir) as analyzer:
+        index = analyzer.update_similarity_index(args.lsa)
+    print(f"相似论文索引共 {len(index)} 篇论文")
+
+def cmd_related(args):
+    """查询相似论文"""
+    from .processors.analysis import PaperAnalyzer
+
+    query = args.paper_id if args.paper_id is not None else args.text
+    with PaperAnalyzer(_db_manager(args), cache_dir=args.cache_dir) as analyzer:
+        if args.update:
+            analyzer.update_similarity_index(args.lsa)
+        try:
+            matches = analyzer.related_papers(query, k=args.k, n_components=args.lsa)
+        except FileNotFoundError:
+            print("相似论文索引不存在，请先运行 index-similarity 或加 --update", file=sys.stderr)
+            return 1
+    for match in matches:
+        print(f"{match['score']:.4f}\t{match['paper_id']}\t{match['title']}")
+
+def cmd_train_classifier(args):
+    """用已分类的论文训练分类模型"""
+    import yaml
+    from .processors.paper_processor import PaperProcessor
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    if args.model_path:
+        config["classification"]["model_path"] = args.model_path
+    processor = PaperProcessor(config, _db_manager(args))
+    stats = processor.train_classifier()
+    print(f"训练样本 {stats['n_papers']} 篇，模型保存到 {processor.model_path}")
+    for category, count in stats["category_counts"].items():
+        print(f"  {category}: {count}")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="机器视觉文献库命令行工具")
+    parser.add_argument("--db", default=f"sqlite:///{os.path.join(os.getcwd(), 'papers.db')}",
+                        help="数据库连接字符串")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    snapshot = subparsers.add_parser("snapshot", help="导出 Parquet/Arrow 列式快照")
+    snapshot.add_argument("--out", default="snapshot", help="快照目录")
+    snapshot.add_argument("--format", choices=["parquet", "arrow"], default="parquet", help="文件格式")
+    snapshot.add_argument("--full", action="store_true", help="清空后全量导出")
+    snapshot.add_argument("--compact", action="store_true", help="导出后合并分片")
+    snapshot.set_defaults(func=cmd_snapshot)
+
+    resolve = subparsers.add_parser("resolve-references", help="解析参考文献并链接到库内论文")
+    resolve.set_defaults(func=cmd_resolve_references)
+
+    report = subparsers.add_parser("daily-report", help="由数据库生成日报")
+    report.add_argument("--day", default=None, help="日期 YYYY-MM-DD，默认今天")
+    report.add_argument("--out", default="reports", help="输出目录")
+    report.add_argument("--format", nargs="+", choices=["md", "html", "json"], default=["md"], help="输出格式")
+    report.add_argument("--config", default="config/config.yaml", help="配置文件")
+    report.set_defaults(func=cmd_daily_report)
+
+    trends = subparsers.add_parser("rebuild-trends", help="重新统计按日词频（历史数据迁移或修复）")
+    trends.set_defaults(func=cmd_rebuild_trends)
+
+    index = subparsers.add_parser("index-similarity", help="更新相似论文索引（入库后运行）")
+    index.add_argument("--lsa", type=int, default=None, help="LSA 降维维数，不指定时使用 TF-IDF 向量")
+    index.add_argument("--cache-dir", default="cache", help="分析缓存目录")
+    index.set_defaults(func=cmd_index_similarity)
+
+    related = subparsers.add_parser("related", help="查询相似论文")
+    target = related.add_mutually_exclusive_group(required=True)
+    target.add_argument("text", nargs="?", help="查询文本，如故障描述")
+    target.add_argument("--paper-id", type=int, help="与指定论文相似")
+    related.add_argument("-k", type=int, default=10, help="返回数量")
+    related.add_argument("--lsa", type=int, default=None, help="LSA 降维维数，不指定时使用 TF-IDF 向量")
+    related.add_argument("--cache-dir", default="cache", help="分析缓存目录")
+    related.add_argument("--update", action="store_true", help="查询前先更新索引")
+    related.set_defaults(func=cmd_related)
+
+    train = subparsers.add_parser("train-classifier", help="训练论文分类模型")
+    train.add_argument("--config", default="config/config.yaml", help="配置文件")
+    train.add_argument("--model-path", default=None, help="模型保存路径，默认取配置 classification.model_path")
+    train.set_defaults(func=cmd_train_classifier)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -70,6 +70,8 @@ class ArxivCrawler(BaseCrawler):
                                 if not chunk:
                                     break
                                 f.write(chunk)
+                        # 存绝对路径，与文件监听事件中的路径一致，不依赖爬虫的工作目录
+                        paper.local_path = os.path.abspath(filepath)
                         return True
             return False
         except Exception as e:
@@ -18,6 +18,7 @@ class Paper:
     doi: Optional[str] = None
     citations: Optional[int] = None
     language: str = "en"
+    local_path: Optional[str] = None
 
 class BaseCrawler(ABC):
     """爬虫基类"""
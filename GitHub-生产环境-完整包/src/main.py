@@ -12,6 +12,9 @@ from pathlib import Path
 from loguru import logger
 
 from crawlers.arxiv_crawler import ArxivCrawler
+from models.database import DatabaseManager
+from models.paper_writer import PaperWriter
+from processors.burst_detector import BurstDetector
 # 导入其他爬虫...
 
 class CrawlerWorker(QThread):
@@ -44,28 +47,54 @@ class CrawlerWorker(QThread):
             # 添加其他爬虫...
         }
         
+        # 突发词检测器的状态跨次运行保存；检测器挂在入库提交钩子上，
+        # 只计入真正新增的论文，重复爬取或在多个关键词下重复出现的论文不会被重复计数
+        burst_config = self.config.get("burst", {})
+        detector = BurstDetector.load(burst_config.get("state_path", "cache/bursts.npz"))
+        
+        # 论文经写入队列异步入库，数据库操作不阻塞下载
+        db_config = self.config.get("database", {})
+        db_manager = DatabaseManager(db_config.get("url", "sqlite:///papers.db"))
+        db_manager.commit_hooks.append(detector.on_commit)
+        writer = PaperWriter(
+            db_manager,
+            batch_size=db_config.get("batch_size", 50),
+            flush_interval=db_config.get("flush_interval", 2.0),
+            max_queue=db_config.get("max_queue", 1000)
+        )
+        writer.start()
+        
         total_papers = 0
         from_date = datetime.now() - timedelta(days=self.days)
         to_date = datetime.now()
         
-        for source in self.sources:
-            if source not in crawlers:
-                continue
-                
-            crawler = crawlers[source]
-            self.status.emit(f"正在从 {source} 获取论文...")
-            
-            for keyword in self.keywords:
-                papers = await crawler.search(keyword, from_date, to_date)
-                total_papers += len(papers)
+        try:
+            for source in self.sources:
+                if source not in crawlers:
+                    continue
+                    
+                crawler = crawlers[source]
+                self.status.emit(f"正在从 {source} 获取论文...")
                 
-                for i, paper in enumerate(papers):
-                    save_path = Path(self.config["download"]["path"]) / source / paper.category
-                    await crawler.process_paper(paper, str(save_path))
-                    progress = int((i + 1) / len(papers) * 100)
-                    self.progress.emit(progress)
+                for keyword in self.keywords:
+                    papers = await crawler.search(keyword, from_date, to_date)
+                    total_papers += len(papers)
+                    
+                    for i, paper in enumerate(papers):
+                        save_path = Path(self.config["download"]["path"]) / source / paper.category
+                        processed = await crawler.process_paper(paper, str(save_path))
+                        if processed:
+                            await writer.submit(processed)
+                        progress = int((i + 1) / len(papers) * 100)
+                        self.progress.emit(progress)
+        finally:
+            await asyncio.to_thread(writer.close)
+            await asyncio.to_thread(detector.save)
                     
-        self.status.emit(f"完成！共获取 {total_papers} 篇论文")
+        self.status.emit(f"完成！共获取 {total_papers} 篇论文，入库 {writer.written} 篇")
+        bursts = detector.bursts(k=10)
+        if bursts:
+            self.status.emit(f"{detector.day} 突发词：" + "、".join(item["term"] for item in bursts))
 
 class MainWindow(QMainWindow):
     """主窗口"""
@@ -1,9 +1,13 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Float, ForeignKey, Table
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Float, Boolean, Text, ForeignKey, Table, select, bindparam, func, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime
-from typing import List
+from typing import Callable, List, Dict, Iterable, Optional, Tuple
 import json
+from loguru import logger
+from .intern_cache import get_intern_cache, normalize_name
+from .reference_resolver import ReferenceResolver, title_key, normalize_doi
+from .trend_store import TermTrendStore
 
 Base = declarative_base()
 
@@ -11,9 +15,14 @@ Base = declarative_base()
 paper_authors = Table(
     'paper_authors', Base.metadata,
     Column('paper_id', Integer, ForeignKey('papers.id')),
-    Column('author_id', Integer, ForeignKey('authors.id'))
+    Column('author_id', Integer, ForeignKey('authors.id')),
+    # 作者在论文作者列表中的位置（迁移前入库的行为空，按作者ID排序）
+    Column('position', Integer)
 )
 
+# 读取论文作者时统一使用的排序
+AUTHOR_ORDER = (paper_authors.c.position, paper_authors.c.author_id)
+
 # 论文-关键词关联表
 paper_keywords = Table(
     'paper_keywords', Base.metadata,
@@ -30,10 +39,13 @@ class Paper(Base):
     abstract = Column(String(5000))
     url = Column(String(500))
     pdf_url = Column(String(500))
-    published_date = Column(DateTime)
+    published_date = Column(DateTime, index=True)
     source = Column(String(50))
     category = Column(String(100))
     doi = Column(String(100))
+    # 参考文献解析用的规范化标题哈希和规范化DOI
+    title_key = Column(String(40), index=True)
+    doi_key = Column(String(100), index=True)
     citations = Column(Integer, default=0)
     language = Column(String(10))
     local_path = Column(String(500))
@@ -41,11 +53,12 @@ class Paper(Base):
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     
     # 关系
-    authors = relationship('Author', secondary=paper_authors, back_populates='papers')
+    authors = relationship('Author', secondary=paper_authors, back_populates='papers', order_by=AUTHOR_ORDER)
     keywords = relationship('Keyword', secondary=paper_keywords, back_populates='papers')
-    references = relationship('Reference', back_populates='paper')
+    references = relationship('Reference', back_populates='paper', foreign_keys='Reference.paper_id')
     citations_data = relationship('Citation', back_populates='paper')
     metrics = relationship('PaperMetrics', back_populates='paper', uselist=False)
+    file_status = relationship('FileStatus', back_populates='paper', uselist=False)
 
 class Author(Base):
     """作者表"""
@@ -73,7 +86,12 @@ class Reference(Base):
     paper_id = Column(Integer, ForeignKey('papers.id'))
     reference_title = Column(String(500))
     reference_doi = Column(String(100))
-    paper = relationship('Paper', back_populates='references')
+    title_key = Column(String(40), index=True)
+    doi_key = Column(String(100), index=True)
+    # 解析到的库内论文，未解析时为空
+    resolved_paper_id = Column(Integer, ForeignKey('papers.id'), index=True)
+    paper = relationship('Paper', back_populates='references', foreign_keys=[paper_id])
+    resolved_paper = relationship('Paper', foreign_keys=[resolved_paper_id])
 
 class Citation(Base):
     """被引用表"""
@@ -100,36 +118,206 @@ class PaperMetrics(Base):
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     paper = relationship('Paper', back_populates='metrics')
 
+class FileStatus(Base):
+    """本地文件状态表"""
+    __tablename__ = 'file_status'
+    
+    id = Column(Integer, primary_key=True)
+    paper_id = Column(Integer, ForeignKey('papers.id'), unique=True)
+    path = Column(String(500), index=True)
+    file_exists = Column(Boolean, default=False)
+    size = Column(Integer, default=0)
+    mtime = Column(Float)
+    hash = Column(String(64))
+    checked_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    paper = relationship('Paper', back_populates='file_status')
+
+class PaperTokens(Base):
+    """论文文本预处理缓存表"""
+    __tablename__ = 'paper_tokens'
+    
+    paper_id = Column(Integer, ForeignKey('papers.id'), primary_key=True)
+    content_hash = Column(String(64), nullable=False)
+    tokens = Column(Text)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+class PaperTopics(Base):
+    """论文主题向量表（增量主题模型）"""
+    __tablename__ = 'paper_topics'
+    
+    paper_id = Column(Integer, ForeignKey('papers.id'), primary_key=True)
+    model_id = Column(String(32), nullable=False)
+    vector = Column(Text)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+class TermDailyCount(Base):
+    """按日词频表（入库时增量累加）"""
+    __tablename__ = 'term_daily_counts'
+    
+    day = Column(String(10), primary_key=True)
+    term = Column(String(100), primary_key=True)
+    term_count = Column(Integer, nullable=False, default=0)
+    doc_count = Column(Integer, nullable=False, default=0)
+
+class DailyPaperCount(Base):
+    """按日论文数表（与按日词频表一起维护）"""
+    __tablename__ = 'daily_paper_counts'
+    
+    day = Column(String(10), primary_key=True)
+    paper_count = Column(Integer, nullable=False, default=0)
+
 class DatabaseManager:
     """数据库管理器"""
     
-    def __init__(self, connection_string: str):
+    # 可批量更新的论文指标字段及新建记录时的默认值
+    METRIC_DEFAULTS = {
+        'citation_count': 0,
+        'download_count': 0,
+        'read_count': 0,
+        'impact_factor': None,
+        'h_index': None
+    }
+    
+    # 按时间段聚合时各数据库的日期格式化函数和格式
+    PERIOD_FORMATS = {
+        'sqlite': ('strftime', {'day': '%Y-%m-%d', 'month': '%Y-%m', 'year': '%Y'}),
+        'postgresql': ('to_char', {'day': 'YYYY-MM-DD', 'month': 'YYYY-MM', 'year': 'YYYY'}),
+        'mysql': ('date_format', {'day': '%Y-%m-%d', 'month': '%Y-%m', 'year': '%Y'}),
+        'mariadb': ('date_format', {'day': '%Y-%m-%d', 'month': '%Y-%m', 'year': '%Y'})
+    }
+    
+    def __init__(self, connection_string: str, intern_cache_size: int = 100000):
         self.engine = create_engine(connection_string)
         Base.metadata.create_all(self.engine)
+        self.migrate_schema()
         self.Session = sessionmaker(bind=self.engine)
+        
+        # 入库钩子：在论文写入的同一事务中调用 hook(session, paper_ids, papers_data)
+        self.reference_resolver = ReferenceResolver(Paper.__table__, Reference.__table__)
+        self.trend_store = TermTrendStore(TermDailyCount.__table__, DailyPaperCount.__table__)
+        self.ingest_hooks: List[Callable] = [self.reference_resolver.on_ingest, self.trend_store.on_ingest]
+        # 提交钩子：事务提交成功后调用 hook(paper_ids, papers_data)，只包含真正新增的论文，
+        # 用于不在数据库中的下游统计（如突发词检测）
+        self.commit_hooks: List[Callable] = []
+        
+        # 作者名/关键词 -> ID 缓存，同一数据库文件在进程内共享
+        database = self.engine.url.database
+        if database and database != ':memory:':
+            scope = str(self.engine.url)
+        else:
+            scope = f'memory:{id(self.engine)}'
+        self.author_ids = get_intern_cache(scope, 'authors', intern_cache_size)
+        self.keyword_ids = get_intern_cache(scope, 'keywords', intern_cache_size)
+        self.warm_intern_caches()
     
-    def add_paper(self, paper_data: dict) -> Paper:
-        """添加论文"""
-        session = self.Session()
-        try:
-            # 创建或获取作者
-            authors = []
-            for author_name in paper_data.get('authors', []):
-                author = session.query(Author).filter_by(name=author_name).first()
-                if not author:
-                    author = Author(name=author_name)
-                authors.append(author)
-            
-            # 创建或获取关键词
-            keywords = []
-            for word in paper_data.get('keywords', []):
-                keyword = session.query(Keyword).filter_by(word=word).first()
-                if not keyword:
-                    keyword = Keyword(word=word)
-                keywords.append(keyword)
-            
-            # 创建论文
-            paper = Paper(
+    def migrate_schema(self):
+        """为已存在的表补齐模型中新增的列和索引（create_all 不会修改已有表）"""
+        inspector = inspect(self.engine)
+        preparer = self.engine.dialect.identifier_preparer
+        with self.engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                existing = {column['name'] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in existing:
+                        continue
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    conn.execute(text(
+                        f"ALTER TABLE {preparer.format_table(table)} "
+                        f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+                    ))
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+    
+    def resolve_references(self) -> int:
+        """补齐历史数据的匹配键并解析全部未链接的参考文献，返回新链接数"""
+        with self.engine.begin() as conn:
+            self.reference_resolver.backfill_keys(conn)
+            return self.reference_resolver.resolve_pending(conn)
+    
+    def rebuild_term_counts(self) -> int:
+        """按论文表重新统计按日词频（迁移前入库的历史数据需执行一次），返回统计的论文数"""
+        with self.engine.begin() as conn:
+            return self.trend_store.rebuild(conn, Paper.__table__)
+    
+    def top_terms(self, start: Optional[datetime] = None, end: Optional[datetime] = None, k: int = 10,
+                  exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """发布日期在 [start, end) 内的论文中得分最高的 k 个词，由按日词频表计算"""
+        with self.engine.connect() as conn:
+            return self.trend_store.top_terms(conn, start, end, k, exclude)
+    
+    def term_trend(self, terms: List[str], start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> Dict[str, Dict[str, int]]:
+        """指定词每日出现的论文数 {词: {'YYYY-MM-DD': 论文数}}"""
+        with self.engine.connect() as conn:
+            return self.trend_store.term_trend(conn, terms, start, end)
+    
+    def warm_intern_caches(self):
+        """用关联论文最多的作者和关键词预热ID缓存，缓存已有内容时跳过"""
+        targets = (
+            (self.author_ids, Author, Author.name, paper_authors.c.author_id),
+            (self.keyword_ids, Keyword, Keyword.word, paper_keywords.c.keyword_id)
+        )
+        with self.engine.connect() as conn:
+            for cache, model, column, link in targets:
+                if len(cache):
+                    continue
+                rows = conn.execute(
+                    select(column, func.min(model.id))
+                    .select_from(model.__table__.join(link.table, link == model.id))
+                    .group_by(column)
+                    .order_by(func.count().desc())
+                    .limit(cache.maxsize)
+                ).all()
+                # 倒序写入，使最常用的条目处于LRU最新端
+                cache.put_many((name, row_id) for name, row_id in reversed(rows) if normalize_name(name) == name)
+    
+    @staticmethod
+    def _normalized(names: Iterable[str]) -> List[str]:
+        """规范化并去重，保持原有顺序"""
+        return list(dict.fromkeys(n for n in (normalize_name(name) for name in names if name) if n))
+    
+    def _resolve_ids(self, session, model, column, cache, names: List[str],
+                     created: Dict[str, int], chunk_size: int = 500) -> Dict[str, int]:
+        """将规范化名称解析为行ID
+        
+        先查进程级缓存，未命中的按块批量查询，仍不存在的批量插入。
+        新插入的ID记入 created，由调用方在提交后写入缓存。
+        """
+        ids = {}
+        missing = []
+        for name in names:
+            row_id = cache.get(name)
+            if row_id is None:
+                missing.append(name)
+            else:
+                ids[name] = row_id
+        
+        for start in range(0, len(missing), chunk_size):
+            chunk = missing[start:start + chunk_size]
+            found = dict(session.execute(
+                select(column, func.min(model.id)).where(column.in_(chunk)).group_by(column)
+            ).all())
+            ids.update(found)
+            cache.put_many(found.items())
+        
+        new_names = [name for name in missing if name not in ids]
+        if new_names:
+            session.execute(model.__table__.insert(), [{column.key: name} for name in new_names])
+            for start in range(0, len(new_names), chunk_size):
+                chunk = new_names[start:start + chunk_size]
+                new_ids = dict(session.execute(
+                    select(column, func.min(model.id)).where(column.in_(chunk)).group_by(column)
+                ).all())
+                ids.update(new_ids)
+                created.update(new_ids)
+        return ids
+    
+    def _insert_papers(self, session, papers_data: List[dict], created_authors: Dict[str, int],
+                       created_keywords: Dict[str, int]) -> List[Paper]:
+        """在当前事务中插入论文及其作者、关键词关联"""
+        papers = []
+        for paper_data in papers_data:
+            papers.append(Paper(
                 title=paper_data['title'],
                 abstract=paper_data.get('abstract'),
                 url=paper_data.get('url'),
@@ -138,20 +326,132 @@ class DatabaseManager:
                 source=paper_data.get('source'),
                 category=paper_data.get('category'),
                 doi=paper_data.get('doi'),
+                title_key=title_key(paper_data['title']),
+                doi_key=normalize_doi(paper_data.get('doi')),
                 citations=paper_data.get('citations', 0),
                 language=paper_data.get('language', 'en'),
                 local_path=paper_data.get('local_path')
-            )
-            
-            paper.authors = authors
-            paper.keywords = keywords
-            
-            session.add(paper)
+            ))
+        session.add_all(papers)
+        session.flush()
+        
+        # 创建或获取作者、关键词，并直接写入关联表
+        author_names = [self._normalized(d.get('authors', [])) for d in papers_data]
+        keyword_words = [self._normalized(d.get('keywords', [])) for d in papers_data]
+        author_ids = self._resolve_ids(
+            session, Author, Author.name, self.author_ids,
+            self._normalized(n for names in author_names for n in names), created_authors
+        )
+        keyword_ids = self._resolve_ids(
+            session, Keyword, Keyword.word, self.keyword_ids,
+            self._normalized(w for words in keyword_words for w in words), created_keywords
+        )
+        
+        author_links = [
+            {'paper_id': paper.id, 'author_id': author_ids[name], 'position': position}
+            for paper, names in zip(papers, author_names) for position, name in enumerate(names)
+        ]
+        keyword_links = [
+            {'paper_id': paper.id, 'keyword_id': keyword_ids[word]}
+            for paper, words in zip(papers, keyword_words) for word in words
+        ]
+        if author_links:
+            session.execute(paper_authors.insert(), author_links)
+        if keyword_links:
+            session.execute(paper_keywords.insert(), keyword_links)
+        
+        # 参考文献：字符串视为标题，字典可包含 title/doi
+        references = []
+        for paper, paper_data in zip(papers, papers_data):
+            for ref in paper_data.get('references') or []:
+                if isinstance(ref, str):
+                    ref = {'title': ref}
+                title = ref.get('title') or ref.get('reference_title')
+                doi = ref.get('doi') or ref.get('reference_doi')
+                if not title and not doi:
+                    continue
+                references.append({
+                    'paper_id': paper.id,
+                    'reference_title': title,
+                    'reference_doi': doi,
+                    'title_key': title_key(title),
+                    'doi_key': normalize_doi(doi)
+                })
+        if references:
+            session.execute(Reference.__table__.insert(), references)
+        return papers
+    
+    def _write_papers(self, session, papers_data: List[dict]) -> Tuple[List[Paper], List[int]]:
+        """写入并提交论文，返回论文对象及其ID；回滚时使本批次涉及的缓存条目失效"""
+        created_authors = {}
+        created_keywords = {}
+        try:
+            papers = self._insert_papers(session, papers_data, created_authors, created_keywords)
+            # 提交前记录ID，避免提交后逐个刷新过期对象
+            paper_ids = [paper.id for paper in papers]
+            for hook in self.ingest_hooks:
+                hook(session, paper_ids, papers_data)
             session.commit()
-            return paper
         except Exception as e:
             session.rollback()
+            self.reference_resolver.reset_index()
+            self.author_ids.discard(n for d in papers_data for n in self._normalized(d.get('authors', [])))
+            self.keyword_ids.discard(w for d in papers_data for w in self._normalized(d.get('keywords', [])))
             raise e
+        
+        # 只有提交成功的新行才进入缓存
+        self.author_ids.put_many(created_authors.items())
+        self.keyword_ids.put_many(created_keywords.items())
+        # 论文已提交，钩子失败不影响写入结果
+        for hook in self.commit_hooks:
+            try:
+                hook(paper_ids, papers_data)
+            except Exception as e:
+                logger.error(f"Commit hook {hook} failed: {e}")
+        return papers, paper_ids
+    
+    def add_paper(self, paper_data: dict) -> Paper:
+        """添加论文
+
+        与 add_papers 不同，不按 url 去重：总是插入一篇新论文并返回该对象。
+        需要跳过已入库论文时使用 add_papers。
+        """
+        session = self.Session()
+        try:
+            papers, _ = self._write_papers(session, [paper_data])
+            return papers[0]
+        finally:
+            session.close()
+    
+    def add_papers(self, papers_data: List[dict]) -> List[int]:
+        """批量添加论文
+        
+        整批论文在一个事务中写入，作者和关键词通过ID缓存和批量查询解析；
+        url 已在库中（或在本批次中重复）的论文会被跳过（add_paper 不做此检查）。
+        返回新增论文的ID列表。
+        论文字典可带 references（标题字符串或含 title/doi 的字典列表），
+        入库时会解析到库内已有论文。
+        """
+        session = self.Session()
+        try:
+            urls = [d['url'] for d in papers_data if d.get('url')]
+            seen_urls = set()
+            if urls:
+                seen_urls.update(url for (url,) in session.query(Paper.url).filter(Paper.url.in_(urls)))
+            
+            pending = []
+            for paper_data in papers_data:
+                url = paper_data.get('url')
+                if url:
+                    if url in seen_urls:
+                        continue
+                    seen_urls.add(url)
+                pending.append(paper_data)
+            
+            if not pending:
+                return []
+            _, paper_ids = self._write_papers(session, pending)
+            return paper_ids
         finally:
             session.close()
     
@@ -163,6 +463,47 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def get_paper_titles(self, paper_ids: List[int], chunk_size: int = 500) -> Dict[int, str]:
+        """批量获取论文标题"""
+        table = Paper.__table__
+        titles = {}
+        with self.engine.connect() as conn:
+            for start in range(0, len(paper_ids), chunk_size):
+                rows = conn.execute(
+                    select(table.c.id, table.c.title).where(table.c.id.in_(paper_ids[start:start + chunk_size]))
+                )
+                titles.update(rows.all())
+        return titles
+    
+    def get_paper_authors(self, paper_ids: List[int], chunk_size: int = 500) -> Dict[int, List[str]]:
+        """批量获取论文作者名（按作者列表顺序，与 Paper.authors 一致）"""
+        authors = {paper_id: [] for paper_id in paper_ids}
+        with self.engine.connect() as conn:
+            for start in range(0, len(paper_ids), chunk_size):
+                rows = conn.execute(
+                    select(paper_authors.c.paper_id, Author.__table__.c.name)
+                    .join(Author.__table__, Author.__table__.c.id == paper_authors.c.author_id)
+                    .where(paper_authors.c.paper_id.in_(paper_ids[start:start + chunk_size]))
+                    .order_by(paper_authors.c.paper_id, *AUTHOR_ORDER)
+                )
+                for paper_id, name in rows:
+                    authors[paper_id].append(name)
+        return authors
+    
+    def get_paper_keywords(self, paper_ids: List[int], chunk_size: int = 500) -> Dict[int, List[str]]:
+        """批量获取论文关键词"""
+        keywords = {paper_id: [] for paper_id in paper_ids}
+        with self.engine.connect() as conn:
+            for start in range(0, len(paper_ids), chunk_size):
+                rows = conn.execute(
+                    select(paper_keywords.c.paper_id, Keyword.__table__.c.word)
+                    .join(Keyword.__table__, Keyword.__table__.c.id == paper_keywords.c.keyword_id)
+                    .where(paper_keywords.c.paper_id.in_(paper_ids[start:start + chunk_size]))
+                )
+                for paper_id, word in rows:
+                    keywords[paper_id].append(word)
+        return keywords
+    
     def get_papers_by_category(self, category: str) -> List[Paper]:
         """获取特定类别的论文"""
         session = self.Session()
@@ -173,22 +514,172 @@ class DatabaseManager:
     
     def update_paper_metrics(self, paper_id: int, metrics: dict):
         """更新论文指标"""
-        session = self.Session()
-        try:
-            paper = session.query(Paper).get(paper_id)
-            if not paper:
+        self.update_metrics({paper_id: metrics})
+    
+    def update_metrics(self, mapping: Dict[int, dict], chunk_size: int = 500) -> int:
+        """批量更新论文指标
+        
+        mapping 为 {论文ID: 指标字典}。按 chunk_size 分块，每块一个事务：
+        一次查询取出已有指标，缺失的批量插入，变化的按字段组合 executemany 更新。
+        不存在的论文和未知字段会被忽略，返回实际发生变化的论文数。
+        """
+        papers = Paper.__table__
+        table = PaperMetrics.__table__
+        
+        items = []
+        for paper_id, metrics in mapping.items():
+            values = {k: v for k, v in metrics.items() if k in self.METRIC_DEFAULTS}
+            if values:
+                items.append((paper_id, values))
+        
+        changed = 0
+        for start in range(0, len(items), chunk_size):
+            chunk = dict(items[start:start + chunk_size])
+            with self.engine.begin() as conn:
+                paper_ids = set(conn.execute(
+                    select(papers.c.id).where(papers.c.id.in_(list(chunk)))
+                ).scalars())
+                existing = {
+                    row.paper_id: row for row in conn.execute(
+                        select(table).where(table.c.paper_id.in_(list(paper_ids)))
+                    )
+                }
+                
+                inserts = []
+                updates = {}
+                for paper_id in paper_ids:
+                    values = chunk[paper_id]
+                    row = existing.get(paper_id)
+                    if row is None:
+                        inserts.append({**self.METRIC_DEFAULTS, **values, 'paper_id': paper_id})
+                        continue
+                    diff = {k: v for k, v in values.items() if getattr(row, k) != v}
+                    if diff:
+                        params = {f'b_{k}': v for k, v in diff.items()}
+                        params['b_id'] = row.id
+                        updates.setdefault(tuple(sorted(diff)), []).append(params)
+                
+                if inserts:
+                    conn.execute(table.insert(), inserts)
+                for fields, params in updates.items():
+                    stmt = table.update().where(table.c.id == bindparam('b_id')).values(
+                        {k: bindparam(f'b_{k}') for k in fields}
+                    )
+                    conn.execute(stmt, params)
+                changed += len(inserts) + sum(len(params) for params in updates.values())
+        
+        return changed
+    
+    def get_cached_tokens(self, paper_ids: List[int], chunk_size: int = 500) -> Dict[int, Tuple[str, str]]:
+        """批量读取预处理缓存，返回 {论文ID: (内容哈希, 分词结果)}"""
+        table = PaperTokens.__table__
+        cached = {}
+        with self.engine.connect() as conn:
+            for start in range(0, len(paper_ids), chunk_size):
+                chunk = paper_ids[start:start + chunk_size]
+                rows = conn.execute(
+                    select(table.c.paper_id, table.c.content_hash, table.c.tokens)
+                    .where(table.c.paper_id.in_(chunk))
+                )
+                for paper_id, content_hash, tokens in rows:
+                    cached[paper_id] = (content_hash, tokens)
+        return cached
+    
+    def save_cached_tokens(self, entries: Dict[int, Tuple[str, str]], chunk_size: int = 500):
+        """批量写入预处理缓存，已有记录会被替换"""
+        table = PaperTokens.__table__
+        items = list(entries.items())
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            with self.engine.begin() as conn:
+                conn.execute(table.delete().where(table.c.paper_id.in_([paper_id for paper_id, _ in chunk])))
+                conn.execute(table.insert(), [
+                    {'paper_id': paper_id, 'content_hash': content_hash, 'tokens': tokens}
+                    for paper_id, (content_hash, tokens) in chunk
+                ])
+    
+    def get_topic_vectors(self, paper_ids: List[int], model_id: str,
+                          chunk_size: int = 500) -> Dict[int, List[float]]:
+        """批量读取指定模型下的论文主题向量"""
+        table = PaperTopics.__table__
+        vectors = {}
+        with self.engine.connect() as conn:
+            for start in range(0, len(paper_ids), chunk_size):
+                chunk = paper_ids[start:start + chunk_size]
+                rows = conn.execute(
+                    select(table.c.paper_id, table.c.vector)
+                    .where(table.c.paper_id.in_(chunk), table.c.model_id == model_id)
+                )
+                for paper_id, vector in rows:
+                    vectors[paper_id] = json.loads(vector)
+        return vectors
+    
+    def save_topic_vectors(self, vectors: Dict[int, List[float]], model_id: str, chunk_size: int = 500):
+        """批量写入论文主题向量，已有记录会被替换"""
+        table = PaperTopics.__table__
+        items = list(vectors.items())
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            with self.engine.begin() as conn:
+                conn.execute(table.delete().where(table.c.paper_id.in_([paper_id for paper_id, _ in chunk])))
+                conn.execute(table.insert(), [
+                    {'paper_id': paper_id, 'model_id': model_id, 'vector': json.dumps(vector)}
+                    for paper_id, vector in chunk
+                ])
+    
+    def _period_expression(self, column, period: str):
+        """把日期列格式化为 'YYYY-MM-DD' / 'YYYY-MM' / 'YYYY' 字符串的 SQL 表达式"""
+        dialect = self.engine.dialect.name
+        if dialect not in self.PERIOD_FORMATS:
+            raise NotImplementedError(f"Period aggregation is not supported for {dialect}")
+        function, formats = self.PERIOD_FORMATS[dialect]
+        if period not in formats:
+            raise ValueError(f"Unknown period: {period}")
+        if function == 'strftime':
+            return func.strftime(formats[period], column)
+        return getattr(func, function)(column, formats[period])
+    
+    def count_papers_by(self, period: str, start: Optional[datetime] = None,
+                        end: Optional[datetime] = None) -> Dict[str, int]:
+        """按日/月/年统计发文量（在数据库中 GROUP BY）
+        
+        period 为 'day'、'month' 或 'year'，返回按时间排序的 {时间段: 论文数}。
+        start/end 限定 published_date 的范围（含 start，不含 end），可利用该列索引。
+        """
+        table = Paper.__table__
+        column = table.c.published_date
+        bucket = self._period_expression(column, period).label('bucket')
+        query = select(bucket, func.count()).where(column.isnot(None))
+        if start is not None:
+            query = query.where(column >= start)
+        if end is not None:
+            query = query.where(column < end)
+        query = query.group_by(bucket).order_by(bucket)
+        with self.engine.connect() as conn:
+            return {label: count for label, count in conn.execute(query)}
+    
+    def iter_paper_chunks(self, chunk_size: int = 1000,
+                          columns: Iterable[str] = ('id', 'title', 'abstract', 'published_date'),
+                          start: Optional[datetime] = None, end: Optional[datetime] = None):
+        """按ID顺序分块遍历论文的指定列，每块为行对象列表
+        
+        使用基于ID的分页查询，块与块之间不占用数据库连接，
+        调用方可以在遍历过程中写库；内存占用与论文总数无关。
+        start/end 限定 published_date 的范围（含 start，不含 end）。
+        """
+        table = Paper.__table__
+        columns = list(dict.fromkeys(['id'] + list(columns)))
+        query = select(*[table.c[name] for name in columns]).order_by(table.c.id).limit(chunk_size)
+        if start is not None:
+            query = query.where(table.c.published_date >= start)
+        if end is not None:
+            query = query.where(table.c.published_date < end)
+        last_id = None
+        while True:
+            with self.engine.connect() as conn:
+                page = query if last_id is None else query.where(table.c.id > last_id)
+                rows = conn.execute(page).all()
+            if not rows:
                 return
-            
-            if not paper.metrics:
-                paper.metrics = PaperMetrics()
-            
-            for key, value in metrics.items():
-                if hasattr(paper.metrics, key):
-                    setattr(paper.metrics, key, value)
-            
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            raise e
-        finally:
-            session.close() 
\ No newline at end of file
+            yield rows
+            last_id = rows[-1].id
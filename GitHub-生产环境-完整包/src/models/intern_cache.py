@@ -0,0 +1,68 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+def normalize_name(name: str) -> str:
+    """规范化作者名/关键词：去除首尾空白并合并连续空白"""
+    return ' '.join(name.split())
+
+class InternCache:
+    """有界LRU缓存：规范化名称 -> 数据库行ID
+
+    线程安全，只应写入已提交的行ID；事务回滚时由调用方 discard 相关键。
+    """
+
+    def __init__(self, maxsize: int = 100000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[int]:
+        """查询ID，命中时刷新LRU顺序"""
+        with self._lock:
+            row_id = self._data.get(key)
+            if row_id is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return row_id
+
+    def put_many(self, items: Iterable[Tuple[str, int]]):
+        """批量写入，超出容量时淘汰最久未使用的条目"""
+        with self._lock:
+            for key, row_id in items:
+                self._data[key] = row_id
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def put(self, key: str, row_id: int):
+        self.put_many([(key, row_id)])
+
+    def discard(self, keys: Iterable[str]):
+        """移除指定键（用于事务回滚后的失效）"""
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+# 进程级缓存注册表：(数据库标识, 缓存名) -> InternCache
+_caches: Dict[Tuple[str, str], InternCache] = {}
+_caches_lock = threading.Lock()
+
+def get_intern_cache(scope: str, name: str, maxsize: int = 100000) -> InternCache:
+    """获取进程内共享的缓存，同一数据库的多个 DatabaseManager 共用一份"""
+    with _caches_lock:
+        cache = _caches.get((scope, name))
+        if cache is None:
+            cache = _caches[(scope, name)] = InternCache(maxsize)
+        return cache
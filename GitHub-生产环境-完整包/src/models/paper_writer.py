@@ -0,0 +1,159 @@
+import asyncio
+import queue
+import threading
+import time
+from dataclasses import asdict, is_dataclass
+from typing import List, Optional
+from loguru import logger
+from .database import DatabaseManager
+
+# 写入线程的控制信号
+_STOP = object()
+
+class PaperWriter:
+    """论文异步写入器（write-behind）
+
+    爬虫协程只把论文放入有界队列，由独立的写入线程批量调用
+    DatabaseManager.add_papers。攒够 batch_size 篇或距批次第一篇超过
+    flush_interval 秒时写入一次，关闭时写完剩余论文，数据库操作不会阻塞事件循环。
+    """
+
+    def __init__(self, db_manager: DatabaseManager, batch_size: int = 50,
+                 flush_interval: float = 2.0, max_queue: int = 1000):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.written = 0
+        self.failed = 0
+        self._thread = None
+        self._stopping = False
+
+    @staticmethod
+    def _to_dict(paper) -> dict:
+        """将爬虫论文对象转换为 add_papers 所需的字典"""
+        if is_dataclass(paper):
+            return asdict(paper)
+        return dict(paper)
+
+    def start(self):
+        """启动写入线程"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="paper-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, paper, timeout: Optional[float] = None):
+        """放入一篇论文，队列满时阻塞（在线程中调用）"""
+        self.queue.put(self._to_dict(paper), timeout=timeout)
+
+    async def submit(self, paper):
+        """在事件循环中提交一篇论文
+
+        队列未满时立即返回；队列满时在线程池中等待空位，
+        只让当前协程让出，不会阻塞事件循环中的下载任务。
+        """
+        data = self._to_dict(paper)
+        try:
+            self.queue.put_nowait(data)
+        except queue.Full:
+            await asyncio.to_thread(self.queue.put, data)
+
+    def _running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """立即写入已排队的论文，返回是否在超时前完成
+
+        写入线程未运行（未启动或已退出）时在当前线程中同步写入。
+        """
+        if not self._running():
+            self._drain()
+            return True
+        done = threading.Event()
+        self.queue.put(done, timeout=timeout)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """写完剩余论文并停止写入线程，返回是否已停止
+
+        超时后写入线程仍在运行时保留线程引用并记录警告，可再次调用 close 等待。
+        """
+        if not self._running():
+            self._thread = None
+            self._drain()
+            return True
+        if not self._stopping:
+            # 重复调用时不再放入停止信号，以免残留到下次 start
+            self.queue.put(_STOP, timeout=timeout)
+            self._stopping = True
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning(f"PaperWriter did not stop within {timeout}s, {self.queue.qsize()} items still queued")
+            return False
+        self._thread = None
+        logger.info(f"PaperWriter closed: {self.written} written, {self.failed} failed")
+        return True
+
+    def _drain(self):
+        """在调用线程中写完队列中剩余的论文（写入线程未运行时使用）"""
+        batch = []
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is not _STOP:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    self._write(batch)
+                    batch = []
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch: List[dict]):
+        """写入一批论文，整批失败时逐篇重试以隔离坏数据"""
+        try:
+            self.written += len(self.db_manager.add_papers(batch))
+            return
+        except Exception as e:
+            logger.warning(f"Batch insert of {len(batch)} papers failed, retrying one by one: {str(e)}")
+
+        for paper_data in batch:
+            try:
+                self.written += len(self.db_manager.add_papers([paper_data]))
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Error saving paper {paper_data.get('title')}: {str(e)}")
+
+    def _run(self):
+        """写入线程主循环"""
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if not batch else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP or isinstance(item, threading.Event):
+                if batch:
+                    self._write(batch)
+                    batch = []
+                if item is _STOP:
+                    return
+                item.set()
+                continue
+
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write(batch)
+                batch = []
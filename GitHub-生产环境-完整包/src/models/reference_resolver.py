@@ -0,0 +1,244 @@
+import difflib
+import hashlib
+import re
+import threading
+import unicodedata
+from datetime import datetime
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import Table, select, bindparam, func
+
+_NON_WORD = re.compile(r'[\W_]+')
+_DOI_PREFIXES = ('https://doi.org/', 'http://doi.org/', 'https://dx.doi.org/', 'http://dx.doi.org/', 'doi:')
+
+def normalize_title(title: Optional[str]) -> str:
+    """规范化标题：Unicode 兼容分解、小写、去除标点并合并空白"""
+    if not title:
+        return ''
+    text = unicodedata.normalize('NFKC', title).lower()
+    return ' '.join(_NON_WORD.sub(' ', text).split())
+
+def title_key(title: Optional[str]) -> Optional[str]:
+    """规范化标题的哈希，用于精确匹配"""
+    normalized = normalize_title(title)
+    if not normalized:
+        return None
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+def normalize_doi(doi: Optional[str]) -> Optional[str]:
+    """规范化DOI：去除空白、链接前缀并转为小写"""
+    if not doi:
+        return None
+    doi = doi.strip().lower()
+    for prefix in _DOI_PREFIXES:
+        if doi.startswith(prefix):
+            doi = doi[len(prefix):]
+            break
+    return doi or None
+
+class ReferenceResolver:
+    """参考文献解析索引：把参考文献链接到库中已有论文的ID
+
+    依次尝试 DOI 精确匹配、规范化标题哈希匹配和模糊匹配。
+    模糊匹配使用内存中的标题词倒排索引选出候选，再用 difflib 计算相似度，
+    索引按论文ID增量补充；事务回滚后需调用 reset_index 丢弃。
+    """
+
+    def __init__(self, papers: Table, references: Table, fuzzy_threshold: float = 0.9,
+                 max_candidates: int = 20, chunk_size: int = 500):
+        self.papers = papers
+        self.references = references
+        self.fuzzy_threshold = fuzzy_threshold
+        self.max_candidates = max_candidates
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self.reset_index()
+
+    def reset_index(self):
+        """丢弃模糊匹配索引，下次使用时重建"""
+        with self._lock:
+            self._titles: Dict[int, str] = {}
+            self._postings = defaultdict(set)
+            self._indexed_id = 0
+
+    def _refresh_index(self, conn):
+        """把新论文的标题加入倒排索引"""
+        papers = self.papers
+        rows = conn.execute(
+            select(papers.c.id, papers.c.title)
+            .where(papers.c.id > self._indexed_id)
+            .order_by(papers.c.id)
+        )
+        for paper_id, title in rows:
+            normalized = normalize_title(title)
+            self._indexed_id = paper_id
+            if not normalized:
+                continue
+            self._titles[paper_id] = normalized
+            for token in set(normalized.split()):
+                self._postings[token].add(paper_id)
+
+    def fuzzy_match(self, conn, title: str) -> Optional[int]:
+        """模糊匹配标题，相似度低于阈值时返回 None"""
+        normalized = normalize_title(title)
+        tokens = set(normalized.split())
+        if not tokens:
+            return None
+
+        with self._lock:
+            self._refresh_index(conn)
+            # 过于常见的词不参与候选生成
+            common = max(50, len(self._titles) // 10)
+            shared = Counter()
+            for token in tokens:
+                postings = self._postings.get(token)
+                if postings and len(postings) <= common:
+                    shared.update(postings)
+
+            best_id = None
+            best_ratio = self.fuzzy_threshold
+            for paper_id, count in shared.most_common(self.max_candidates):
+                if count * 2 < len(tokens):
+                    break
+                ratio = difflib.SequenceMatcher(None, normalized, self._titles[paper_id]).ratio()
+                if ratio >= best_ratio:
+                    best_id, best_ratio = paper_id, ratio
+        return best_id
+
+    def _lookup(self, conn, column, keys: Iterable[str]) -> Dict[str, int]:
+        keys = list(keys)
+        found = {}
+        for start in range(0, len(keys), self.chunk_size):
+            chunk = keys[start:start + self.chunk_size]
+            found.update(conn.execute(
+                select(column, func.min(self.papers.c.id)).where(column.in_(chunk)).group_by(column)
+            ).all())
+        return found
+
+    def resolve(self, conn, references: List[Tuple[Optional[str], Optional[str]]],
+                fuzzy: bool = True) -> List[Optional[int]]:
+        """解析 (标题, DOI) 列表，返回对应的论文ID（未找到为 None）"""
+        doi_keys = [normalize_doi(doi) for _, doi in references]
+        title_keys = [title_key(title) for title, _ in references]
+        by_doi = self._lookup(conn, self.papers.c.doi_key, {k for k in doi_keys if k})
+        by_title = self._lookup(conn, self.papers.c.title_key, {k for k in title_keys if k})
+
+        resolved = []
+        for (title, _), doi, key in zip(references, doi_keys, title_keys):
+            paper_id = by_doi.get(doi) if doi else None
+            if paper_id is None and key:
+                paper_id = by_title.get(key)
+            if paper_id is None and fuzzy and title:
+                paper_id = self.fuzzy_match(conn, title)
+            resolved.append(paper_id)
+        return resolved
+
+    def resolve_pending(self, conn, paper_ids: Optional[List[int]] = None, fuzzy: bool = True) -> int:
+        """解析尚未链接的参考文献，paper_ids 给出时只处理这些论文的参考文献，返回新链接数"""
+        refs = self.references
+        query = select(refs.c.id, refs.c.paper_id, refs.c.reference_title, refs.c.reference_doi).where(
+            refs.c.resolved_paper_id.is_(None)
+        )
+        if paper_ids is None:
+            # 全量解析按参考文献ID分页
+            pages = self._pages(conn, query)
+        else:
+            pages = (
+                conn.execute(query.where(refs.c.paper_id.in_(paper_ids[start:start + self.chunk_size]))).all()
+                for start in range(0, len(paper_ids), self.chunk_size)
+            )
+        linked = 0
+        for rows in pages:
+            resolved = self.resolve(conn, [(row.reference_title, row.reference_doi) for row in rows], fuzzy)
+            linked += self._link(conn, [
+                (row.id, row.paper_id, target) for row, target in zip(rows, resolved) if target is not None
+            ])
+        return linked
+
+    def _link(self, conn, links: List[Tuple[int, int, int]]) -> int:
+        """写入 (参考文献ID, 引用论文ID, 被引论文ID)，并更新引用论文的 updated_at，
+        使增量快照和结果缓存感知引文关系的变化"""
+        links = [link for link in links if link[1] != link[2]]
+        if not links:
+            return 0
+        refs = self.references
+        conn.execute(
+            refs.update().where(refs.c.id == bindparam('b_id')).values(resolved_paper_id=bindparam('b_resolved')),
+            [{'b_id': ref_id, 'b_resolved': target} for ref_id, _, target in links]
+        )
+        citing = sorted({paper_id for _, paper_id, _ in links})
+        for start in range(0, len(citing), self.chunk_size):
+            conn.execute(
+                self.papers.update()
+                .where(self.papers.c.id.in_(citing[start:start + self.chunk_size]))
+                .values(updated_at=datetime.now())
+            )
+        return len(links)
+
+    def _pages(self, conn, query):
+        refs = self.references
+        query = query.order_by(refs.c.id).limit(self.chunk_size)
+        last_id = 0
+        while True:
+            rows = conn.execute(query.where(refs.c.id > last_id)).all()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1].id
+
+    def link_new_papers(self, conn, paper_ids: List[int]) -> int:
+        """把此前未解析、DOI 或标题哈希与新论文一致的参考文献链接到新论文，返回链接数"""
+        papers = self.papers
+        refs = self.references
+        linked = 0
+        for start in range(0, len(paper_ids), self.chunk_size):
+            rows = conn.execute(
+                select(papers.c.id, papers.c.doi_key, papers.c.title_key)
+                .where(papers.c.id.in_(paper_ids[start:start + self.chunk_size]))
+            ).all()
+            # DOI 优先于标题
+            for column, position in ((refs.c.doi_key, 1), (refs.c.title_key, 2)):
+                targets = {row[position]: row.id for row in rows if row[position]}
+                if not targets:
+                    continue
+                pending = conn.execute(
+                    select(refs.c.id, refs.c.paper_id, column)
+                    .where(refs.c.resolved_paper_id.is_(None), column.in_(list(targets)))
+                ).all()
+                linked += self._link(conn, [(ref_id, paper_id, targets[key]) for ref_id, paper_id, key in pending])
+        return linked
+
+    def on_ingest(self, session, paper_ids: List[int], papers_data: List[dict]):
+        """入库钩子：解析新论文的参考文献，并把旧参考文献链接到新论文"""
+        conn = session.connection()
+        self.resolve_pending(conn, paper_ids)
+        self.link_new_papers(conn, paper_ids)
+
+    def backfill_keys(self, conn) -> int:
+        """为迁移前入库的论文和参考文献补齐匹配键，返回更新的行数"""
+        updated = 0
+        for table, title_column, doi_column in (
+            (self.papers, self.papers.c.title, self.papers.c.doi),
+            (self.references, self.references.c.reference_title, self.references.c.reference_doi)
+        ):
+            rows = conn.execute(
+                select(table.c.id, title_column, doi_column)
+                .where(table.c.title_key.is_(None), title_column.isnot(None))
+            ).all()
+            rows += conn.execute(
+                select(table.c.id, title_column, doi_column)
+                .where(table.c.doi_key.is_(None), doi_column.isnot(None), table.c.title_key.isnot(None))
+            ).all()
+            params = [
+                {'b_id': row[0], 'b_title_key': title_key(row[1]), 'b_doi_key': normalize_doi(row[2])}
+                for row in rows
+            ]
+            if params:
+                conn.execute(
+                    table.update().where(table.c.id == bindparam('b_id')).values(
+                        title_key=bindparam('b_title_key'), doi_key=bindparam('b_doi_key')
+                    ),
+                    params
+                )
+            updated += len(params)
+        return updated
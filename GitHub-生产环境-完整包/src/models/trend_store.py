@@ -0,0 +1,208 @@
+import math
+import re
+from collections import Counter, defaultdict
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import Table, select, func, bindparam
+
+# 与 TfidfVectorizer 默认分词一致
+_TOKEN = re.compile(r'(?u)\b\w\w+\b')
+
+def _day(value) -> Optional[str]:
+    """日期统一为 'YYYY-MM-DD' 字符串，与 count_papers_by('day') 的键一致"""
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.strftime('%Y-%m-%d')
+    return str(value)[:10]
+
+class TermTrendStore:
+    """按日累计的关键词计数
+
+    term_counts 表保存 (日期, 词) -> (出现次数, 文档数)，daily_counts 表保存每日论文数。
+    论文入库时在同一事务中用数据库的 upsert 累加计数，任意日期窗口的
+    高频词和词频趋势只需对计数表求和，不再读取论文文本。
+    分词与 TfidfVectorizer 默认规则一致（小写、至少两个字符），去除停用词
+    （默认为 scikit-learn 的英文停用词，首次分词时才导入）。
+    """
+
+    def __init__(self, term_counts: Table, daily_counts: Table, max_term_length: int = 100,
+                 stop_words: Optional[Iterable[str]] = None):
+        self.term_counts = term_counts
+        self.daily_counts = daily_counts
+        self.max_term_length = max_term_length
+        self._stop_words = frozenset(stop_words) if stop_words is not None else None
+
+    @property
+    def stop_words(self) -> frozenset:
+        if self._stop_words is None:
+            from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+            self._stop_words = frozenset(ENGLISH_STOP_WORDS)
+        return self._stop_words
+
+    def tokenize(self, text: str) -> List[str]:
+        stop_words = self.stop_words
+        return [
+            token for token in _TOKEN.findall(text.lower())
+            if token not in stop_words and len(token) <= self.max_term_length
+        ]
+
+    def count(self, papers: Iterable[Tuple[object, Optional[str], Optional[str]]]):
+        """统计 (发布日期, 标题, 摘要)，返回 ({(日期, 词): [次数, 文档数]}, {日期: 论文数})"""
+        terms = defaultdict(lambda: [0, 0])
+        documents = Counter()
+        for published_date, title, abstract in papers:
+            day = _day(published_date)
+            if day is None:
+                continue
+            documents[day] += 1
+            for term, n in Counter(self.tokenize(f"{title} {abstract}")).items():
+                entry = terms[(day, term)]
+                entry[0] += n
+                entry[1] += 1
+        return terms, documents
+
+    def _upsert(self, conn, table: Table, keys: List[str], rows: List[dict], chunk_size: int = 500):
+        """按主键累加计数列；支持 upsert 的数据库一条语句完成，其余先查后写"""
+        if not rows:
+            return
+        value_columns = [name for name in rows[0] if name not in keys]
+        dialect = conn.dialect.name
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            if dialect in ('sqlite', 'postgresql'):
+                if dialect == 'sqlite':
+                    from sqlalchemy.dialects.sqlite import insert
+                else:
+                    from sqlalchemy.dialects.postgresql import insert
+                statement = insert(table)
+                statement = statement.on_conflict_do_update(
+                    index_elements=keys,
+                    set_={name: table.c[name] + statement.excluded[name] for name in value_columns}
+                )
+                conn.execute(statement, chunk)
+            elif dialect in ('mysql', 'mariadb'):
+                from sqlalchemy.dialects.mysql import insert
+                statement = insert(table)
+                statement = statement.on_duplicate_key_update(
+                    {name: table.c[name] + statement.inserted[name] for name in value_columns}
+                )
+                conn.execute(statement, chunk)
+            else:
+                self._upsert_generic(conn, table, keys, value_columns, chunk)
+
+    @staticmethod
+    def _upsert_generic(conn, table: Table, keys: List[str], value_columns: List[str], rows: List[dict]):
+        existing = set()
+        key_columns = [table.c[name] for name in keys]
+        for row in rows:
+            condition = [column == row[column.name] for column in key_columns]
+            if conn.execute(select(func.count()).select_from(table).where(*condition)).scalar():
+                existing.add(tuple(row[name] for name in keys))
+        updates = [row for row in rows if tuple(row[name] for name in keys) in existing]
+        inserts = [row for row in rows if tuple(row[name] for name in keys) not in existing]
+        if updates:
+            conn.execute(
+                table.update()
+                .where(*[column == bindparam(f'b_{column.name}') for column in key_columns])
+                .values({name: table.c[name] + bindparam(f'b_{name}') for name in value_columns}),
+                [{f'b_{name}': value for name, value in row.items()} for row in updates]
+            )
+        if inserts:
+            conn.execute(table.insert(), inserts)
+
+    def add(self, conn, papers: Iterable[Tuple[object, Optional[str], Optional[str]]]) -> int:
+        """把论文计入计数表，返回计入的论文数"""
+        terms, documents = self.count(papers)
+        self._upsert(conn, self.term_counts, ['day', 'term'], [
+            {'day': day, 'term': term, 'term_count': n, 'doc_count': df}
+            for (day, term), (n, df) in sorted(terms.items())
+        ])
+        self._upsert(conn, self.daily_counts, ['day'], [
+            {'day': day, 'paper_count': n} for day, n in sorted(documents.items())
+        ])
+        return sum(documents.values())
+
+    def on_ingest(self, session, paper_ids: List[int], papers_data: List[dict]):
+        """入库钩子：累加新论文的按日词频"""
+        self.add(session.connection(), (
+            (d.get('published_date'), d.get('title'), d.get('abstract')) for d in papers_data
+        ))
+
+    def rebuild(self, conn, papers: Table, chunk_size: int = 1000) -> int:
+        """清空计数表并按论文表重新统计（用于历史数据和修复），返回统计的论文数"""
+        conn.execute(self.term_counts.delete())
+        conn.execute(self.daily_counts.delete())
+        query = (
+            select(papers.c.id, papers.c.published_date, papers.c.title, papers.c.abstract)
+            .order_by(papers.c.id).limit(chunk_size)
+        )
+        total = 0
+        last_id = None
+        while True:
+            rows = conn.execute(query if last_id is None else query.where(papers.c.id > last_id)).all()
+            if not rows:
+                return total
+            total += self.add(conn, ((row.published_date, row.title, row.abstract) for row in rows))
+            last_id = rows[-1].id
+
+    @staticmethod
+    def _window(query, column, start, end):
+        if start is not None:
+            query = query.where(column >= _day(start))
+        if end is not None:
+            query = query.where(column < _day(end))
+        return query
+
+    def top_terms(self, conn, start=None, end=None, k: int = 10,
+                  exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """日期窗口内（含 start，不含 end）得分最高的 k 个词 [(词, 得分)]
+
+        得分为窗口内的总次数乘以平滑 IDF（log((1+N)/(1+df))+1，N 为窗口内论文数），
+        与对窗口内论文的 TF-IDF（未做逐篇归一化）按列求和相同。数据库按总次数降序
+        分页返回候选词，通常只需读取第一页。
+        """
+        table = self.term_counts
+        n_documents = conn.execute(
+            self._window(select(func.coalesce(func.sum(self.daily_counts.c.paper_count), 0)),
+                         self.daily_counts.c.day, start, end)
+        ).scalar()
+        if not n_documents:
+            return []
+        total = func.sum(table.c.term_count)
+        query = self._window(select(table.c.term, total, func.sum(table.c.doc_count)), table.c.day, start, end)
+        query = query.group_by(table.c.term).order_by(total.desc(), table.c.term)
+        # 排除词（如整张停用词表）可能超过数据库的参数个数上限，在读取后过滤
+        exclude = set(exclude)
+
+        # IDF 在 df=1 时最大，按总次数降序分页读取，剩余词的得分上界低于第 k 名时停止
+        max_idf = math.log((1 + n_documents) / 2) + 1
+        page_size = max(4 * k, 100)
+        scores = []
+        offset = 0
+        while k > 0:
+            rows = conn.execute(query.limit(page_size).offset(offset)).all()
+            scores.extend(
+                (term, count * (math.log((1 + n_documents) / (1 + df)) + 1))
+                for term, count, df in rows if term not in exclude
+            )
+            scores.sort(key=lambda item: (-item[1], item[0]))
+            del scores[k:]
+            if len(rows) < page_size or (len(scores) == k and rows[-1][1] * max_idf < scores[-1][1]):
+                break
+            offset += page_size
+        return scores
+
+    def term_trend(self, conn, terms: List[str], start=None, end=None) -> Dict[str, Dict[str, int]]:
+        """指定词在窗口内每日出现的论文数 {词: {日期: 文档数}}"""
+        table = self.term_counts
+        trend = {term: {} for term in terms}
+        rows = conn.execute(
+            self._window(select(table.c.term, table.c.day, table.c.doc_count), table.c.day, start, end)
+            .where(table.c.term.in_([term.lower() for term in terms]))
+            .order_by(table.c.day)
+        )
+        lowered = {term.lower(): term for term in terms}
+        for term, day, doc_count in rows:
+            trend[lowered[term]][day] = doc_count
+        return trend
@@ -1,67 +1,286 @@
-from typing import List, Dict, Tuple
-import numpy as np
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.decomposition import LatentDirichletAllocation, NMF
-from sklearn.cluster import KMeans
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-import networkx as nx
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 from collections import Counter
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
-import seaborn as sns
 from datetime import datetime
-import nltk
-from ..models.database import Paper, DatabaseManager
+from functools import partial
+import hashlib
 import os
+import numpy as np
+from ..models.database import Paper, DatabaseManager
+from . import nlp_resources
+from .report_dag import ReportDAG, Output, analyzer_stage, to_records
+from .result_cache import ResultCache
+
+# pandas、scikit-learn、scipy、NLTK 和绘图库在用到它们的分析中才导入，
+# 只用到部分功能的命令行任务不必承担全部的导入开销
+if TYPE_CHECKING:
+    from scipy import sparse
+    from .dtm_store import DocumentTermStore
+    from .similarity_index import SimilarityIndex
+    from .streaming import ChunkSource
+    from .text_pipeline import TextPreprocessor
+    from .topic_model import IncrementalTopicModel
 
 class PaperAnalyzer:
     """增强的论文分析器"""
     
-    def __init__(self, db_manager: DatabaseManager):
+    # 预处理逻辑变化时递增，使持久化的分词缓存失效
+    PREPROCESS_VERSION = 1
+    # 作者合作网络指标的计算方式变化时递增，使缓存的分析结果失效
+    AUTHORS_VERSION = 2
+    
+    def __init__(self, db_manager: DatabaseManager, tokenizer_mode: str = "compat",
+                 preprocess_workers: int = None, cache_dir: str = "cache",
+                 result_cache_bytes: int = 256 * 1024 * 1024):
         self.db_manager = db_manager
-        self.lemmatizer = WordNetLemmatizer()
-        
-        # 下载必要的NLTK数据
-        try:
-            nltk.data.find('tokenizers/punkt')
-            nltk.data.find('corpora/stopwords')
-            nltk.data.find('wordnet')
-        except LookupError:
-            nltk.download('punkt')
-            nltk.download('stopwords')
-            nltk.download('wordnet')
-        
-        self.stop_words = set(stopwords.words('english') + stopwords.words('chinese'))
+        self.cache_dir = cache_dir
+        # 分析结果缓存，result_cache_bytes 为 0 时不缓存
+        self.result_cache = (
+            ResultCache(os.path.join(cache_dir, "results"), result_cache_bytes) if result_cache_bytes else None
+        )
+        self.tokenizer_mode = tokenizer_mode
+        self.preprocess_workers = preprocess_workers
+        self._text_preprocessor = None
+        self._dtm_store = None
+    
+    def close(self):
+        """关闭预处理进程池（若已创建）"""
+        if self._text_preprocessor is not None:
+            self._text_preprocessor.close()
+    
+    def __enter__(self) -> 'PaperAnalyzer':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    @property
+    def stop_words(self) -> frozenset:
+        """停用词（进程内共享，首次使用时加载 NLTK 数据）"""
+        return nlp_resources.stop_words()
+    
+    @property
+    def lemmatizer(self):
+        return nlp_resources.lemmatizer()
+    
+    @property
+    def text_preprocessor(self) -> 'TextPreprocessor':
+        """批量预处理：分词、带缓存的词形还原、去除停用词和标点，大批量时使用进程池"""
+        if self._text_preprocessor is None:
+            from .text_pipeline import TextPreprocessor
+            self._text_preprocessor = TextPreprocessor(
+                self.stop_words, mode=self.tokenizer_mode, workers=self.preprocess_workers
+            )
+        return self._text_preprocessor
     
     def preprocess_text(self, text: str) -> str:
         """文本预处理"""
-        # 分词
-        tokens = word_tokenize(text.lower())
-        # 词形还原
-        tokens = [self.lemmatizer.lemmatize(token) for token in tokens]
-        # 去除停用词和标点
-        tokens = [token for token in tokens if token not in self.stop_words and token.isalnum()]
-        return ' '.join(tokens)
-    
-    def topic_modeling(self, papers: List[Paper], num_topics: int = 5) -> Dict:
-        """主题建模分析"""
-        # 准备文档
+        return self.text_preprocessor.process_one(text)
+    
+    def _content_hash(self, text: str) -> str:
+        """预处理输入的内容哈希（包含分词模式）"""
+        key = f"{self.PREPROCESS_VERSION}:{self.tokenizer_mode}\0{text}"
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+    
+    def preprocess_papers(self, papers: List[Paper]) -> List[str]:
+        """批量预处理论文标题和摘要
+        
+        结果按论文ID和内容哈希缓存在 paper_tokens 表中，
+        只有新增或内容变化的论文才会重新分词。
+        """
         documents = [f"{p.title} {p.abstract}" for p in papers]
-        processed_docs = [self.preprocess_text(doc) for doc in documents]
+        paper_ids = [getattr(p, 'id', None) for p in papers]
+        if self.db_manager is None:
+            return self.text_preprocessor.process(documents)
+        
+        cached = self.db_manager.get_cached_tokens([i for i in paper_ids if i is not None])
+        processed = [None] * len(documents)
+        hashes = {}
+        missing = []
+        for index, (paper_id, doc) in enumerate(zip(paper_ids, documents)):
+            content_hash = self._content_hash(doc)
+            entry = cached.get(paper_id)
+            if entry is not None and entry[0] == content_hash:
+                processed[index] = entry[1]
+            else:
+                hashes[index] = content_hash
+                missing.append(index)
+        
+        # 未命中的文档统一批量处理
+        fresh = {}
+        results = self.text_preprocessor.process([documents[i] for i in missing])
+        for index, tokens in zip(missing, results):
+            processed[index] = tokens
+            if paper_ids[index] is not None:
+                fresh[paper_ids[index]] = (hashes[index], tokens)
         
-        # TF-IDF向量化
-        vectorizer = TfidfVectorizer(max_features=1000)
-        tfidf_matrix = vectorizer.fit_transform(processed_docs)
+        if fresh:
+            self.db_manager.save_cached_tokens(fresh)
+        return processed
+    
+    @property
+    def dtm_store(self) -> 'DocumentTermStore':
+        """持久化的文档-词矩阵，各项分析共用"""
+        if self._dtm_store is None:
+            from .dtm_store import DocumentTermStore
+            self._dtm_store = DocumentTermStore(os.path.join(self.cache_dir, "dtm"))
+        return self._dtm_store
+    
+    def document_term_matrix(self, papers: List[Paper]) -> Optional['sparse.csr_matrix']:
+        """论文的词频矩阵，行顺序与 papers 一致，列对应 dtm_store.vocabulary
+        
+        新增或内容变化的论文先预处理再追加到矩阵存储中；
+        没有数据库或论文未入库（没有ID）时返回 None。
+        """
+        paper_ids = [getattr(p, 'id', None) for p in papers]
+        if self.db_manager is None or not papers or None in paper_ids:
+            return None
+        
+        hashes = [self._content_hash(f"{p.title} {p.abstract}") for p in papers]
+        rows = self.dtm_store.rows(paper_ids, hashes)
+        missing = {}
+        for index, row in enumerate(rows):
+            if row is None:
+                missing.setdefault(paper_ids[index], index)
+        if missing:
+            indexes = list(missing.values())
+            documents = self.preprocess_papers([papers[i] for i in indexes])
+            self.dtm_store.append(
+                [paper_ids[i] for i in indexes], [hashes[i] for i in indexes], documents
+            )
+            rows = self.dtm_store.rows(paper_ids, hashes)
+        
+        matrix = self.dtm_store.matrix()
+        if len(rows) == matrix.shape[0] and rows == list(range(matrix.shape[0])):
+            return matrix
+        return matrix[rows]
+    
+    def _tfidf_from_counts(self, counts: 'sparse.csr_matrix',
+                           max_features: int = 1000) -> Tuple['sparse.csr_matrix', np.ndarray]:
+        """按 TfidfVectorizer(max_features) 的规则从词频矩阵得到 TF-IDF 和特征词"""
+        from sklearn.feature_extraction.text import TfidfTransformer
+        
+        totals = np.asarray(counts.sum(axis=0)).ravel()
+        columns = np.flatnonzero(totals)
+        if len(columns) > max_features:
+            columns = columns[np.argsort(-totals[columns], kind='stable')[:max_features]]
+        vocabulary = self.dtm_store.vocabulary
+        # 与 TfidfVectorizer 一样按词的字典序排列特征
+        columns = sorted(columns, key=lambda i: vocabulary[i])
+        feature_names = np.array([vocabulary[i] for i in columns], dtype=object)
+        tfidf_matrix = TfidfTransformer().fit_transform(counts[:, columns].astype(np.float64))
+        return tfidf_matrix, feature_names
+    
+    def term_frequencies(self, papers: List[Paper]) -> Dict[str, float]:
+        """论文集合中各词的总词频（优先来自文档-词矩阵，否则统计预处理结果）"""
+        counts = self.document_term_matrix(papers)
+        if counts is None:
+            return dict(Counter(token for doc in self.preprocess_papers(papers) for token in doc.split()))
+        totals = np.asarray(counts.sum(axis=0)).ravel()
+        vocabulary = self.dtm_store.vocabulary
+        return {vocabulary[i]: float(totals[i]) for i in np.flatnonzero(totals)}
+    
+    def _similarity_index_path(self, n_components: Optional[int]) -> str:
+        return os.path.join(self.cache_dir, f"similarity_{n_components or 'tfidf'}.joblib")
+    
+    def update_similarity_index(self, n_components: Optional[int] = None,
+                                chunk_size: int = 1000) -> 'SimilarityIndex':
+        """把库中新增或变化的论文加入文档-词矩阵和相似论文索引
+        
+        需要遍历全库计算内容哈希，由入库后的维护任务（cli index-similarity）调用。
+        """
+        from .similarity_index import SimilarityIndex
+        
+        for chunk in self.db_manager.iter_paper_chunks(chunk_size, columns=('id', 'title', 'abstract')):
+            self.document_term_matrix(chunk)
+        
+        path = self._similarity_index_path(n_components)
+        index = SimilarityIndex.load(path, n_components)
+        if index.update(self.dtm_store) or not os.path.exists(path):
+            index.save()
+        return index
+    
+    def related_papers(self, query, k: int = 10, n_components: Optional[int] = None) -> List[Dict]:
+        """相似论文查询
+        
+        query 为论文ID时返回与该论文最相似的论文（不含自身），为字符串时按文本
+        （如故障报告）检索。n_components 给出时使用 LSA 降维后的向量。
+        只读取已持久化的索引，不扫描论文库；索引由 update_similarity_index 维护。
+        返回按相似度排序的 [{"paper_id", "title", "score"}]。
+        """
+        from .similarity_index import SimilarityIndex
+        
+        path = self._similarity_index_path(n_components)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Similarity index {path} not found, run update_similarity_index first")
+        index = SimilarityIndex.load(path, n_components)
+        if isinstance(query, str):
+            vector = index.vectorize_text(self.dtm_store, self.preprocess_text(query))
+            matches = index.top_k(vector, k)
+        else:
+            vector = index.vector(query)
+            if vector is None:
+                raise KeyError(f"Paper {query} is not in the similarity index")
+            matches = index.top_k(vector, k, exclude=query)
+        
+        titles = self.db_manager.get_paper_titles([paper_id for paper_id, _ in matches])
+        return [
+            {"paper_id": paper_id, "title": titles.get(paper_id), "score": score}
+            for paper_id, score in matches
+        ]
+    
+    def analysis_key(self, name: str, papers: Optional[List[Paper]], params: Dict) -> Optional[str]:
+        """分析结果的缓存键；不缓存或论文未入库时返回 None"""
+        if self.result_cache is None or papers is None:
+            return None
+        fingerprint = ResultCache.fingerprint(papers)
+        if fingerprint is None:
+            return None
+        return self.result_cache.key(name, fingerprint, params)
+    
+    def _cached(self, name: str, papers: Optional[List[Paper]], params: Dict, compute) -> Dict:
+        key = self.analysis_key(name, papers, params)
+        if key is None:
+            return compute()
+        result, _ = self.result_cache.get_or_compute(key, compute)
+        return result
+    
+    def _topic_params(self, num_topics: int) -> Dict:
+        return {
+            "num_topics": num_topics,
+            "tokenizer": self.tokenizer_mode,
+            "preprocess_version": self.PREPROCESS_VERSION
+        }
+    
+    def topic_modeling(self, papers: List[Paper], num_topics: int = 5, incremental: bool = False) -> Dict:
+        """主题建模分析
+        
+        incremental 为 True 时使用持久化的在线LDA模型，只用新论文更新模型，
+        已有论文直接读取存储的主题向量。
+        """
+        if incremental:
+            return self._incremental_topic_modeling(papers, num_topics)
+        return self._cached("topics", papers, self._topic_params(num_topics),
+                            lambda: self._topic_modeling(papers, num_topics))
+    
+    def _topic_modeling(self, papers: List[Paper], num_topics: int) -> Dict:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.decomposition import LatentDirichletAllocation
+        
+        # TF-IDF向量化：优先使用持久化的文档-词矩阵，未入库的论文现场向量化
+        counts = self.document_term_matrix(papers)
+        if counts is not None:
+            tfidf_matrix, feature_names = self._tfidf_from_counts(counts, max_features=1000)
+        else:
+            processed_docs = self.preprocess_papers(papers)
+            vectorizer = TfidfVectorizer(max_features=1000)
+            tfidf_matrix = vectorizer.fit_transform(processed_docs)
+            feature_names = vectorizer.get_feature_names_out()
         
         # LDA主题模型
         lda = LatentDirichletAllocation(n_components=num_topics, random_state=42)
         lda_output = lda.fit_transform(tfidf_matrix)
         
         # 获取主题词
-        feature_names = vectorizer.get_feature_names_out()
         topics = {}
         for topic_idx, topic in enumerate(lda.components_):
             top_words = [feature_names[i] for i in topic.argsort()[:-10-1:-1]]
@@ -72,22 +291,129 @@ class PaperAnalyzer:
             "document_topics": lda_output.tolist()
         }
     
-    def citation_network_analysis(self, papers: List[Paper]) -> Dict:
-        """引文网络分析"""
-        G = nx.DiGraph()
+    def streaming_topic_modeling(self, num_topics: int = 5, chunks: 'ChunkSource' = None,
+                                 chunk_size: int = 1000, n_features: int = 2 ** 18,
+                                 with_document_topics: bool = False) -> Dict:
+        """流式主题建模，用于超出内存的语料
+        
+        chunks 返回论文分块的迭代器（默认分块读取数据库，也可用快照的 iter_chunks），
+        每块中的论文需有 id/title/abstract。第一遍用特征哈希累计文档频率，
+        第二遍逐块 partial_fit 在线LDA，内存占用只与 n_features 和块大小有关。
+        with_document_topics 为 True 时再遍历一次，返回每篇论文的主题分布。
+        """
+        from sklearn.decomposition import LatentDirichletAllocation
+        from .streaming import fit_streaming_tfidf
+        
+        if chunks is None:
+            chunks = partial(self.db_manager.iter_paper_chunks, chunk_size, columns=('id', 'title', 'abstract'))
+        
+        tfidf = fit_streaming_tfidf(chunks, self.preprocess_papers, n_features=n_features)
+        lda = LatentDirichletAllocation(
+            n_components=num_topics, learning_method='online', random_state=42,
+            total_samples=max(tfidf.n_documents, 1)
+        )
+        for chunk in chunks():
+            if chunk:
+                lda.partial_fit(tfidf.transform(self.preprocess_papers(chunk)))
+        
+        topics = {
+            f"Topic {topic_idx + 1}": tfidf.top_terms(topic, 10)
+            for topic_idx, topic in enumerate(lda.components_)
+        }
+        result = {"topics": topics, "num_documents": tfidf.n_documents}
+        
+        if with_document_topics:
+            paper_ids = []
+            document_topics = []
+            for chunk in chunks():
+                if chunk:
+                    paper_ids.extend(p.id for p in chunk)
+                    document_topics.extend(lda.transform(tfidf.transform(self.preprocess_papers(chunk))).tolist())
+            result["paper_ids"] = paper_ids
+            result["document_topics"] = document_topics
+        return result
+    
+    def load_topic_model(self, num_topics: int = 5) -> 'IncrementalTopicModel':
+        """加载持久化的增量主题模型"""
+        from .topic_model import IncrementalTopicModel
+        
+        path = os.path.join(self.cache_dir, f"topic_model_{num_topics}.joblib")
+        return IncrementalTopicModel.load(path, num_topics=num_topics)
+    
+    def _incremental_topic_modeling(self, papers: List[Paper], num_topics: int) -> Dict:
+        """增量主题建模：只对尚无主题向量的论文更新模型"""
+        model = self.load_topic_model(num_topics)
+        paper_ids = [getattr(p, 'id', None) for p in papers]
+        stored = {}
+        if self.db_manager is not None and model.fitted:
+            stored = self.db_manager.get_topic_vectors(
+                [i for i in paper_ids if i is not None], model.model_id
+            )
+        
+        document_topics = [stored.get(i) for i in paper_ids]
+        missing = [index for index, vector in enumerate(document_topics) if vector is None]
+        if missing:
+            vectors = model.update(self.preprocess_papers([papers[i] for i in missing])).tolist()
+            model.save()
+            fresh = {}
+            for index, vector in zip(missing, vectors):
+                document_topics[index] = vector
+                if paper_ids[index] is not None:
+                    fresh[paper_ids[index]] = vector
+            if self.db_manager is not None and fresh:
+                self.db_manager.save_topic_vectors(fresh, model.model_id)
+        
+        return {
+            "topics": model.topics(),
+            "document_topics": document_topics
+        }
+    
+    def get_paper_topics(self, paper_ids: List[int], num_topics: int = 5) -> Dict[int, List[float]]:
+        """读取论文在当前增量主题模型下的主题分布，无需重新拟合"""
+        model = self.load_topic_model(num_topics)
+        if not model.fitted:
+            return {}
+        return self.db_manager.get_topic_vectors(paper_ids, model.model_id)
+    
+    def citation_network_analysis(self, papers: List[Paper], betweenness_k: Optional[int] = None) -> Dict:
+        """引文网络分析
+        
+        betweenness_k 为 None 时精确计算介数中心性；给出时只从 k 个随机源点
+        近似计算，k 越大误差越小、耗时越长。
+        """
+        return self._cached("citation", papers, {"betweenness_k": betweenness_k},
+                            lambda: self._citation_network_analysis(papers, betweenness_k))
+    
+    def _citation_network_analysis(self, papers: List[Paper], betweenness_k: Optional[int]) -> Dict:
+        from .graph_engine import CitationGraph
+        
+        graph = CitationGraph()
+        
+        # 构建引文网络：已入库的论文以ID为节点，已解析的参考文献直接连到被引论文，
+        # 未解析的参考文献仍以标题为节点
+        def node_key(paper):
+            paper_id = getattr(paper, 'id', None)
+            return ('paper', paper_id) if paper_id is not None else paper.title
         
-        # 构建引文网络
+        titles = {getattr(p, 'id', None): p.title for p in papers}
+        nodes_by_title = {p.title: node_key(p) for p in papers}
         for paper in papers:
-            G.add_node(paper.title, year=paper.published_date.year)
+            source = node_key(paper)
+            graph.add_node(source, paper.title)
             for ref in paper.references:
-                if ref.reference_title:
-                    G.add_edge(paper.title, ref.reference_title)
+                resolved_id = getattr(ref, 'resolved_paper_id', None)
+                if resolved_id is not None:
+                    label = titles.get(resolved_id) or ref.reference_title or ref.reference_doi
+                    graph.add_edge(source, ('paper', resolved_id), target_label=label)
+                elif ref.reference_title:
+                    graph.add_edge(source, nodes_by_title.get(ref.reference_title, ref.reference_title),
+                                   target_label=ref.reference_title)
         
         # 计算网络指标
         metrics = {
-            "degree_centrality": nx.degree_centrality(G),
-            "betweenness_centrality": nx.betweenness_centrality(G),
-            "pagerank": nx.pagerank(G)
+            "degree_centrality": graph.to_dict(graph.degree_centrality()),
+            "betweenness_centrality": graph.to_dict(graph.betweenness_centrality(k=betweenness_k, seed=42)),
+            "pagerank": graph.to_dict(graph.pagerank())
         }
         
         # 识别关键论文
@@ -100,29 +426,24 @@ class PaperAnalyzer:
         return {
             "metrics": metrics,
             "key_papers": key_papers,
-            "network_density": nx.density(G),
-            "average_clustering": nx.average_clustering(G)
+            "network_density": graph.density(),
+            "average_clustering": graph.average_clustering()
         }
     
     def author_collaboration_analysis(self, papers: List[Paper]) -> Dict:
-        """作者合作网络分析"""
-        G = nx.Graph()
+        """作者合作网络分析（论文×作者关联矩阵构建合作网络）"""
+        return self._cached("authors", papers, {"version": self.AUTHORS_VERSION}, lambda: self._author_collaboration_analysis(papers))
+    
+    def _author_collaboration_analysis(self, papers: List[Paper]) -> Dict:
+        from .graph_engine import CollaborationGraph
         
-        # 构建合作网络
-        for paper in papers:
-            authors = [author.name for author in paper.authors]
-            for i in range(len(authors)):
-                for j in range(i + 1, len(authors)):
-                    if G.has_edge(authors[i], authors[j]):
-                        G[authors[i]][authors[j]]['weight'] += 1
-                    else:
-                        G.add_edge(authors[i], authors[j], weight=1)
+        G = CollaborationGraph([author.name for author in paper.authors] for paper in papers)
         
         # 计算合作指标
         metrics = {
-            "degree_centrality": nx.degree_centrality(G),
-            "clustering_coefficient": nx.clustering(G),
-            "eigenvector_centrality": nx.eigenvector_centrality_numpy(G)
+            "degree_centrality": G.to_dict(G.degree_centrality()),
+            "clustering_coefficient": G.to_dict(G.clustering()),
+            "eigenvector_centrality": G.to_dict(G.eigenvector_centrality())
         }
         
         # 识别核心作者
@@ -135,16 +456,33 @@ class PaperAnalyzer:
         return {
             "metrics": metrics,
             "core_authors": core_authors,
-            "network_density": nx.density(G),
-            "average_clustering": nx.average_clustering(G)
+            "network_density": G.density(),
+            "average_clustering": G.average_clustering()
         }
     
-    def temporal_analysis(self, papers: List[Paper]) -> Dict:
-        """时间序列分析"""
-        # 准备时间序列数据
-        dates = pd.Series([p.published_date for p in papers])
-        daily_counts = dates.value_counts().sort_index()
-        monthly_counts = dates.dt.to_period('M').value_counts().sort_index()
+    def temporal_analysis(self, papers: Optional[List[Paper]] = None, start: datetime = None,
+                          end: datetime = None) -> Dict:
+        """时间序列分析
+        
+        papers 为 None 时在数据库中按日、按月 GROUP BY（可用 start/end 限定范围），
+        只把聚合后的序列读出来，再计算移动平均。
+        """
+        return self._cached("temporal", papers, {}, lambda: self._temporal_analysis(papers, start, end))
+    
+    def _temporal_analysis(self, papers: Optional[List[Paper]], start: datetime, end: datetime) -> Dict:
+        import pandas as pd
+        
+        if papers is None:
+            daily = self.db_manager.count_papers_by('day', start, end)
+            monthly = self.db_manager.count_papers_by('month', start, end)
+            daily_counts = pd.Series(list(daily.values()), index=pd.to_datetime(list(daily)), dtype='int64')
+            monthly_counts = pd.Series(list(monthly.values()), index=pd.PeriodIndex(list(monthly), freq='M'),
+                                       dtype='int64')
+        else:
+            # 准备时间序列数据
+            dates = pd.Series([p.published_date for p in papers])
+            daily_counts = dates.value_counts().sort_index()
+            monthly_counts = dates.dt.to_period('M').value_counts().sort_index()
         
         # 计算趋势
         monthly_moving_avg = monthly_counts.rolling(window=3).mean()
@@ -155,60 +493,75 @@ class PaperAnalyzer:
             "trend": monthly_moving_avg.to_dict()
         }
     
-    def generate_visualizations(self, papers: List[Paper], output_dir: str):
-        """生成可视化图表"""
-        # 创建输出目录
-        os.makedirs(output_dir, exist_ok=True)
+    def add_visualization_stages(self, dag: ReportDAG, papers: List[Paper], output_dir: str,
+                                 pushdown: bool = False):
+        """把图表加入阶段图：词频和边在主进程中准备，布局和绘制在进程池中并行
         
-        # 1. 词云图
-        text = ' '.join([f"{p.title} {p.abstract}" for p in papers])
-        wordcloud = WordCloud(
-            width=1200, height=800,
-            background_color='white',
-            stopwords=self.stop_words
-        ).generate(text)
+        pushdown 为 True 时年度发文量由数据库按年聚合（全库）。
+        """
+        from .figures import render_wordcloud, render_year_distribution, graph_layout, render_citation_network
         
-        plt.figure(figsize=(15, 10))
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis('off')
-        plt.savefig(f"{output_dir}/wordcloud.png")
-        plt.close()
+        os.makedirs(output_dir, exist_ok=True)
+        
+        # 1. 词云图：使用缓存的分词结果统计词频
+        dag.add_stage("wordcloud_terms", self.term_frequencies, papers, local=True)
+        dag.add_stage("figure_wordcloud", render_wordcloud, Output("wordcloud_terms"),
+                      f"{output_dir}/wordcloud.png")
         
         # 2. 发布时间分布图
-        dates = pd.Series([p.published_date for p in papers])
-        plt.figure(figsize=(15, 6))
-        dates.dt.year.value_counts().sort_index().plot(kind='bar')
-        plt.title('Publication Year Distribution')
-        plt.xlabel('Year')
-        plt.ylabel('Number of Papers')
-        plt.savefig(f"{output_dir}/year_distribution.png")
-        plt.close()
-        
-        # 3. 引用网络图
-        citation_network = self.citation_network_analysis(papers)
-        G = nx.DiGraph()
-        for paper in papers[:50]:  # 限制显示前50篇论文以避免图太复杂
-            for ref in paper.references:
-                if ref.reference_title:
-                    G.add_edge(paper.title[:30], ref.reference_title[:30])
-        
-        plt.figure(figsize=(20, 20))
-        pos = nx.spring_layout(G)
-        nx.draw(G, pos, with_labels=True, node_color='lightblue', 
-                node_size=1000, font_size=8, arrows=True)
-        plt.savefig(f"{output_dir}/citation_network.png")
-        plt.close()
-    
-    def generate_comprehensive_report(self, papers: List[Paper], output_dir: str) -> str:
-        """生成综合分析报告"""
-        # 生成可视化
-        self.generate_visualizations(papers, f"{output_dir}/figures")
-        
-        # 获取各种分析结果
-        topics = self.topic_modeling(papers)
-        citation_analysis = self.citation_network_analysis(papers)
-        author_analysis = self.author_collaboration_analysis(papers)
-        temporal_analysis = self.temporal_analysis(papers)
+        if pushdown:
+            year_counts = {int(year): count for year, count in self.db_manager.count_papers_by('year').items()}
+        else:
+            year_counts = Counter(p.published_date.year for p in papers)
+        dag.add_stage("figure_years", render_year_distribution, dict(year_counts),
+                      f"{output_dir}/year_distribution.png")
+        
+        # 3. 引用网络图（限制显示前50篇论文以避免图太复杂），布局按边集合缓存
+        edges = [
+            (paper.title[:30], ref.reference_title[:30])
+            for paper in papers[:50] for ref in paper.references if ref.reference_title
+        ]
+        dag.add_stage("citation_layout", graph_layout, edges, os.path.join(self.cache_dir, "layouts"))
+        dag.add_stage("figure_citation", render_citation_network, edges, Output("citation_layout"),
+                      f"{output_dir}/citation_network.png")
+    
+    def generate_visualizations(self, papers: List[Paper], output_dir: str, max_workers: Optional[int] = None,
+                                pushdown: bool = False):
+        """生成可视化图表"""
+        dag = ReportDAG(max_workers=max_workers)
+        self.add_visualization_stages(dag, to_records(papers), output_dir, pushdown)
+        dag.run()
+    
+    def generate_comprehensive_report(self, papers: List[Paper], output_dir: str,
+                                      max_workers: Optional[int] = None, pushdown: bool = False) -> str:
+        """生成综合分析报告
+        
+        各项分析组成阶段图：引文、作者、时间分析和图表绘制在进程池中并行，
+        依赖数据库缓存的主题建模和词频统计在主进程中执行，每项分析只计算一次。
+        max_workers 为 1 时全部在主进程中依次执行。
+        pushdown 为 True 时时间趋势和年度分布由数据库聚合全库数据。
+        """
+        papers = to_records(papers)
+        dag = ReportDAG(max_workers=max_workers, cache=self.result_cache)
+        # 图表阶段先加入，使词频统计先于主题建模执行，词云绘制尽早开始
+        self.add_visualization_stages(dag, papers, f"{output_dir}/figures", pushdown)
+        dag.add_stage("topics", self._topic_modeling, papers, 5, local=True,
+                      cache_key=self.analysis_key("topics", papers, self._topic_params(5)))
+        dag.add_stage("citation", analyzer_stage("citation_network_analysis"), papers,
+                      cache_key=self.analysis_key("citation", papers, {"betweenness_k": None}))
+        dag.add_stage("authors", analyzer_stage("author_collaboration_analysis"), papers,
+                      cache_key=self.analysis_key("authors", papers, {"version": self.AUTHORS_VERSION}))
+        if pushdown:
+            dag.add_stage("temporal", self.temporal_analysis, local=True)
+        else:
+            dag.add_stage("temporal", analyzer_stage("temporal_analysis"), papers,
+                          cache_key=self.analysis_key("temporal", papers, {}))
+        results = dag.run()
+        
+        topics = results["topics"]
+        citation_analysis = results["citation"]
+        author_analysis = results["authors"]
+        temporal_analysis = results["temporal"]
         
         # 生成报告
         report_path = f"{output_dir}/comprehensive_analysis.md"
@@ -253,5 +606,13 @@ class PaperAnalyzer:
             f.write("![年度分布](figures/year_distribution.png)\n\n")
             f.write("### 引文网络图\n")
             f.write("![引文网络](figures/citation_network.png)\n")
+            
+            # 运行耗时
+            f.write("\n## 7. 分析耗时\n\n")
+            for stage, (elapsed, where) in dag.timings.items():
+                f.write(f"- {stage}（{where}）：{elapsed:.2f}秒\n")
+            f.write(f"- 总耗时：{dag.elapsed:.2f}秒\n")
+            if dag.cached:
+                f.write(f"- 命中结果缓存的阶段：{', '.join(dag.cached)}\n")
         
         return report_path 
\ No newline at end of file
@@ -0,0 +1,280 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime
+import heapq
+import json
+import os
+import re
+import numpy as np
+
+# 本模块不使用相对导入：界面程序以 processors.burst_detector 导入；
+# scikit-learn 在首次使用时才导入，不拖慢界面启动。
+# 同一模块会以 processors.* 和 src.* 两个名字导入，因此状态只存数组和 JSON，不用 pickle
+
+_TOKEN = re.compile(r'(?u)\b\w\w+\b')
+
+class CountMinSketch:
+    """Count-Min Sketch：固定大小的计数表，估计值只会偏大"""
+
+    def __init__(self, width: int = 2 ** 16, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int32)
+
+    def _columns(self, items: List[str]) -> np.ndarray:
+        """每个项在各行的列号，形状为 (depth, len(items))"""
+        from sklearn.utils import murmurhash3_32
+
+        # murmurhash 跨进程稳定，持久化后的计数表可以继续使用
+        return np.array([
+            [murmurhash3_32(item, seed=row, positive=True) for item in items] for row in range(self.depth)
+        ], dtype=np.int64).reshape(self.depth, len(items)) % self.width
+
+    def add_many(self, items: List[str]):
+        """每个项计数加一"""
+        rows = np.repeat(np.arange(self.depth), len(items))
+        np.add.at(self.table, (rows, self._columns(items).ravel()), 1)
+
+    def estimate_many(self, items: List[str]) -> np.ndarray:
+        columns = self._columns(items)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def clear(self):
+        self.table.fill(0)
+
+class SpaceSaving:
+    """Space-Saving 高频项统计：最多跟踪 capacity 个项
+
+    计数满时用新项替换计数最小的项，新项继承其计数作为误差上界。
+    计数 - 误差 是真实计数的下界，真实计数不小于 capacity 分之一总数的项一定被跟踪。
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.counts: Dict[str, List[int]] = {}
+        # (计数, 项) 的最小堆，计数过期的条目在弹出时丢弃
+        self._heap: List[Tuple[int, str]] = []
+
+    def add(self, item: str, count: int = 1):
+        entry = self.counts.get(item)
+        if entry is None:
+            if len(self.counts) < self.capacity:
+                entry = self.counts[item] = [0, 0]
+            else:
+                minimum, evicted = self._pop_min()
+                del self.counts[evicted]
+                entry = self.counts[item] = [minimum, minimum]
+        entry[0] += count
+        heapq.heappush(self._heap, (entry[0], item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, i) for i, (c, _) in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> Tuple[int, str]:
+        while True:
+            count, item = heapq.heappop(self._heap)
+            entry = self.counts.get(item)
+            if entry is not None and entry[0] == count:
+                return count, item
+
+    def top(self, k: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """按计数降序的 [(项, 计数, 误差)]"""
+        items = sorted(self.counts.items(), key=lambda item: (-item[1][0], item[0]))
+        return [(item, count, error) for item, (count, error) in items[:k]]
+
+    def clear(self):
+        self.counts.clear()
+        self._heap.clear()
+
+    def restore(self, counts: Dict[str, List[int]]):
+        """用 {项: [计数, 误差]} 替换当前统计"""
+        self.counts = {item: [int(count), int(error)] for item, (count, error) in counts.items()}
+        self._heap = [(count, item) for item, (count, _) in self.counts.items()]
+        heapq.heapify(self._heap)
+
+def _day(value) -> date:
+    if value is None:
+        return date.today()
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+class BurstDetector:
+    """流式突发词检测
+
+    按论文日期统计每个词（单词和相邻双词）出现的论文数（入库钩子使用发布日期，
+    与按发布日期生成的日报一致）：最新一天的高频词由 Space-Saving 跟踪，
+    之前 window_days 天的计数各存一个 Count-Min Sketch，
+    内存大小固定，与论文总数无关，不需要回扫语料。
+    当天论文占比相对滑动窗口内基线占比的提升倍数达到 min_ratio、且当天
+    论文数不少于 min_count 的词视为突发词。Space-Saving 保证当天出现次数
+    超过 总词次/capacity 的词都被跟踪，capacity 应随每日收录量调整。
+    """
+
+    def __init__(self, path: Optional[str] = None, window_days: int = 7, width: int = 2 ** 16,
+                 depth: int = 4, capacity: int = 10000, min_count: int = 3, min_ratio: float = 3.0,
+                 ngrams: int = 2, stop_words: Optional[Iterable[str]] = None):
+        self.path = path
+        self.window_days = window_days
+        self.min_count = min_count
+        self.min_ratio = min_ratio
+        self.ngrams = ngrams
+        if stop_words is None:
+            from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+            stop_words = ENGLISH_STOP_WORDS
+        self.stop_words = frozenset(stop_words)
+        self.day: Optional[date] = None
+        self.papers = 0
+        self.today = SpaceSaving(capacity)
+        self.today_sketch = CountMinSketch(width, depth)
+        # 环形缓冲：history[i] 对应 day - (i + 1) 天
+        self.history = [CountMinSketch(width, depth) for _ in range(window_days)]
+        self.history_papers = [0] * window_days
+        self.completed: Dict[date, List[Dict]] = {}
+
+    @classmethod
+    def load(cls, path: str, **options) -> 'BurstDetector':
+        """从磁盘加载检测器状态，不存在时返回新的检测器"""
+        if not os.path.exists(path):
+            return cls(path, **options)
+        with np.load(path, allow_pickle=False) as arrays:
+            state = json.loads(str(arrays["state"]))
+            detector = cls(path, stop_words=state["stop_words"], **state["options"])
+            detector.today_sketch.table = arrays["today_sketch"].copy()
+            detector.history = []
+            for table in arrays["history"]:
+                sketch = CountMinSketch(detector.today_sketch.width, detector.today_sketch.depth)
+                sketch.table = table.copy()
+                detector.history.append(sketch)
+        detector.day = _day(state["day"]) if state["day"] else None
+        detector.papers = state["papers"]
+        detector.history_papers = state["history_papers"]
+        detector.today.restore(state["today"])
+        detector.completed = {_day(day): bursts for day, bursts in state["completed"].items()}
+        return detector
+
+    def save(self):
+        """原子写入磁盘：计数表存为 npz 数组，其余状态存为其中的 JSON 字符串"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        state = {
+            "options": {
+                "window_days": self.window_days,
+                "width": self.today_sketch.width,
+                "depth": self.today_sketch.depth,
+                "capacity": self.today.capacity,
+                "min_count": self.min_count,
+                "min_ratio": self.min_ratio,
+                "ngrams": self.ngrams,
+            },
+            "stop_words": sorted(self.stop_words),
+            "day": self.day.isoformat() if self.day else None,
+            "papers": self.papers,
+            "history_papers": self.history_papers,
+            "today": self.today.counts,
+            "completed": {day.isoformat(): bursts for day, bursts in self.completed.items()},
+        }
+        tmp_path = self.path + ".tmp"
+        # 传入文件对象，避免 np.savez 自动追加 .npz 扩展名
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f, state=np.array(json.dumps(state, ensure_ascii=False)),
+                today_sketch=self.today_sketch.table,
+                history=np.stack([sketch.table for sketch in self.history]),
+            )
+        os.replace(tmp_path, self.path)
+
+    def terms(self, text: str) -> List[str]:
+        """文本中出现的词（去重）：去停用词后的单词和相邻词组"""
+        tokens = [token for token in _TOKEN.findall(text.lower()) if token not in self.stop_words]
+        terms = set(tokens)
+        for n in range(2, self.ngrams + 1):
+            terms.update(' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return sorted(terms)
+
+    def _advance(self, day: date):
+        """切换到新的一天：当天计数移入历史窗口，超出窗口的最旧一天被清空复用"""
+        if self.day is None:
+            self.day = day
+            return
+        shift = (day - self.day).days
+        if shift <= 0:
+            return
+        # 只保留最近一段时间的突发词结果
+        self.completed[self.day] = self.bursts()
+        for old in sorted(self.completed)[:-self.window_days]:
+            del self.completed[old]
+
+        for _ in range(min(shift, self.window_days + 1)):
+            oldest = self.history.pop()
+            self.history_papers.pop()
+            oldest.clear()
+            self.history.insert(0, self.today_sketch)
+            self.history_papers.insert(0, self.papers)
+            self.today_sketch = oldest
+            self.papers = 0
+        self.today.clear()
+        self.day = day
+
+    def add(self, text: str, day=None):
+        """计入一篇论文；day 为论文日期（默认今天），早于当前日期的计入对应的历史窗口"""
+        day = _day(day)
+        if self.day is None or day >= self.day:
+            self._advance(day)
+            self.papers += 1
+            terms = self.terms(text)
+            for term in terms:
+                self.today.add(term)
+            self.today_sketch.add_many(terms)
+            return
+        offset = (self.day - day).days - 1
+        if offset < self.window_days:
+            self.history_papers[offset] += 1
+            self.history[offset].add_many(self.terms(text))
+
+    def add_paper(self, paper, day=None):
+        self.add(f"{paper.title} {paper.abstract}", day)
+
+    def on_commit(self, paper_ids: List[int], papers_data: List[dict]):
+        """入库提交钩子：只计入真正新增的论文，重复爬取的论文不会被重复计数
+
+        按发布日期计数（缺失时为今天），使 generate_daily_report_from_db
+        按发布日期查到的突发词与当天报告的论文对应。
+        """
+        for paper_data in papers_data:
+            self.add(f"{paper_data.get('title') or ''} {paper_data.get('abstract') or ''}",
+                     paper_data.get('published_date'))
+
+    def bursts(self, day=None, k: int = 20) -> List[Dict]:
+        """某天（默认当前日期）的突发词，按提升倍数降序
+
+        每项为 {"term", "count", "baseline", "ratio"}：count 为当天出现的论文数（下界），
+        baseline 为窗口内按论文数折算到当天的期望论文数。
+        """
+        if day is not None and _day(day) != self.day:
+            return self.completed.get(_day(day), [])[:k]
+        if not self.papers:
+            return []
+        history_papers = sum(self.history_papers)
+        candidates = [(term, count - error) for term, count, error in self.today.top() if count - error >= self.min_count]
+        if not candidates:
+            return []
+        terms = [term for term, _ in candidates]
+        history_counts = sum(sketch.estimate_many(terms) for sketch in self.history)
+        results = []
+        for (term, count), history_count in zip(candidates, history_counts.tolist()):
+            # 加一平滑，窗口内未出现过的新词也有有限的倍数
+            baseline = (history_count + 1) / (history_papers + 1) * self.papers
+            ratio = count / baseline
+            if ratio >= self.min_ratio:
+                results.append({"term": term, "count": count, "baseline": baseline, "ratio": ratio})
+        results.sort(key=lambda item: (-item["ratio"], -item["count"], item["term"]))
+        # 词组突发时，被它完全包含且计数相同的单词不再单独列出
+        phrases = [item for item in results if ' ' in item["term"]]
+        results = [
+            item for item in results
+            if ' ' in item["term"] or not any(
+                item["term"] in phrase["term"].split() and phrase["count"] == item["count"] for phrase in phrases
+            )
+        ]
+        return results[:k]
@@ -0,0 +1,187 @@
+from typing import Dict, Iterable, List, Optional
+import html
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+def _authors(paper) -> List[str]:
+    return [getattr(author, 'name', author) for author in paper.authors]
+
+def markdown_paper(paper) -> str:
+    """单篇论文的 Markdown 段落"""
+    lines = [
+        f"### {paper.title}\n\n",
+        f"- 作者：{', '.join(_authors(paper))}\n",
+        f"- 发布日期：{paper.published_date.strftime('%Y-%m-%d')}\n",
+        f"- 来源：{paper.source}\n",
+    ]
+    if paper.doi:
+        lines.append(f"- DOI：{paper.doi}\n")
+    lines += [
+        f"- 链接：{paper.url}\n",
+        "\n**摘要：**\n\n",
+        f"{paper.abstract}\n\n",
+        "---\n\n",
+    ]
+    return ''.join(lines)
+
+def markdown_bursts(bursts: List[Dict]) -> str:
+    """突发热词表格，没有突发词时为空"""
+    if not bursts:
+        return ""
+    lines = ["## 突发热词\n\n", "| 词 | 今日论文数 | 基线 | 提升倍数 |\n", "|---|---|---|---|\n"]
+    for item in bursts:
+        lines.append(f"| {item['term']} | {item['count']} | {item['baseline']:.1f} | {item['ratio']:.1f} |\n")
+    lines.append("\n")
+    return ''.join(lines)
+
+def _html_paper(paper) -> str:
+    def e(value) -> str:
+        return html.escape(str(value))
+
+    items = [
+        f"<li>作者：{e(', '.join(_authors(paper)))}</li>",
+        f"<li>发布日期：{paper.published_date.strftime('%Y-%m-%d')}</li>",
+        f"<li>来源：{e(paper.source)}</li>",
+    ]
+    if paper.doi:
+        items.append(f"<li>DOI：{e(paper.doi)}</li>")
+    items.append(f'<li>链接：<a href="{e(paper.url)}">{e(paper.url)}</a></li>')
+    return (
+        f"<article>\n<h3>{e(paper.title)}</h3>\n<ul>{''.join(items)}</ul>\n"
+        f"<p><strong>摘要：</strong></p>\n<p>{e(paper.abstract)}</p>\n</article>\n"
+    )
+
+def _json_paper(paper) -> str:
+    return json.dumps({
+        "title": paper.title,
+        "authors": _authors(paper),
+        "published_date": paper.published_date.strftime('%Y-%m-%d'),
+        "source": paper.source,
+        "doi": paper.doi,
+        "url": paper.url,
+        "abstract": paper.abstract,
+    }, ensure_ascii=False)
+
+class DailyReportWriter:
+    """流式写出每日报告
+
+    论文逐篇按类别追加到临时分片文件（每个类别、每种格式一个），close 时
+    写入总览和突发词，再按类别首次出现的顺序把分片依次拷贝到最终报告。
+    内存中只保留各类别的论文数，与当天论文数无关。
+    """
+
+    FORMATS = ('md', 'html', 'json')
+
+    def __init__(self, output_dir: str, day: str, formats: Iterable[str] = ('md',)):
+        self.formats = list(dict.fromkeys(formats))
+        unknown = [f for f in self.formats if f not in self.FORMATS]
+        if unknown:
+            raise ValueError(f"Unknown report formats: {unknown}")
+        self.output_dir = output_dir
+        self.day = day
+        self.counts: Dict[str, int] = {}
+        os.makedirs(output_dir, exist_ok=True)
+        self._spool_dir = tempfile.mkdtemp(prefix='.daily_report_', dir=output_dir)
+        self._spools: Dict[str, Dict[str, object]] = {}
+
+    def add(self, paper, category: str):
+        spools = self._spools.get(category)
+        if spools is None:
+            index = len(self._spools)
+            spools = self._spools[category] = {
+                fmt: open(os.path.join(self._spool_dir, f"{index}.{fmt}"), 'w', encoding='utf-8')
+                for fmt in self.formats
+            }
+            self.counts[category] = 0
+        if 'md' in spools:
+            spools['md'].write(markdown_paper(paper))
+        if 'html' in spools:
+            spools['html'].write(_html_paper(paper))
+        if 'json' in spools:
+            spools['json'].write(("," if self.counts[category] else "") + "\n" + _json_paper(paper))
+        self.counts[category] += 1
+
+    def __enter__(self) -> 'DailyReportWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # 正常结束时由调用方 close；出错时丢弃分片，不留下临时文件
+        if exc_type is not None:
+            self.abort()
+
+    def _close_spools(self):
+        for spools in self._spools.values():
+            for spool in spools.values():
+                spool.close()
+
+    def abort(self):
+        """关闭并删除分片文件，不生成报告"""
+        self._close_spools()
+        shutil.rmtree(self._spool_dir, ignore_errors=True)
+
+    def _copy(self, category: str, fmt: str, out):
+        with open(self._spools[category][fmt].name, 'r', encoding='utf-8') as f:
+            shutil.copyfileobj(f, out)
+
+    def close(self, bursts: Optional[List[Dict]] = None) -> Dict[str, str]:
+        """组装最终报告，返回 {格式: 文件路径}"""
+        bursts = bursts or []
+        self._close_spools()
+        total = sum(self.counts.values())
+        paths = {}
+        try:
+            for fmt in self.formats:
+                path = Path(self.output_dir) / f"daily_report_{self.day}.{fmt}"
+                with open(path, 'w', encoding='utf-8') as out:
+                    getattr(self, f"_write_{fmt}")(out, total, bursts)
+                paths[fmt] = str(path)
+        finally:
+            shutil.rmtree(self._spool_dir, ignore_errors=True)
+        return paths
+
+    def _write_md(self, out, total: int, bursts: List[Dict]):
+        out.write(f"# 机器视觉文献日报 ({self.day})\n\n")
+        out.write("## 总览\n\n")
+        out.write(f"- 今日获取文献总数：{total}篇\n")
+        out.write(f"- 覆盖分类数：{len(self.counts)}个\n\n")
+        out.write(markdown_bursts(bursts))
+        for category, count in self.counts.items():
+            out.write(f"## {category} ({count}篇)\n\n")
+            self._copy(category, 'md', out)
+
+    def _write_html(self, out, total: int, bursts: List[Dict]):
+        e = html.escape
+        out.write(
+            f'<!DOCTYPE html>\n<html lang="zh">\n<head>\n<meta charset="utf-8">\n'
+            f"<title>机器视觉文献日报 ({e(self.day)})</title>\n</head>\n<body>\n"
+            f"<h1>机器视觉文献日报 ({e(self.day)})</h1>\n"
+            f"<h2>总览</h2>\n<ul><li>今日获取文献总数：{total}篇</li>"
+            f"<li>覆盖分类数：{len(self.counts)}个</li></ul>\n"
+        )
+        if bursts:
+            out.write("<h2>突发热词</h2>\n<table>\n<tr><th>词</th><th>今日论文数</th><th>基线</th><th>提升倍数</th></tr>\n")
+            for item in bursts:
+                out.write(
+                    f"<tr><td>{e(item['term'])}</td><td>{item['count']}</td>"
+                    f"<td>{item['baseline']:.1f}</td><td>{item['ratio']:.1f}</td></tr>\n"
+                )
+            out.write("</table>\n")
+        for category, count in self.counts.items():
+            out.write(f"<section>\n<h2>{e(category)} ({count}篇)</h2>\n")
+            self._copy(category, 'html', out)
+            out.write("</section>\n")
+        out.write("</body>\n</html>\n")
+
+    def _write_json(self, out, total: int, bursts: List[Dict]):
+        header = json.dumps({"date": self.day, "total": total, "bursts": bursts}, ensure_ascii=False)
+        # 论文数组由分片拼接，外层结构手工写出
+        out.write(header[:-1] + ', "categories": [')
+        for i, (category, count) in enumerate(self.counts.items()):
+            name = json.dumps(category, ensure_ascii=False)
+            out.write(f'{"," if i else ""}\n{{"name": {name}, "count": {count}, "papers": [')
+            self._copy(category, 'json', out)
+            out.write("\n]}")
+        out.write("\n]}\n")
@@ -0,0 +1,217 @@
+from typing import Dict, List, Optional, Tuple
+from collections import Counter
+import json
+import os
+import re
+import numpy as np
+from scipy import sparse
+
+class DocumentTermStore:
+    """持久化的文档-词矩阵
+
+    以 CSR 三个数组（data/indices/indptr）加行对应的论文ID和内容哈希的形式
+    存成定长二进制文件，读取时用 np.memmap 映射，构造的稀疏矩阵不复制数据。
+    新论文以追加行的方式写入，词表只增不减，已有行的列号保持不变；
+    论文内容变化时追加新行，按论文ID取最后一行。
+    meta.json 最后写入，记录各文件（含词表）的有效长度，未完成的追加会在下次写入前被截断。
+    """
+
+    META = "meta.json"
+    VOCABULARY = "vocabulary.txt"
+    # 文件名 -> dtype
+    ARRAYS = {
+        "data": np.float32,
+        "indices": np.int32,
+        "indptr": np.int32,
+        "paper_ids": np.int64,
+        "hashes": np.dtype("S40")
+    }
+
+    def __init__(self, path: str, token_pattern: str = r"(?u)\b\w\w+\b"):
+        self.path = path
+        self.token_pattern = re.compile(token_pattern)
+        os.makedirs(path, exist_ok=True)
+        self._latest_rows = None
+        self._load()
+
+    def _file(self, name: str) -> str:
+        if name in self.ARRAYS:
+            return os.path.join(self.path, f"{name}.bin")
+        return os.path.join(self.path, name)
+
+    def _load(self):
+        meta_path = self._file(self.META)
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = {"n_rows": 0, "nnz": 0, "n_terms": 0, "vocabulary_bytes": 0}
+
+        self.vocabulary: List[str] = []
+        if os.path.exists(self._file(self.VOCABULARY)):
+            with open(self._file(self.VOCABULARY), "r", encoding="utf-8") as f:
+                self.vocabulary = f.read().split("\n")[:self.meta["n_terms"]]
+        self.term_ids: Dict[str, int] = {term: i for i, term in enumerate(self.vocabulary)}
+
+        self._arrays = {}
+
+    def _array(self, name: str) -> np.ndarray:
+        """只读内存映射某个数组的有效部分"""
+        if name not in self._arrays:
+            length = {
+                "data": self.meta["nnz"],
+                "indices": self.meta["nnz"],
+                "indptr": self.meta["n_rows"] + 1,
+                "paper_ids": self.meta["n_rows"],
+                "hashes": self.meta["n_rows"]
+            }[name]
+            dtype = self.ARRAYS[name]
+            if length == 0 or not os.path.exists(self._file(name)):
+                array = np.zeros(length, dtype=dtype)
+            else:
+                array = np.memmap(self._file(name), dtype=dtype, mode="r", shape=(length,))
+            self._arrays[name] = array
+        return self._arrays[name]
+
+    @property
+    def n_rows(self) -> int:
+        return self.meta["n_rows"]
+
+    def matrix(self) -> sparse.csr_matrix:
+        """全部行的词频矩阵，数据直接来自内存映射文件"""
+        shape = (self.meta["n_rows"], self.meta["n_terms"])
+        if self.meta["n_rows"] == 0:
+            return sparse.csr_matrix(shape, dtype=np.float32)
+        return sparse.csr_matrix(
+            (self._array("data"), self._array("indices"), self._array("indptr")),
+            shape=shape, copy=False
+        )
+
+    def latest_rows(self) -> Dict[int, Tuple[int, str]]:
+        """论文ID -> (最新行号, 内容哈希)
+
+        首次调用时从内存映射数组构建，之后由 append 增量更新。
+        """
+        if self._latest_rows is None:
+            paper_ids = self._array("paper_ids")
+            # 反转后 np.unique 取到的首次出现即每篇论文的最后一行
+            unique_ids, reversed_rows = np.unique(paper_ids[::-1], return_index=True)
+            rows = len(paper_ids) - 1 - reversed_rows
+            hashes = self._array("hashes")[rows]
+            self._latest_rows = {
+                int(paper_id): (int(row), value.decode("ascii"))
+                for paper_id, row, value in zip(unique_ids, rows, hashes)
+            }
+        return self._latest_rows
+
+    def _tokenize(self, document: str) -> Counter:
+        return Counter(self.token_pattern.findall(document.lower()))
+
+    def _truncate(self):
+        """截断上次未完成的追加"""
+        sizes = {
+            "data": self.meta["nnz"],
+            "indices": self.meta["nnz"],
+            "indptr": self.meta["n_rows"] + 1,
+            "paper_ids": self.meta["n_rows"],
+            "hashes": self.meta["n_rows"]
+        }
+        for name, length in sizes.items():
+            path = self._file(name)
+            expected = length * np.dtype(self.ARRAYS[name]).itemsize if self.meta["n_rows"] else 0
+            if os.path.exists(path) and os.path.getsize(path) != expected:
+                with open(path, "r+b") as f:
+                    f.truncate(expected)
+
+        # 词表只截断到记录的长度；旧版 meta 没有记录时整体重写一次
+        vocabulary_path = self._file(self.VOCABULARY)
+        size = self.meta.get("vocabulary_bytes")
+        if size is None:
+            with open(vocabulary_path, "wb") as f:
+                self.meta["vocabulary_bytes"] = f.write("\n".join(self.vocabulary).encode("utf-8"))
+        elif os.path.exists(vocabulary_path) and os.path.getsize(vocabulary_path) != size:
+            with open(vocabulary_path, "r+b") as f:
+                f.truncate(size)
+
+    def append(self, paper_ids: List[int], hashes: List[str], documents: List[str]):
+        """追加若干文档（已预处理的文本）"""
+        if not documents:
+            return
+        self._arrays = {}
+        self._truncate()
+
+        try:
+            indptr = []
+            indices = []
+            data = []
+            nnz = self.meta["nnz"]
+            new_terms = []
+            for document in documents:
+                counts = self._tokenize(document)
+                row = []
+                for term, count in counts.items():
+                    term_id = self.term_ids.get(term)
+                    if term_id is None:
+                        term_id = self.term_ids[term] = len(self.vocabulary)
+                        self.vocabulary.append(term)
+                        new_terms.append(term)
+                    row.append((term_id, count))
+                row.sort()
+                indices.extend(term_id for term_id, _ in row)
+                data.extend(count for _, count in row)
+                nnz += len(row)
+                indptr.append(nnz)
+
+            if nnz >= np.iinfo(np.int32).max:
+                raise OverflowError("Document-term store exceeds int32 index range")
+
+            first_rows = self.meta["n_rows"] == 0
+            with open(self._file("data"), "ab") as f:
+                f.write(np.asarray(data, dtype=self.ARRAYS["data"]).tobytes())
+            with open(self._file("indices"), "ab") as f:
+                f.write(np.asarray(indices, dtype=self.ARRAYS["indices"]).tobytes())
+            with open(self._file("indptr"), "ab") as f:
+                if first_rows:
+                    f.write(np.zeros(1, dtype=self.ARRAYS["indptr"]).tobytes())
+                f.write(np.asarray(indptr, dtype=self.ARRAYS["indptr"]).tobytes())
+            with open(self._file("paper_ids"), "ab") as f:
+                f.write(np.asarray(paper_ids, dtype=self.ARRAYS["paper_ids"]).tobytes())
+            with open(self._file("hashes"), "ab") as f:
+                f.write(np.asarray([h.encode("ascii") for h in hashes], dtype=self.ARRAYS["hashes"]).tobytes())
+            vocabulary_bytes = self.meta["vocabulary_bytes"]
+            if new_terms:
+                with open(self._file(self.VOCABULARY), "ab") as f:
+                    text = ("\n" if self.meta["n_terms"] else "") + "\n".join(new_terms)
+                    vocabulary_bytes += f.write(text.encode("utf-8"))
+
+            first_row = self.meta["n_rows"]
+            self.meta = {
+                "n_rows": first_row + len(documents),
+                "nnz": nnz,
+                "n_terms": len(self.vocabulary),
+                "vocabulary_bytes": vocabulary_bytes
+            }
+            tmp_path = self._file(self.META) + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.meta, f)
+            os.replace(tmp_path, self._file(self.META))
+        except Exception:
+            # 丢弃本次加入内存词表的新词，磁盘上的残留在下次追加前截断
+            self._load()
+            raise
+
+        if self._latest_rows is not None:
+            for offset, (paper_id, content_hash) in enumerate(zip(paper_ids, hashes)):
+                self._latest_rows[int(paper_id)] = (first_row + offset, content_hash)
+
+    def rows(self, paper_ids: List[int], hashes: Optional[List[str]] = None) -> List[Optional[int]]:
+        """论文对应的最新行号；给出 hashes 时内容哈希不一致的论文返回 None"""
+        latest = self.latest_rows()
+        result = []
+        for index, paper_id in enumerate(paper_ids):
+            entry = latest.get(paper_id)
+            if entry is None or (hashes is not None and entry[1] != hashes[index]):
+                result.append(None)
+            else:
+                result.append(entry[0])
+        return result
@@ -0,0 +1,85 @@
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+import os
+import networkx as nx
+import pandas as pd
+from matplotlib.figure import Figure
+from wordcloud import WordCloud
+
+# 图表绘制函数直接使用 Figure 对象和 Agg 画布，不经过 pyplot 的全局状态，
+# 可以在工作进程或线程中并行执行，也不依赖图形界面
+
+def render_wordcloud(frequencies: Dict[str, float], path: str, width: int = 1200, height: int = 800) -> str:
+    """由词频绘制词云"""
+    wordcloud = WordCloud(width=width, height=height, background_color='white')
+    wordcloud.generate_from_frequencies(frequencies)
+
+    figure = Figure(figsize=(15, 10))
+    ax = figure.add_subplot()
+    ax.imshow(wordcloud, interpolation='bilinear')
+    ax.axis('off')
+    figure.savefig(path)
+    return path
+
+def render_year_distribution(year_counts: Dict[int, int], path: str) -> str:
+    """年度发文量柱状图"""
+    figure = Figure(figsize=(15, 6))
+    ax = figure.add_subplot()
+    pd.Series(year_counts, dtype='int64').sort_index().plot(kind='bar', ax=ax)
+    ax.set_title('Publication Year Distribution')
+    ax.set_xlabel('Year')
+    ax.set_ylabel('Number of Papers')
+    figure.savefig(path)
+    return path
+
+def _read_layout(path: str) -> Optional[Dict[str, Tuple[float, float]]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return {node: tuple(xy) for node, xy in json.load(f).items()}
+
+def _write_layout(path: str, layout: Dict[str, Tuple[float, float]]):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({node: [float(x), float(y)] for node, (x, y) in layout.items()}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def graph_layout(edges: List[Tuple[str, str]], cache_dir: str, name: str = "citation",
+                 seed: int = 42) -> Dict[str, Tuple[float, float]]:
+    """带缓存的 spring_layout 布局
+
+    以边集合的哈希为键缓存布局，边不变时直接读取；边变化时以上一次布局中
+    已有节点的位置为初始值重新计算，使相邻两次运行的图形保持稳定。
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    digest = hashlib.sha1(json.dumps(sorted(set(edges)), ensure_ascii=False).encode('utf-8')).hexdigest()
+    path = os.path.join(cache_dir, f"{name}_{digest}.json")
+    latest_path = os.path.join(cache_dir, f"{name}_latest.json")
+
+    layout = _read_layout(path)
+    if layout is not None:
+        return layout
+
+    G = nx.DiGraph()
+    G.add_edges_from(edges)
+    previous = _read_layout(latest_path) or {}
+    # 新节点由 spring_layout 按 seed 随机放置
+    initial = {node: previous[node] for node in G if node in previous}
+    layout = nx.spring_layout(G, pos=initial or None, seed=seed)
+    layout = {node: (float(x), float(y)) for node, (x, y) in layout.items()}
+
+    _write_layout(path, layout)
+    _write_layout(latest_path, layout)
+    return layout
+
+def render_citation_network(edges: List[Tuple[str, str]], layout: Dict[str, Tuple[float, float]], path: str) -> str:
+    """按给定布局绘制引文网络"""
+    G = nx.DiGraph()
+    G.add_edges_from(edges)
+    figure = Figure(figsize=(20, 20))
+    ax = figure.add_subplot()
+    nx.draw(G, layout, ax=ax, with_labels=True, node_color='lightblue',
+            node_size=1000, font_size=8, arrows=True)
+    figure.savefig(path)
+    return path
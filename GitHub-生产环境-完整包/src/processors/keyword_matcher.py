@@ -0,0 +1,90 @@
+from typing import Dict, Iterable, List, Optional
+from collections import deque
+
+class KeywordMatcher:
+    """多关键词匹配器
+
+    keywords 为 {类别: [关键词]}，关键词按小写子串匹配，命中多个类别时返回
+    配置中靠前的类别，与逐个关键词检查、首个命中即返回的结果一致。
+    文本只转换一次小写。关键词较少时按优先级逐个做子串查找（C 实现，
+    比逐字符的纯 Python 自动机快）；关键词数达到 automaton_threshold 时
+    编译成 Aho-Corasick 自动机，每段文本线性扫描一遍，耗时与关键词数无关。
+    """
+
+    def __init__(self, keywords: Dict[str, List[str]], automaton_threshold: int = 256):
+        self.categories = list(keywords)
+        # (小写关键词, 类别序号)，按优先级排列并去重
+        self.keywords = list(dict.fromkeys(
+            (keyword.lower(), priority)
+            for priority, category in enumerate(self.categories)
+            for keyword in keywords[category]
+        ))
+        self.use_automaton = len(self.keywords) >= automaton_threshold
+        if self.use_automaton:
+            self._compile()
+
+    def _compile(self):
+        # 每个状态：转移表、失败指针、以该状态结尾的关键词中最靠前的类别序号
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Optional[int]] = [None]
+        for keyword, priority in self.keywords:
+            self._add(keyword, priority)
+        self._build()
+
+    def _add(self, keyword: str, priority: int):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+                self._goto[state][char] = next_state
+            state = next_state
+        if self._output[state] is None or priority < self._output[state]:
+            self._output[state] = priority
+
+    def _build(self):
+        """广度优先计算失败指针，并把后缀状态的输出合并进来"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail
+                inherited = self._output[fail]
+                if inherited is not None and (self._output[next_state] is None or inherited < self._output[next_state]):
+                    self._output[next_state] = inherited
+                queue.append(next_state)
+
+    def match_priority(self, text: str) -> Optional[int]:
+        """文本（已小写）命中的最靠前类别序号，未命中时返回 None"""
+        if not self.use_automaton:
+            return next((priority for keyword, priority in self.keywords if keyword in text), None)
+        goto, fail, output = self._goto, self._fail, self._output
+        # 空关键词匹配任何文本
+        best = output[0]
+        state = 0
+        for char in text:
+            if best == 0:
+                break
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            priority = output[state]
+            if priority is not None and (best is None or priority < best):
+                best = priority
+        return best
+
+    def match(self, text: str) -> Optional[str]:
+        """文本命中的类别（配置中的键），未命中时返回 None"""
+        priority = self.match_priority(text.lower())
+        return None if priority is None else self.categories[priority]
+
+    def match_many(self, texts: Iterable[str]) -> List[Optional[str]]:
+        return [self.match(text) for text in texts]
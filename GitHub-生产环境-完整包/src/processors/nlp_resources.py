@@ -0,0 +1,45 @@
+from functools import lru_cache
+from typing import FrozenSet
+
+# 各 NLTK 资源在 nltk.data 中的路径
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+}
+
+# 以下资源在每个进程中首次使用时加载一次，之后各处共用同一份
+
+@lru_cache(maxsize=None)
+def ensure_nltk_data(name: str) -> None:
+    """确认 NLTK 数据存在，缺失时下载"""
+    import nltk
+
+    try:
+        nltk.data.find(NLTK_RESOURCES[name])
+    except LookupError:
+        nltk.download(name)
+
+@lru_cache(maxsize=None)
+def stop_words() -> FrozenSet[str]:
+    """英文和中文停用词"""
+    ensure_nltk_data('stopwords')
+    from nltk.corpus import stopwords
+
+    return frozenset(stopwords.words('english') + stopwords.words('chinese'))
+
+@lru_cache(maxsize=None)
+def lemmatizer():
+    """WordNet 词形还原器"""
+    ensure_nltk_data('wordnet')
+    from nltk.stem import WordNetLemmatizer
+
+    return WordNetLemmatizer()
+
+@lru_cache(maxsize=None)
+def word_tokenize():
+    """NLTK 分词函数"""
+    ensure_nltk_data('punkt')
+    from nltk.tokenize import word_tokenize
+
+    return word_tokenize
@@ -1,67 +1,219 @@
-from typing import List, Dict
-from datetime import datetime
+from typing import List, Dict, Iterable, Callable, Optional
+from collections import Counter
+from datetime import datetime, timedelta
+from functools import partial
 import os
 from pathlib import Path
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-import nltk
+from types import SimpleNamespace
+import numpy as np
 from loguru import logger
 from ..crawlers.base_crawler import Paper
+from ..models.database import DatabaseManager
+from . import nlp_resources
+from .keyword_matcher import KeywordMatcher
+from .burst_detector import BurstDetector
+from .daily_report import DailyReportWriter, markdown_bursts, markdown_paper
+
+def _start_of_day(value: datetime) -> datetime:
+    """当天零点"""
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
 
 class PaperProcessor:
     """论文处理器"""
     
-    def __init__(self, config: Dict):
+    # 搜索类别 -> 报告中使用的存储类别
+    CATEGORY_MAP = {
+        "computer_vision": "计算机视觉基础",
+        "industrial_vision": "工业视觉检测",
+        "medical_imaging": "医学图像分析"
+    }
+    
+    def __init__(self, config: Dict, db_manager: DatabaseManager = None):
         self.config = config
+        # 可选的数据库，用于把按日计数下推到 SQL
+        self.db_manager = db_manager
         self.categories = config["classification"]["categories"]
+        # 报告使用的类别体系：映射后的存储类别、“其他”以及配置中列出的类别；
+        # 训练标签和模型预测都限定在这个集合内
+        self.report_categories = frozenset(
+            list(self.CATEGORY_MAP.values()) + ["其他"] + [c for c in self.categories if isinstance(c, str)]
+        )
+        # 分类关键词编译成自动机，每篇论文只扫描一遍
+        self.keyword_matcher = KeywordMatcher(config["search"]["keywords"])
         
-        # 下载必要的NLTK数据
-        try:
-            nltk.data.find('tokenizers/punkt')
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('punkt')
-            nltk.download('stopwords')
-        
-        self.stop_words = set(stopwords.words('english') + stopwords.words('chinese'))
-        self.vectorizer = TfidfVectorizer(stop_words=list(self.stop_words))
-        self.classifier = MultinomialNB()
+        # 训练好的分类模型（TF-IDF + 朴素贝叶斯），首次分类时从 model_path 加载；
+        # 模型不存在或置信度低于阈值时使用关键词规则
+        self.model_path = config["classification"].get("model_path", "models/classifier.joblib")
+        self.confidence_threshold = config["classification"].get("confidence_threshold", 0.6)
+        self.vectorizer = None
+        self.classifier = None
+        self._model_loaded = False
+    
+    @property
+    def stop_words(self) -> frozenset:
+        """停用词（进程内共享，首次使用时加载 NLTK 数据）"""
+        return nlp_resources.stop_words()
+    
+    @staticmethod
+    def _paper_text(paper) -> str:
+        """分类使用的文本：标题、摘要和关键词（字符串或 Keyword 对象）"""
+        keywords = [getattr(k, 'word', k) for k in getattr(paper, 'keywords', None) or []]
+        return f"{paper.title} {paper.abstract} {' '.join(keywords)}"
+    
+    def _classify_by_rules(self, text: str) -> str:
+        # 根据关键词规则进行分类，多个类别命中时取配置中靠前的类别
+        category = self.keyword_matcher.match(text)
+        return self._map_category(category) if category else "其他"
+    
+    def _load_model(self) -> bool:
+        """按需加载分类模型，返回模型是否可用"""
+        if not self._model_loaded:
+            self._model_loaded = True
+            if os.path.exists(self.model_path):
+                try:
+                    import joblib
+                    model = joblib.load(self.model_path)
+                    self.vectorizer, self.classifier = model["vectorizer"], model["classifier"]
+                    logger.info(f"Classifier loaded: {self.model_path}")
+                except Exception as e:
+                    logger.error(f"Error loading classifier: {str(e)}")
+        return self.classifier is not None
     
     def classify_paper(self, paper: Paper) -> str:
         """对论文进行分类"""
-        # 使用标题、摘要和关键词进行分类
-        text = f"{paper.title} {paper.abstract} {' '.join(paper.keywords)}"
+        return self.classify_papers([paper])[0]
+    
+    def classify_papers(self, papers: Iterable[Paper]) -> List[str]:
+        """批量分类
         
-        # 根据关键词规则进行分类
-        for category, keywords in self.config["search"]["keywords"].items():
-            for keyword in keywords:
-                if keyword.lower() in text.lower():
-                    return self._map_category(category)
+        有训练好的模型时整批向量化后用 predict_proba 分类，
+        最高概率低于 confidence_threshold 的论文改用关键词规则。
+        """
+        texts = [self._paper_text(paper) for paper in papers]
+        if not texts or not self._load_model():
+            return [self._classify_by_rules(text) for text in texts]
         
-        return "其他"
+        probabilities = self.classifier.predict_proba(self.vectorizer.transform(texts))
+        best = probabilities.argmax(axis=1)
+        confidence = probabilities[np.arange(len(texts)), best]
+        # 旧模型可能带有报告体系之外的类别，这些预测同样改用规则
+        return [
+            str(self.classifier.classes_[i])
+            if p >= self.confidence_threshold and self.classifier.classes_[i] in self.report_categories
+            else self._classify_by_rules(text)
+            for text, i, p in zip(texts, best, confidence)
+        ]
+    
+    def train_classifier(self, papers: Optional[Iterable[Paper]] = None, chunk_size: int = 1000) -> Dict:
+        """用已分类的论文训练分类模型并保存到 model_path
+        
+        papers 为空时从数据库分块读取。标签为换算后的报告类别，类别为空、为“其他”
+        或属于其他体系（如爬虫写入的 arXiv 主类别）的论文不参与训练。
+        返回训练样本数和各类别的样本数。
+        """
+        texts, labels = [], []
+        for paper in papers if papers is not None else self._categorized_papers(chunk_size):
+            label = self._report_category(paper.category)
+            if label and label != "其他":
+                texts.append(self._paper_text(paper))
+                labels.append(label)
+        import joblib
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.naive_bayes import MultinomialNB
+        
+        label_counts = Counter(labels)
+        if len(label_counts) < 2:
+            raise ValueError(f"Need categorized papers from at least 2 categories, got {dict(label_counts)}")
+        
+        vectorizer = TfidfVectorizer(stop_words=list(self.stop_words), sublinear_tf=True)
+        classifier = MultinomialNB(alpha=0.1)
+        classifier.fit(vectorizer.fit_transform(texts), labels)
+        
+        os.makedirs(os.path.dirname(os.path.abspath(self.model_path)), exist_ok=True)
+        tmp_path = self.model_path + ".tmp"
+        joblib.dump({"vectorizer": vectorizer, "classifier": classifier}, tmp_path)
+        os.replace(tmp_path, self.model_path)
+        self.vectorizer, self.classifier = vectorizer, classifier
+        self._model_loaded = True
+        logger.info(f"Classifier trained on {len(texts)} papers: {self.model_path}")
+        return {"n_papers": len(texts), "category_counts": dict(label_counts.most_common())}
+    
+    def _categorized_papers(self, chunk_size: int):
+        """从数据库分块读取论文（含关键词）"""
+        if self.db_manager is None:
+            raise ValueError("No papers given and no database configured")
+        for chunk in self.db_manager.iter_paper_chunks(chunk_size, columns=('id', 'title', 'abstract', 'category')):
+            keywords = self.db_manager.get_paper_keywords([row.id for row in chunk])
+            for row in chunk:
+                yield SimpleNamespace(**row._asdict(), keywords=keywords[row.id])
+    
+    def _categories(self, papers: List[Paper]) -> List[str]:
+        """论文的报告类别：已有报告类别的直接使用，其余（含 arXiv 主类别）批量分类"""
+        known = [self._report_category(p.category) for p in papers]
+        classified = iter(self.classify_papers([p for p, c in zip(papers, known) if c is None]))
+        return [c or next(classified) for c in known]
+    
+    def _chunk_papers(self, chunk: List, authors: bool = False) -> List:
+        """把数据库或快照分块中的行补全为可分类的论文对象
+
+        行中没有 category 的视为未分类；没有 keywords 的在配置了数据库时按ID批量读取，
+        authors 为 True 时同样批量补全作者。已是完整论文对象的分块原样返回。
+        """
+        if all(hasattr(p, 'category') and hasattr(p, 'keywords') for p in chunk) and (
+                not authors or all(hasattr(p, 'authors') for p in chunk)):
+            return chunk
+        rows = [row._asdict() if hasattr(row, '_asdict') else dict(vars(row)) for row in chunk]
+        paper_ids = [row['id'] for row in rows if row.get('id') is not None]
+        lookups = {'keywords': self.db_manager.get_paper_keywords} if self.db_manager is not None else {}
+        if authors and self.db_manager is not None:
+            lookups['authors'] = self.db_manager.get_paper_authors
+        for name, lookup in lookups.items():
+            if any(name not in row for row in rows):
+                values = lookup(paper_ids)
+                for row in rows:
+                    row.setdefault(name, values.get(row.get('id'), []))
+        for row in rows:
+            row.setdefault('category', None)
+            row.setdefault('keywords', [])
+            if authors:
+                row.setdefault('authors', [])
+        return [SimpleNamespace(**row) for row in rows]
     
     def _map_category(self, category: str) -> str:
         """将搜索类别映射到存储类别"""
-        category_map = {
-            "computer_vision": "计算机视觉基础",
-            "industrial_vision": "工业视觉检测",
-            "medical_imaging": "医学图像分析"
-        }
-        return category_map.get(category, "其他")
-    
-    def generate_daily_report(self, papers: List[Paper], output_dir: str) -> str:
-        """生成每日文献报告"""
+        return self.CATEGORY_MAP.get(category, "其他")
+    
+    def _report_category(self, category: Optional[str]) -> Optional[str]:
+        """论文已有的类别换算为报告类别
+
+        报告类别和搜索类别照原样或映射后使用；其他体系的类别（如 arXiv 的 cs.CV）返回 None。
+        """
+        if category in self.report_categories:
+            return category
+        if category in self.CATEGORY_MAP:
+            return self.CATEGORY_MAP[category]
+        return None
+    
+    def daily_bursts(self, day=None, k: int = 20) -> List[Dict]:
+        """爬取流程保存的突发词检测结果，没有检测器状态时返回空列表"""
+        path = self.config.get("burst", {}).get("state_path", "cache/bursts.npz")
+        if not os.path.exists(path):
+            return []
+        return BurstDetector.load(path).bursts(day or datetime.now(), k)
+    
+    def generate_daily_report(self, papers: List[Paper], output_dir: str,
+                              bursts: Optional[List[Dict]] = None) -> str:
+        """生成每日文献报告
+        
+        bursts 为突发词列表（BurstDetector.bursts 的结果），为空时读取爬取流程保存的当天结果。
+        """
         try:
             # 创建输出目录
             os.makedirs(output_dir, exist_ok=True)
             
             # 按类别整理论文
             papers_by_category = {}
-            for paper in papers:
-                category = paper.category or self.classify_paper(paper)
+            for paper, category in zip(papers, self._categories(papers)):
                 if category not in papers_by_category:
                     papers_by_category[category] = []
                 papers_by_category[category].append(paper)
@@ -79,21 +231,15 @@ class PaperProcessor:
                 f.write(f"- 今日获取文献总数：{total_papers}篇\n")
                 f.write(f"- 覆盖分类数：{len(papers_by_category)}个\n\n")
                 
+                # 突发词
+                f.write(markdown_bursts(self.daily_bursts() if bursts is None else bursts))
+                
                 # 按类别详细列表
                 for category, category_papers in papers_by_category.items():
                     f.write(f"## {category} ({len(category_papers)}篇)\n\n")
                     
                     for paper in category_papers:
-                        f.write(f"### {paper.title}\n\n")
-                        f.write(f"- 作者：{', '.join(paper.authors)}\n")
-                        f.write(f"- 发布日期：{paper.published_date.strftime('%Y-%m-%d')}\n")
-                        f.write(f"- 来源：{paper.source}\n")
-                        if paper.doi:
-                            f.write(f"- DOI：{paper.doi}\n")
-                        f.write(f"- 链接：{paper.url}\n")
-                        f.write("\n**摘要：**\n\n")
-                        f.write(f"{paper.abstract}\n\n")
-                        f.write("---\n\n")
+                        f.write(markdown_paper(paper))
             
             logger.info(f"Daily report generated: {report_path}")
             return str(report_path)
@@ -102,27 +248,66 @@ class PaperProcessor:
             logger.error(f"Error generating daily report: {str(e)}")
             return ""
     
-    def analyze_trends(self, papers: List[Paper]) -> Dict:
-        """分析研究趋势"""
+    def generate_daily_report_from_db(self, output_dir: str, day: Optional[datetime] = None,
+                                      formats: Iterable[str] = ('md',), chunk_size: int = 500,
+                                      bursts: Optional[List[Dict]] = None) -> Dict[str, str]:
+        """由数据库直接生成某天（默认今天）发布论文的日报
+        
+        按发布日期范围分块查询论文，每块批量读取作者和关键词、批量分类后
+        立即写入各格式的分片文件，内存占用与当天论文数无关。
+        formats 可包含 'md'、'html'、'json'，一次遍历同时生成。返回 {格式: 文件路径}。
+        """
+        if self.db_manager is None:
+            raise ValueError("generate_daily_report_from_db requires a database")
+        start = _start_of_day(day or datetime.now())
+        label = start.strftime("%Y-%m-%d")
+        columns = ('id', 'title', 'abstract', 'url', 'published_date', 'source', 'category', 'doi')
+        with DailyReportWriter(output_dir, label, formats) as writer:
+            for chunk in self.db_manager.iter_paper_chunks(chunk_size, columns, start, start + timedelta(days=1)):
+                papers = self._chunk_papers(chunk, authors=True)
+                for paper, category in zip(papers, self._categories(papers)):
+                    writer.add(paper, category)
+            paths = writer.close(self.daily_bursts(start) if bursts is None else bursts)
+        logger.info(f"Daily report generated: {', '.join(paths.values())}")
+        return paths
+    
+    def analyze_trends(self, papers: List[Paper], pushdown: bool = False) -> Dict:
+        """分析研究趋势
+        
+        pushdown 为 True 且配置了数据库时，按日发文量由数据库对这批论文覆盖的
+        日期范围 GROUP BY 得到，关键词由按日词频表计算，不再读取论文文本
+        （均统计库中该范围内的全部论文）。
+        """
+        import pandas as pd
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
         try:
-            # 提取所有文本
-            texts = [f"{p.title} {p.abstract}" for p in papers]
-            
-            # 计算TF-IDF
-            tfidf_matrix = self.vectorizer.fit_transform(texts)
-            
-            # 获取最重要的关键词
-            feature_names = self.vectorizer.get_feature_names_out()
-            tfidf_sums = tfidf_matrix.sum(axis=0).A1
-            top_indices = tfidf_sums.argsort()[-10:][::-1]
-            top_keywords = [feature_names[i] for i in top_indices]
-            
-            # 按时间统计论文数量
-            dates = pd.Series([p.published_date for p in papers])
-            daily_counts = dates.value_counts().sort_index()
+            if pushdown and self.db_manager is not None:
+                dates = [p.published_date for p in papers if p.published_date]
+                start, end = _start_of_day(min(dates)), _start_of_day(max(dates)) + timedelta(days=1)
+                top_keywords = [term for term, _ in self.db_manager.top_terms(start, end, 10, exclude=self.stop_words)]
+                counts = self.db_manager.count_papers_by('day', start, end)
+                daily_counts = pd.Series(list(counts.values()), index=pd.to_datetime(list(counts)), dtype='int64')
+            else:
+                # 提取所有文本
+                texts = [f"{p.title} {p.abstract}" for p in papers]
+                
+                # 计算TF-IDF（使用局部的向量化器，不影响分类模型）
+                vectorizer = TfidfVectorizer(stop_words=list(self.stop_words))
+                tfidf_matrix = vectorizer.fit_transform(texts)
+                
+                # 获取最重要的关键词
+                feature_names = vectorizer.get_feature_names_out()
+                tfidf_sums = tfidf_matrix.sum(axis=0).A1
+                top_indices = tfidf_sums.argsort()[-10:][::-1]
+                top_keywords = [feature_names[i] for i in top_indices]
+                
+                # 按时间统计论文数量
+                dates = pd.Series([p.published_date for p in papers])
+                daily_counts = dates.value_counts().sort_index()
             
             # 按类别统计
-            categories = [p.category or self.classify_paper(p) for p in papers]
+            categories = self._categories(papers)
             category_counts = pd.Series(categories).value_counts()
             
             return {
@@ -133,4 +318,46 @@ class PaperProcessor:
             
         except Exception as e:
             logger.error(f"Error analyzing trends: {str(e)}")
-            return {} 
\ No newline at end of file
+            return {}
+    
+    def analyze_trends_streaming(self, chunks: Optional[Callable[[], Iterable[List[Paper]]]] = None,
+                                 n_features: int = 2 ** 18, chunk_size: int = 1000) -> Dict:
+        """流式分析研究趋势
+        
+        chunks 返回论文分块的迭代器（默认分块读取数据库，也可用快照的 iter_chunks），
+        会被遍历两次：第一遍用特征哈希累计文档频率，第二遍累计 TF-IDF 列和、
+        日发文量和类别数。分块中缺少类别或关键词的论文按需补全后分类。
+        内存占用与论文总数无关。
+        """
+        from .streaming import StreamingTfidf
+        
+        if chunks is None:
+            columns = ('id', 'title', 'abstract', 'published_date', 'category')
+            chunks = partial(self.db_manager.iter_paper_chunks, chunk_size, columns)
+        
+        try:
+            tfidf = StreamingTfidf(n_features=n_features, stop_words=list(self.stop_words))
+            for chunk in chunks():
+                if chunk:
+                    tfidf.partial_fit([f"{p.title} {p.abstract}" for p in chunk])
+            
+            totals = np.zeros(n_features)
+            daily_counts = Counter()
+            category_counts = Counter()
+            for chunk in chunks():
+                if not chunk:
+                    continue
+                matrix = tfidf.transform([f"{p.title} {p.abstract}" for p in chunk])
+                totals += np.asarray(matrix.sum(axis=0)).ravel()
+                daily_counts.update(p.published_date for p in chunk)
+                category_counts.update(self._categories(self._chunk_papers(chunk)))
+            
+            return {
+                "top_keywords": tfidf.top_terms(totals, 10),
+                "daily_counts": dict(sorted(daily_counts.items())),
+                "category_counts": dict(category_counts.most_common())
+            }
+            
+        except Exception as e:
+            logger.error(f"Error analyzing trends: {str(e)}")
+            return {}
\ No newline at end of file
@@ -0,0 +1,174 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+import time
+
+@dataclass
+class AuthorRecord:
+    name: str
+
+@dataclass
+class ReferenceRecord:
+    reference_title: Optional[str]
+    reference_doi: Optional[str] = None
+    resolved_paper_id: Optional[int] = None
+
+@dataclass
+class PaperRecord:
+    """论文的可序列化副本，属性名与 ORM 模型一致，可直接交给各项分析"""
+    id: Optional[int]
+    title: str
+    abstract: Optional[str]
+    published_date: Optional[datetime]
+    authors: List[AuthorRecord] = field(default_factory=list)
+    references: List[ReferenceRecord] = field(default_factory=list)
+    keywords: List[str] = field(default_factory=list)
+    category: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_paper(cls, paper) -> 'PaperRecord':
+        return cls(
+            id=getattr(paper, 'id', None),
+            title=paper.title,
+            abstract=paper.abstract,
+            published_date=paper.published_date,
+            authors=[AuthorRecord(getattr(a, 'name', a)) for a in paper.authors],
+            references=[
+                ReferenceRecord(r.reference_title, r.reference_doi, getattr(r, 'resolved_paper_id', None))
+                for r in getattr(paper, 'references', [])
+            ],
+            keywords=[getattr(k, 'word', k) for k in getattr(paper, 'keywords', [])],
+            category=getattr(paper, 'category', None),
+            updated_at=getattr(paper, 'updated_at', None)
+        )
+
+def to_records(papers) -> List[PaperRecord]:
+    """把 ORM 论文一次性读成可跨进程传递的记录"""
+    return [p if isinstance(p, PaperRecord) else PaperRecord.from_paper(p) for p in papers]
+
+# 工作进程内的分析器，首次使用时创建
+_analyzer = None
+
+def _call_analyzer(method: str, *args, **kwargs):
+    global _analyzer
+    if _analyzer is None:
+        from .analysis import PaperAnalyzer
+        # 结果缓存由主进程中的阶段图统一读写；阶段已在进程池中并行，预处理不再另开进程池
+        _analyzer = PaperAnalyzer(None, result_cache_bytes=0, preprocess_workers=1)
+    return getattr(_analyzer, method)(*args, **kwargs)
+
+def analyzer_stage(method: str) -> Callable:
+    """在工作进程中调用 PaperAnalyzer 方法的阶段函数（不需要数据库的分析）"""
+    return partial(_call_analyzer, method)
+
+def _timed(func: Callable, args: tuple, kwargs: dict) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+@dataclass(frozen=True)
+class Output:
+    """阶段参数中的占位符，运行时替换为依赖阶段的结果"""
+    stage: str
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable
+    args: tuple
+    kwargs: dict
+    deps: Tuple[str, ...]
+    local: bool
+    cache_key: Optional[str] = None
+
+class ReportDAG:
+    """报告分析阶段图
+
+    每个阶段声明依赖的阶段，参数中的 Output(name) 在运行时替换为对应结果。
+    依赖满足的阶段立即提交：普通阶段在进程池中并行执行，
+    local 阶段（需要数据库连接、绑定方法或绘图）在主进程的单个后台线程中依次执行。
+    每个阶段在一次运行中只计算一次，结果和耗时保存在 results/timings 中。
+    给出 cache（ResultCache）时，带 cache_key 的阶段先查缓存，命中则不再执行。
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, cache=None):
+        self.max_workers = max_workers
+        self.cache = cache
+        self.stages: Dict[str, Stage] = {}
+        self.cached: List[str] = []
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, Tuple[float, str]] = {}
+        self.elapsed = 0.0
+
+    def add_stage(self, name: str, func: Callable, *args, deps: Tuple[str, ...] = (),
+                  local: bool = False, cache_key: Optional[str] = None, **kwargs) -> 'ReportDAG':
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        implicit = tuple(a.stage for a in list(args) + list(kwargs.values()) if isinstance(a, Output))
+        self.stages[name] = Stage(
+            name, func, args, kwargs, tuple(dict.fromkeys(deps + implicit)), local, cache_key
+        )
+        return self
+
+    def _resolve(self, value):
+        return self.results[value.stage] if isinstance(value, Output) else value
+
+    def run(self) -> Dict[str, Any]:
+        """执行全部阶段，返回 {阶段名: 结果}"""
+        for stage in self.stages.values():
+            missing = [d for d in stage.deps if d not in self.stages]
+            if missing:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages: {missing}")
+
+        start = time.perf_counter()
+        pending = dict(self.stages)
+        running = {}
+        pool = ProcessPoolExecutor(max_workers=self.max_workers) if self.max_workers != 1 else None
+        local = ThreadPoolExecutor(max_workers=1)
+        try:
+            while pending or running:
+                ready = [s for s in pending.values() if all(d in self.results for d in s.deps)]
+                hits = [s for s in ready if self._load_cached(s)]
+                for stage in hits:
+                    del pending[stage.name]
+                if hits:
+                    # 命中缓存的结果可能使更多阶段就绪
+                    continue
+                # 先提交进程池阶段，使工作进程在后台线程开始工作之前创建
+                for stage in sorted(ready, key=lambda s: s.local):
+                    del pending[stage.name]
+                    executor = local if stage.local or pool is None else pool
+                    args = tuple(self._resolve(a) for a in stage.args)
+                    kwargs = {k: self._resolve(v) for k, v in stage.kwargs.items()}
+                    future = executor.submit(_timed, stage.func, args, kwargs)
+                    running[future] = (stage.name, "主进程" if executor is local else "进程池")
+                if not running:
+                    raise ValueError(f"Stages form a cycle: {sorted(pending)}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, where = running.pop(future)
+                    self.results[name], elapsed = future.result()
+                    self.timings[name] = (elapsed, where)
+                    if self.cache is not None and self.stages[name].cache_key:
+                        self.cache.put(self.stages[name].cache_key, self.results[name])
+        finally:
+            local.shutdown(cancel_futures=True)
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        self.elapsed = time.perf_counter() - start
+        return self.results
+
+    def _load_cached(self, stage: Stage) -> bool:
+        if self.cache is None or not stage.cache_key:
+            return False
+        start = time.perf_counter()
+        hit, value = self.cache.get(stage.cache_key)
+        if hit:
+            self.results[stage.name] = value
+            self.timings[stage.name] = (time.perf_counter() - start, "缓存")
+            self.cached.append(stage.name)
+        return hit
@@ -0,0 +1,167 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+from datetime import date, datetime
+import hashlib
+import json
+import os
+import sys
+import threading
+from loguru import logger
+
+# JSON 不能直接表示的类型用单键字典标记
+_TAGS = ("__tuple__", "__dict__", "__datetime__", "__date__", "__timestamp__", "__period__")
+
+def _encode(value: Any) -> Any:
+    """把分析结果转换为可写入 JSON 的结构，不支持的类型抛出 TypeError"""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value) if isinstance(value, float) else int(value)
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode(item) for item in value]}
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value) and not (len(value) == 1 and next(iter(value)) in _TAGS):
+            return {key: _encode(item) for key, item in value.items()}
+        return {"__dict__": [[_encode(key), _encode(item)] for key, item in value.items()]}
+
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(value, pd.Timestamp):
+        return {"__timestamp__": value.isoformat()}
+    if pd is not None and isinstance(value, pd.Period):
+        return {"__period__": [str(value), value.freqstr]}
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(value, np.generic):
+        return _encode(value.item())
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if len(value) == 1:
+        tag, payload = next(iter(value.items()))
+        if tag == "__tuple__":
+            return tuple(_decode(item) for item in payload)
+        if tag == "__dict__":
+            return {_decode(key): _decode(item) for key, item in payload}
+        if tag == "__datetime__":
+            return datetime.fromisoformat(payload)
+        if tag == "__date__":
+            return date.fromisoformat(payload)
+        if tag == "__timestamp__":
+            import pandas as pd
+            return pd.Timestamp(payload)
+        if tag == "__period__":
+            import pandas as pd
+            return pd.Period(payload[0], freq=payload[1])
+    return {key: _decode(item) for key, item in value.items()}
+
+class ResultCache:
+    """分析结果的磁盘缓存
+
+    键由分析名称、输入论文集合的指纹（论文ID和 updated_at）和分析参数决定，
+    论文增删或更新、参数变化都会得到新的键。每个结果存成一个 JSON 文件（元组、
+    非字符串键、日期和 pandas 时间类型带类型标记），读取缓存不会执行任何代码；
+    含其他类型的结果不缓存。读取时刷新文件修改时间，总大小超过 max_bytes 时
+    按最久未使用的顺序删除。
+    """
+
+    # 结果格式变化时递增，使旧缓存失效
+    VERSION = 2
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(papers) -> Optional[str]:
+        """论文集合的指纹，与顺序无关；存在未入库（没有ID）的论文时返回 None"""
+        entries = []
+        for paper in papers:
+            paper_id = getattr(paper, 'id', None)
+            if paper_id is None:
+                return None
+            updated_at = getattr(paper, 'updated_at', None)
+            entries.append((paper_id, updated_at.isoformat() if updated_at else ''))
+        entries.sort()
+        digest = hashlib.sha1()
+        for paper_id, updated_at in entries:
+            digest.update(f"{paper_id}:{updated_at}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def key(self, name: str, fingerprint: str, params: Dict) -> str:
+        payload = json.dumps([self.VERSION, name, fingerprint, params], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """返回 (是否命中, 结果)"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = _decode(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            return False, None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return True, value
+
+    def put(self, key: str, value: Any):
+        try:
+            payload = json.dumps(_encode(value), ensure_ascii=False)
+        except TypeError as e:
+            logger.warning(f"Result not cached: {str(e)}")
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        """删除最久未使用的结果，直到总大小不超过 max_bytes"""
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith('.pkl'):
+                    # 旧版的 pickle 缓存不再读取，直接删除
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+                elif entry.name.endswith('.json'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+
+    def get_or_compute(self, key: Optional[str], compute: Callable[[], Any]) -> Tuple[Any, bool]:
+        """命中时直接返回缓存结果，否则计算并写入；返回 (结果, 是否命中)"""
+        if key is None:
+            return compute(), False
+        hit, value = self.get(key)
+        if hit:
+            return value, True
+        value = compute()
+        self.put(key, value)
+        return value, False
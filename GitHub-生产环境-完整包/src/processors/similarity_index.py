@@ -0,0 +1,181 @@
+from typing import List, Optional, Tuple
+from collections import Counter
+import os
+import joblib
+import numpy as np
+from scipy import sparse
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+from .dtm_store import DocumentTermStore
+
+def _with_columns(matrix: sparse.csr_matrix, n_columns: int) -> sparse.csr_matrix:
+    """调整稀疏矩阵的列数：补出的列为空，多出的列丢弃"""
+    if matrix.shape[1] > n_columns:
+        return matrix[:, :n_columns]
+    return sparse.csr_matrix((matrix.data, matrix.indices, matrix.indptr), shape=(matrix.shape[0], n_columns))
+
+class SimilarityIndex:
+    """基于文档-词矩阵的相似论文索引
+
+    从 DocumentTermStore 中每篇论文的最新行计算 L2 归一化的 TF-IDF 向量，
+    n_components 给出时再用 LSA（TruncatedSVD）降维。查询时把索引向量分块与
+    查询向量相乘，逐块保留前 k 个，内存只与块大小有关。
+    文档-词矩阵追加新行后 update 只为新行计算向量（沿用已有的 IDF 和 SVD），
+    新增行数超过 rebuild_ratio 时整体重建。
+    """
+
+    def __init__(self, path: str, n_components: Optional[int] = None, rebuild_ratio: float = 0.2,
+                 block_size: int = 20000):
+        self.path = path
+        self.n_components = n_components
+        self.rebuild_ratio = rebuild_ratio
+        self.block_size = block_size
+        self.paper_ids = np.zeros(0, dtype=np.int64)
+        self.vectors = None
+        self.idf = np.zeros(0)
+        self.svd = None
+        self.store_rows = 0
+        self.base_size = 0
+        self.positions = {}
+
+    @classmethod
+    def load(cls, path: str, n_components: Optional[int] = None, **options) -> 'SimilarityIndex':
+        """从磁盘加载索引，不存在或降维参数不一致时返回空索引"""
+        if os.path.exists(path):
+            index = joblib.load(path)
+            if index.n_components == n_components:
+                index.path = path
+                return index
+        return cls(path, n_components, **options)
+
+    def save(self):
+        """原子写入磁盘"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        joblib.dump(self, tmp_path)
+        os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def _idf(self, n_terms: int) -> np.ndarray:
+        """补齐建索引之后新出现的词（按文档频率为 0 计算）"""
+        if len(self.idf) >= n_terms:
+            return self.idf[:n_terms]
+        unseen = np.log(1 + self.base_size) + 1
+        return np.concatenate([self.idf, np.full(n_terms - len(self.idf), unseen)])
+
+    def _vectorize(self, counts: sparse.csr_matrix):
+        tfidf = normalize(counts.astype(np.float64) @ sparse.diags(self._idf(counts.shape[1])), norm='l2')
+        if self.svd is None:
+            return tfidf.tocsr()
+        n_features = self.svd.components_.shape[1]
+        if tfidf.shape[1] > n_features:
+            tfidf = tfidf[:, :n_features]
+        return normalize(self.svd.transform(tfidf))
+
+    def rebuild(self, store: DocumentTermStore):
+        """用每篇论文的最新行重新计算 IDF 和全部向量"""
+        latest = store.latest_rows()
+        paper_ids = np.fromiter(latest.keys(), dtype=np.int64, count=len(latest))
+        rows = np.fromiter((row for row, _ in latest.values()), dtype=np.int64, count=len(latest))
+        counts = store.matrix()[rows]
+
+        n_documents = counts.shape[0]
+        document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+        self.idf = np.log((1 + n_documents) / (1 + document_frequency)) + 1
+        self.base_size = n_documents
+        self.svd = None
+        if self.n_components and n_documents > self.n_components and counts.shape[1] > self.n_components:
+            tfidf = normalize(counts.astype(np.float64) @ sparse.diags(self.idf), norm='l2')
+            self.svd = TruncatedSVD(n_components=self.n_components, random_state=42).fit(tfidf)
+
+        self.paper_ids = paper_ids
+        self.vectors = self._vectorize(counts)
+        self.positions = {int(paper_id): i for i, paper_id in enumerate(paper_ids)}
+        self.store_rows = store.n_rows
+
+    def update(self, store: DocumentTermStore) -> int:
+        """把文档-词矩阵中新增的行加入索引，返回加入的论文数"""
+        if self.vectors is None or store.n_rows < self.store_rows:
+            self.rebuild(store)
+            return len(self)
+        if store.n_rows == self.store_rows:
+            return 0
+        if store.n_rows - self.store_rows > self.rebuild_ratio * max(self.base_size, 1):
+            self.rebuild(store)
+            return len(self)
+
+        latest = store.latest_rows()
+        new_rows = []
+        new_ids = []
+        for paper_id, (row, _) in latest.items():
+            if row >= self.store_rows:
+                new_rows.append(row)
+                new_ids.append(paper_id)
+        self.store_rows = store.n_rows
+        if not new_ids:
+            return 0
+        counts = store.matrix()[new_rows]
+        vectors = self._vectorize(counts)
+
+        # 内容变化的论文原位置作废，新向量追加在末尾
+        for paper_id in new_ids:
+            old = self.positions.pop(paper_id, None)
+            if old is not None:
+                self.paper_ids[old] = -1
+        start = len(self.paper_ids)
+        self.paper_ids = np.concatenate([self.paper_ids, np.asarray(new_ids, dtype=np.int64)])
+        if sparse.issparse(self.vectors):
+            n_columns = max(self.vectors.shape[1], vectors.shape[1])
+            self.vectors = sparse.vstack([
+                _with_columns(self.vectors, n_columns), _with_columns(vectors, n_columns)
+            ]).tocsr()
+        else:
+            self.vectors = np.vstack([self.vectors, vectors])
+        for offset, paper_id in enumerate(new_ids):
+            self.positions[paper_id] = start + offset
+        return len(new_ids)
+
+    def vectorize_text(self, store: DocumentTermStore, document: str):
+        """把预处理后的文本映射为与索引一致的查询向量，词表外的词被忽略"""
+        tokens = store.token_pattern.findall(document.lower())
+        counts = Counter(store.term_ids[token] for token in tokens if token in store.term_ids)
+        n_terms = len(store.vocabulary)
+        matrix = sparse.csr_matrix(
+            (list(counts.values()), ([0] * len(counts), list(counts.keys()))), shape=(1, n_terms)
+        )
+        return self._vectorize(matrix)
+
+    def vector(self, paper_id: int):
+        position = self.positions.get(paper_id)
+        if position is None:
+            return None
+        return self.vectors[position:position + 1]
+
+    def top_k(self, query, k: int = 10, exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """余弦相似度最高的 k 篇论文 [(论文ID, 相似度)]"""
+        if self.vectors is None or not len(self):
+            return []
+        n = self.vectors.shape[0]
+        if sparse.issparse(query):
+            query = _with_columns(query.tocsr(), self.vectors.shape[1])
+
+        candidates_ids = []
+        candidates_scores = []
+        for start in range(0, n, self.block_size):
+            block = self.vectors[start:start + self.block_size]
+            scores = block @ query.T
+            scores = np.asarray(scores.toarray() if sparse.issparse(scores) else scores).ravel()
+            ids = self.paper_ids[start:start + self.block_size]
+            scores = np.where((ids >= 0) & (ids != (exclude if exclude is not None else -1)), scores, -np.inf)
+            if len(scores) > k:
+                keep = np.argpartition(-scores, k)[:k]
+                scores, ids = scores[keep], ids[keep]
+            candidates_ids.append(ids)
+            candidates_scores.append(scores)
+
+        ids = np.concatenate(candidates_ids)
+        scores = np.concatenate(candidates_scores)
+        order = np.argsort(-scores, kind='stable')[:k]
+        return [(int(ids[i]), float(scores[i])) for i in order if np.isfinite(scores[i]) and scores[i] > 0]
@@ -0,0 +1,318 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+from types import SimpleNamespace
+from datetime import datetime
+import json
+import os
+import shutil
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import select
+from loguru import logger
+from ..models.database import DatabaseManager, Paper, Author, Keyword, Reference, paper_authors, paper_keywords, AUTHOR_ORDER
+
+# 各表的列式结构，_part 为写入该行的导出批次号，用于增量追加后的去重
+SCHEMAS = {
+    "papers": pa.schema([
+        ("id", pa.int64()),
+        ("title", pa.string()),
+        ("abstract", pa.string()),
+        ("url", pa.string()),
+        ("pdf_url", pa.string()),
+        ("published_date", pa.timestamp("us")),
+        ("source", pa.string()),
+        ("category", pa.string()),
+        ("doi", pa.string()),
+        ("citations", pa.int64()),
+        ("language", pa.string()),
+        ("local_path", pa.string()),
+        ("created_at", pa.timestamp("us")),
+        ("updated_at", pa.timestamp("us")),
+        ("_part", pa.int32())
+    ]),
+    "authors": pa.schema([
+        ("paper_id", pa.int64()),
+        ("author_id", pa.int64()),
+        ("name", pa.string()),
+        ("_part", pa.int32())
+    ]),
+    "keywords": pa.schema([
+        ("paper_id", pa.int64()),
+        ("keyword_id", pa.int64()),
+        ("word", pa.string()),
+        ("_part", pa.int32())
+    ]),
+    "references": pa.schema([
+        ("paper_id", pa.int64()),
+        ("reference_title", pa.string()),
+        ("reference_doi", pa.string()),
+        ("resolved_paper_id", pa.int64()),
+        ("_part", pa.int32())
+    ])
+}
+
+class CorpusSnapshot:
+    """论文库列式快照
+
+    将论文、作者、关键词和参考文献导出为 Parquet 或 Arrow IPC 文件，
+    每次导出追加一个分片（part），增量导出只包含 updated_at 晚于上次水位线的论文。
+    读取时以内存映射方式打开，只解码所需的列，并按论文保留最新分片中的行。
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, path: str, format: str = "parquet"):
+        if format not in ("parquet", "arrow"):
+            raise ValueError(f"Unsupported snapshot format: {format}")
+        self.path = path
+        self.format = format
+        self.manifest = self._read_manifest()
+
+    @property
+    def extension(self) -> str:
+        return "parquet" if self.format == "parquet" else "arrow"
+
+    def _read_manifest(self) -> Dict:
+        manifest_path = os.path.join(self.path, self.MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            self.format = manifest.get("format", self.format)
+            return manifest
+        return {"format": self.format, "watermark": None, "parts": []}
+
+    def _write_manifest(self):
+        manifest_path = os.path.join(self.path, self.MANIFEST)
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+    def _part_path(self, table: str, part: int) -> str:
+        return os.path.join(self.path, table, f"part-{part:05d}.{self.extension}")
+
+    def _open_writer(self, table: str, part: int):
+        path = self._part_path(table, part)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if self.format == "parquet":
+            return pq.ParquetWriter(path, SCHEMAS[table])
+        return pa.ipc.new_file(path, SCHEMAS[table])
+
+    @staticmethod
+    def _batch(table: str, rows: Dict[str, list]) -> pa.RecordBatch:
+        return pa.RecordBatch.from_pydict(rows, schema=SCHEMAS[table])
+
+    def export(self, db_manager: DatabaseManager, incremental: bool = True, chunk_size: int = 5000) -> int:
+        """导出论文库，返回本次写入的论文数
+
+        incremental 为 False 时清空已有快照并全量导出。
+        """
+        if not incremental and os.path.exists(self.path):
+            shutil.rmtree(self.path)
+            self.manifest = {"format": self.format, "watermark": None, "parts": []}
+        os.makedirs(self.path, exist_ok=True)
+
+        watermark = self.manifest.get("watermark")
+        if watermark:
+            watermark = datetime.fromisoformat(watermark)
+        part = max(self.manifest["parts"], default=-1) + 1
+
+        papers = Paper.__table__
+        query = select(papers).order_by(papers.c.id)
+        if watermark:
+            query = query.where(papers.c.updated_at > watermark)
+
+        writers = {}
+        exported = 0
+        new_watermark = watermark
+        try:
+            with db_manager.engine.connect() as conn:
+                result = conn.execution_options(stream_results=True).execute(query)
+                for rows in result.partitions(chunk_size):
+                    if not writers:
+                        writers = {table: self._open_writer(table, part) for table in SCHEMAS}
+                    paper_ids = [row.id for row in rows]
+
+                    columns = {name: [getattr(row, name) for row in rows] for name in SCHEMAS["papers"].names[:-1]}
+                    columns["_part"] = [part] * len(rows)
+                    writers["papers"].write_batch(self._batch("papers", columns))
+
+                    for table, rows_by_column in self._child_rows(conn, paper_ids, part).items():
+                        writers[table].write_batch(self._batch(table, rows_by_column))
+
+                    exported += len(rows)
+                    chunk_max = max((row.updated_at for row in rows if row.updated_at), default=None)
+                    if chunk_max and (new_watermark is None or chunk_max > new_watermark):
+                        new_watermark = chunk_max
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        if exported:
+            self.manifest["parts"].append(part)
+            self.manifest["watermark"] = new_watermark.isoformat() if new_watermark else None
+            self._write_manifest()
+        logger.info(f"Snapshot export wrote {exported} papers to part {part}" if exported else "Snapshot is up to date")
+        return exported
+
+    @staticmethod
+    def _child_rows(conn, paper_ids: List[int], part: int) -> Dict[str, Dict[str, list]]:
+        """查询一批论文的作者、关键词和参考文献"""
+        authors = conn.execute(
+            select(paper_authors.c.paper_id, Author.id, Author.name)
+            .join(Author, Author.id == paper_authors.c.author_id)
+            .where(paper_authors.c.paper_id.in_(paper_ids))
+            .order_by(paper_authors.c.paper_id, *AUTHOR_ORDER)
+        ).all()
+        keywords = conn.execute(
+            select(paper_keywords.c.paper_id, Keyword.id, Keyword.word)
+            .join(Keyword, Keyword.id == paper_keywords.c.keyword_id)
+            .where(paper_keywords.c.paper_id.in_(paper_ids))
+        ).all()
+        references = conn.execute(
+            select(Reference.paper_id, Reference.reference_title, Reference.reference_doi,
+                   Reference.resolved_paper_id)
+            .where(Reference.paper_id.in_(paper_ids))
+        ).all()
+
+        def to_columns(table: str, rows) -> Dict[str, list]:
+            names = SCHEMAS[table].names[:-1]
+            columns = {name: [row[i] for row in rows] for i, name in enumerate(names)}
+            columns["_part"] = [part] * len(rows)
+            return columns
+
+        return {
+            "authors": to_columns("authors", authors),
+            "keywords": to_columns("keywords", keywords),
+            "references": to_columns("references", references)
+        }
+
+    def _read_part(self, table: str, part: int, columns: Optional[List[str]]) -> pa.Table:
+        """以内存映射方式读取单个分片"""
+        path = self._part_path(table, part)
+        if self.format == "parquet":
+            available = pq.read_schema(path).names
+            data = pq.read_table(path, columns=[c for c in columns if c in available] if columns else None,
+                                 memory_map=True)
+        else:
+            data = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        return self._conform(table, data, columns)
+
+    @staticmethod
+    def _conform(table: str, data: pa.Table, columns: Optional[List[str]]) -> pa.Table:
+        """旧分片缺少后来新增的列时补空值，使各分片的结构一致"""
+        schema = SCHEMAS[table]
+        names = columns if columns else schema.names
+        for name in names:
+            if name not in data.column_names:
+                field = schema.field(name)
+                data = data.append_column(field, pa.nulls(len(data), type=field.type))
+        return data.select(names)
+
+    def _read_all(self, table: str, columns: Optional[List[str]]) -> pa.Table:
+        parts = [self._read_part(table, part, columns) for part in self.manifest["parts"]]
+        if not parts:
+            schema = SCHEMAS[table]
+            return schema.empty_table().select(columns) if columns else schema.empty_table()
+        return pa.concat_tables(parts) if len(parts) > 1 else parts[0]
+
+    def _latest_parts(self) -> Tuple[np.ndarray, np.ndarray]:
+        """每篇论文最新所在分片：(排序后的论文ID, 分片号)"""
+        papers = self._read_all("papers", ["id", "_part"])
+        ids = papers["id"].to_numpy()
+        parts = papers["_part"].to_numpy()
+        order = np.lexsort((parts, ids))
+        ids, parts = ids[order], parts[order]
+        last = np.ones(len(ids), dtype=bool)
+        last[:-1] = ids[1:] != ids[:-1]
+        return ids[last], parts[last]
+
+    def load(self, table: str, columns: Optional[List[str]] = None) -> pa.Table:
+        """读取快照中的一张表
+
+        columns 指定需要的列（不含 _part）。存在多个分片时，
+        每篇论文只保留其最新分片中的行。
+        """
+        if table not in SCHEMAS:
+            raise ValueError(f"Unknown snapshot table: {table}")
+        key = "id" if table == "papers" else "paper_id"
+        if len(self.manifest["parts"]) <= 1:
+            return self._read_all(table, columns)
+
+        read_columns = None
+        if columns is not None:
+            read_columns = list(dict.fromkeys(list(columns) + [key, "_part"]))
+        data = self._read_all(table, read_columns)
+
+        latest_ids, latest_parts = self._latest_parts()
+        keys = data[key].to_numpy()
+        positions = np.searchsorted(latest_ids, keys)
+        mask = latest_parts[positions] == data["_part"].to_numpy()
+        data = data.filter(pa.array(mask))
+        return data.select(columns) if columns is not None else data
+
+    def compact(self):
+        """将所有分片合并为一个去重后的分片"""
+        if len(self.manifest["parts"]) <= 1:
+            return
+        tables = {table: self.load(table) for table in SCHEMAS}
+        old_parts = list(self.manifest["parts"])
+        part = max(old_parts) + 1
+        for table, data in tables.items():
+            data = data.set_column(
+                data.schema.get_field_index("_part"), "_part",
+                pa.array(np.full(len(data), part, dtype=np.int32))
+            )
+            writer = self._open_writer(table, part)
+            try:
+                writer.write_table(data)
+            finally:
+                writer.close()
+
+        self.manifest["parts"] = [part]
+        self._write_manifest()
+        for table in SCHEMAS:
+            for old in old_parts:
+                os.remove(self._part_path(table, old))
+    
+    def _iter_part_batches(self, table: str, part: int, columns: List[str],
+                           chunk_size: int) -> Iterator[pa.Table]:
+        """逐批读取单个分片，每批不超过 chunk_size 行"""
+        path = self._part_path(table, part)
+        if self.format == "parquet":
+            parquet_file = pq.ParquetFile(path, memory_map=True)
+            available = parquet_file.schema_arrow.names
+            batches = parquet_file.iter_batches(batch_size=chunk_size,
+                                                columns=[c for c in columns if c in available])
+        else:
+            # Arrow IPC 文件按记录批次内存映射，切片不复制数据
+            reader = pa.ipc.open_file(pa.memory_map(path, "r"))
+            batches = (
+                batch.slice(offset, chunk_size)
+                for batch in (reader.get_batch(i) for i in range(reader.num_record_batches))
+                for offset in range(0, batch.num_rows, chunk_size)
+            )
+        for batch in batches:
+            yield self._conform(table, pa.Table.from_batches([batch]), columns)
+
+    def iter_chunks(self, table: str, columns: List[str], chunk_size: int = 1000) -> Iterator[List[SimpleNamespace]]:
+        """分块遍历快照中的一张表，每行以属性方式访问，可直接作为流式分析的数据源
+
+        逐个分片按批读取，内存中只保留当前一批（不超过 chunk_size 行）和
+        论文ID到最新分片的映射；被较新分片取代的行在每批内丢弃。
+        """
+        if table not in SCHEMAS:
+            raise ValueError(f"Unknown snapshot table: {table}")
+        key = "id" if table == "papers" else "paper_id"
+        parts = self.manifest["parts"]
+        dedupe = len(parts) > 1
+        read_columns = list(dict.fromkeys(list(columns) + [key, "_part"])) if dedupe else list(columns)
+        if dedupe:
+            latest_ids, latest_parts = self._latest_parts()
+        for part in parts:
+            for data in self._iter_part_batches(table, part, read_columns, chunk_size):
+                if dedupe:
+                    positions = np.searchsorted(latest_ids, data[key].to_numpy())
+                    data = data.filter(pa.array(latest_parts[positions] == part))
+                if len(data):
+                    yield [SimpleNamespace(**row) for row in data.select(list(columns)).to_pylist()]
@@ -0,0 +1,78 @@
+from typing import Callable, Dict, Iterable, List, Optional
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.utils import murmurhash3_32
+
+# 返回一次完整分块遍历的函数；流式算法需要多遍扫描时会多次调用
+ChunkSource = Callable[[], Iterable[List]]
+
+class StreamingTfidf:
+    """基于特征哈希的流式 TF-IDF
+
+    词到列的映射由哈希函数决定，不需要全局词表；文档频率随 partial_fit
+    逐块累加，内存只与 n_features 有关，与语料规模无关。
+    track_terms 为 True 时为每个哈希列记录首次出现的词，用于输出关键词。
+    """
+
+    def __init__(self, n_features: int = 2 ** 18, track_terms: bool = True, **hashing_options):
+        self.n_features = n_features
+        self.track_terms = track_terms
+        self.hasher = HashingVectorizer(
+            n_features=n_features, alternate_sign=False, norm=None, **hashing_options
+        )
+        self.analyzer = self.hasher.build_analyzer()
+        self.document_frequency = np.zeros(n_features, dtype=np.int64)
+        self.n_documents = 0
+        self.terms: Dict[int, str] = {}
+
+    def _index(self, term: str) -> int:
+        """与 HashingVectorizer 相同的列号计算"""
+        return abs(murmurhash3_32(term, seed=0)) % self.n_features
+
+    def partial_fit(self, documents: List[str]) -> 'StreamingTfidf':
+        """累加一块文档的文档频率"""
+        counts = self.hasher.transform(documents).tocsr()
+        counts.sum_duplicates()
+        self.document_frequency += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_documents += len(documents)
+
+        if self.track_terms:
+            for doc in documents:
+                for term in set(self.analyzer(doc)):
+                    self.terms.setdefault(self._index(term), term)
+        return self
+
+    @property
+    def idf(self) -> np.ndarray:
+        """平滑IDF，与 TfidfVectorizer(smooth_idf=True) 的公式一致"""
+        return np.log((1 + self.n_documents) / (1 + self.document_frequency)) + 1
+
+    def transform(self, documents: List[str]) -> sparse.csr_matrix:
+        """计算一块文档的 L2 归一化 TF-IDF"""
+        counts = self.hasher.transform(documents).tocsr()
+        return normalize(counts @ sparse.diags(self.idf), norm='l2', copy=False).tocsr()
+
+    def term(self, index: int) -> Optional[str]:
+        return self.terms.get(index)
+
+    def top_terms(self, scores: np.ndarray, n: int = 10) -> List[str]:
+        """按分数返回前 n 个能还原出词的列"""
+        terms = []
+        for index in np.argsort(scores)[::-1]:
+            if scores[index] <= 0 or len(terms) >= n:
+                break
+            term = self.terms.get(int(index))
+            if term is not None:
+                terms.append(term)
+        return terms
+
+def fit_streaming_tfidf(chunks: ChunkSource, to_text: Callable[[List], List[str]],
+                        n_features: int = 2 ** 18, **hashing_options) -> StreamingTfidf:
+    """遍历一次分块数据，累计文档频率"""
+    model = StreamingTfidf(n_features=n_features, **hashing_options)
+    for chunk in chunks():
+        if chunk:
+            model.partial_fit(to_text(chunk))
+    return model
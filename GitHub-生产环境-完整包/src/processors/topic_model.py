@@ -0,0 +1,77 @@
+from typing import Dict, List
+import os
+import uuid
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.decomposition import LatentDirichletAllocation
+
+class IncrementalTopicModel:
+    """可增量更新的主题模型
+
+    第一次更新时拟合 TF-IDF 词表并固定下来，之后的新论文只做 transform，
+    再用在线 LDA 的 partial_fit 更新主题。模型连同词表一起持久化到磁盘，
+    model_id 标识一次完整训练，重置后旧的论文主题向量随之失效。
+    """
+
+    def __init__(self, path: str, num_topics: int = 5, max_features: int = 1000):
+        self.path = path
+        self.num_topics = num_topics
+        self.max_features = max_features
+        self.reset()
+
+    def reset(self):
+        """丢弃已学到的词表和主题，重新开始"""
+        self.model_id = uuid.uuid4().hex
+        self.vectorizer = TfidfVectorizer(max_features=self.max_features)
+        self.lda = LatentDirichletAllocation(
+            n_components=self.num_topics, learning_method='online', random_state=42
+        )
+        self.n_documents = 0
+
+    @property
+    def fitted(self) -> bool:
+        return self.n_documents > 0
+
+    @classmethod
+    def load(cls, path: str, num_topics: int = 5, max_features: int = 1000) -> 'IncrementalTopicModel':
+        """从磁盘加载模型，不存在或参数不一致时返回新模型"""
+        if os.path.exists(path):
+            model = joblib.load(path)
+            if model.num_topics == num_topics and model.max_features == max_features:
+                model.path = path
+                return model
+        return cls(path, num_topics, max_features)
+
+    def save(self):
+        """原子写入磁盘"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        joblib.dump(self, tmp_path)
+        os.replace(tmp_path, self.path)
+
+    def update(self, documents: List[str]) -> np.ndarray:
+        """用新文档更新模型，返回这些文档的主题分布"""
+        if not documents:
+            return np.zeros((0, self.num_topics))
+        if not self.fitted:
+            self.vectorizer.fit(documents)
+        matrix = self.vectorizer.transform(documents)
+        self.lda.partial_fit(matrix)
+        self.n_documents += len(documents)
+        return self.lda.transform(matrix)
+
+    def transform(self, documents: List[str]) -> np.ndarray:
+        """计算文档的主题分布，不更新模型"""
+        return self.lda.transform(self.vectorizer.transform(documents))
+
+    def topics(self, top_n: int = 10) -> Dict[str, List[str]]:
+        """每个主题权重最高的词，模型尚未拟合时为空"""
+        if not self.fitted:
+            return {}
+        feature_names = self.vectorizer.get_feature_names_out()
+        topics = {}
+        for topic_idx, topic in enumerate(self.lda.components_):
+            top_words = [feature_names[i] for i in topic.argsort()[:-top_n - 1:-1]]
+            topics[f"Topic {topic_idx + 1}"] = top_words
+        return topics
@@ -0,0 +1,230 @@
+import sys
+import os
+import time
+import hashlib
+import threading
+from typing import Callable, Dict, Optional, Set
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.models.database import DatabaseManager, Paper, FileStatus
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+class _PathEventHandler(FileSystemEventHandler):
+    """文件系统事件处理器，将变化的路径交给扫描器"""
+
+    def __init__(self, scanner: 'FileStatusScanner'):
+        super().__init__()
+        self.scanner = scanner
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        for path in (getattr(event, 'src_path', None), getattr(event, 'dest_path', None)):
+            if path:
+                self.scanner.mark_dirty(path)
+
+class FileStatusScanner:
+    """本地文件状态扫描器
+
+    在后台线程中定期检查论文本地文件的存在性、大小、修改时间和哈希，
+    并写入 file_status 表。安装了 watchdog 时额外监听下载目录（Linux 下为 inotify），
+    文件变化会被立即刷新，界面只需一次查询即可读取全部状态。
+    hash_files 为 True 时只对大小或修改时间变化的文件重新计算哈希。
+    """
+
+    def __init__(self, db_manager: DatabaseManager, interval: float = 300,
+                 hash_files: bool = False, watch: bool = True,
+                 on_change: Optional[Callable[[int], None]] = None):
+        self.db_manager = db_manager
+        self.interval = interval
+        self.hash_files = hash_files
+        self.watch = watch and Observer is not None
+        self.on_change = on_change
+
+        self._dirty_paths: Set[str] = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._observer = None
+        self._watched_dirs: Set[str] = set()
+        # 规范化的绝对路径 -> 库中存储的 local_path（可能是相对路径），
+        # 用于把文件系统事件中的绝对路径对应回论文
+        self._stored_paths: Dict[str, Set[str]] = {}
+
+    @staticmethod
+    def normalize_path(path: str) -> str:
+        return os.path.normcase(os.path.normpath(os.path.abspath(path)))
+
+    @staticmethod
+    def file_hash(path: str, chunk_size: int = 1024 * 1024) -> str:
+        """计算文件SHA-256"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _check(self, path: Optional[str], status: Optional[FileStatus]) -> Optional[Dict]:
+        """检查单个文件，状态未变化时返回None"""
+        if not path:
+            stat = None
+        else:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stat = None
+
+        if stat is None:
+            if status is not None and not status.file_exists and status.path == path:
+                return None
+            return {"path": path, "file_exists": False, "size": 0, "mtime": None, "hash": None}
+
+        if (status is not None and status.file_exists and status.path == path
+                and status.size == stat.st_size and status.mtime == stat.st_mtime):
+            return None
+
+        file_hash = None
+        if self.hash_files:
+            try:
+                file_hash = self.file_hash(path)
+            except OSError:
+                return {"path": path, "file_exists": False, "size": 0, "mtime": None, "hash": None}
+        return {"path": path, "file_exists": True, "size": stat.st_size,
+                "mtime": stat.st_mtime, "hash": file_hash}
+
+    def scan(self, paths: Optional[Set[str]] = None) -> int:
+        """扫描文件状态并写入数据库，返回发生变化的记录数
+
+        paths 为空时扫描全部论文，否则只刷新这些路径对应的论文。
+        """
+        session = self.db_manager.Session()
+        try:
+            query = session.query(Paper.id, Paper.local_path, FileStatus).outerjoin(
+                FileStatus, FileStatus.paper_id == Paper.id
+            )
+            if paths is not None:
+                if not paths:
+                    return 0
+                with self._lock:
+                    stored = set(paths).union(*(self._stored_paths.get(p, ()) for p in paths))
+                query = query.filter(Paper.local_path.in_(list(stored)))
+
+            changed = 0
+            for paper_id, local_path, status in query.all():
+                if local_path:
+                    normalized = self.normalize_path(local_path)
+                    with self._lock:
+                        self._stored_paths.setdefault(normalized, set()).add(local_path)
+                    self._watch_dir(os.path.dirname(normalized))
+                values = self._check(local_path, status)
+                if values is None:
+                    continue
+                if status is None:
+                    status = FileStatus(paper_id=paper_id)
+                    session.add(status)
+                for key, value in values.items():
+                    setattr(status, key, value)
+                changed += 1
+
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+        if changed and self.on_change:
+            self.on_change(changed)
+        return changed
+
+    def mark_dirty(self, path: str):
+        """标记需要立即刷新的路径（按规范化的绝对路径与库中路径对应）"""
+        with self._lock:
+            self._dirty_paths.add(self.normalize_path(path))
+        self._wakeup.set()
+
+    def _watch_dir(self, directory: str):
+        """为目录注册文件系统监听"""
+        if self._observer is None or directory in self._watched_dirs or not os.path.isdir(directory):
+            return
+        self._watched_dirs.add(directory)
+        self._observer.schedule(_PathEventHandler(self), directory, recursive=False)
+
+    def _run(self):
+        """后台扫描循环"""
+        next_full_scan = 0.0
+        while not self._stopped.is_set():
+            self._wakeup.clear()
+            try:
+                if time.monotonic() >= next_full_scan:
+                    self.scan()
+                    next_full_scan = time.monotonic() + self.interval
+                with self._lock:
+                    dirty, self._dirty_paths = self._dirty_paths, set()
+                if dirty:
+                    self.scan(dirty)
+            except Exception as e:
+                print(f"扫描本地文件状态时出错: {str(e)}")
+
+            self._wakeup.wait(max(0.0, next_full_scan - time.monotonic()))
+
+    def start(self):
+        """启动后台扫描线程"""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        if self.watch:
+            self._observer = Observer()
+            self._observer.daemon = True
+            self._observer.start()
+        self._thread = threading.Thread(target=self._run, name="file-status-scanner", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """停止后台扫描"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout)
+            self._observer = None
+            self._watched_dirs.clear()
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="扫描论文本地文件状态")
+    parser.add_argument("--db", default=os.path.join(os.getcwd(), 'papers.db'), help="数据库文件路径")
+    parser.add_argument("--watch", action="store_true", help="持续运行并监听文件变化")
+    parser.add_argument("--interval", type=float, default=300, help="全量扫描间隔（秒）")
+    parser.add_argument("--hash", action="store_true", help="计算文件哈希（只对变化的文件）")
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(f'sqlite:///{args.db}')
+    scanner = FileStatusScanner(db_manager, interval=args.interval, hash_files=args.hash)
+    if not args.watch:
+        print(f"更新了 {scanner.scan()} 条文件状态")
+        return
+
+    scanner.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        scanner.stop()
+
+if __name__ == '__main__':
+    main()
@@ -3,15 +3,20 @@ from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                            QHBoxLayout, QLabel, QLineEdit, QPushButton, 
                            QTableWidget, QTableWidgetItem, QHeaderView,
                            QFileDialog, QMessageBox)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 import os
 from datetime import datetime
 from pathlib import Path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from src.models.database import DatabaseManager, Paper, Author, Keyword
+from src.models.database import DatabaseManager
+from src.tools.file_scanner import FileStatusScanner
+from src.tools.paper_queries import query_papers, search_papers
 
 class LocalPapersViewer(QMainWindow):
+    # 后台扫描线程发现文件变化时发出，经Qt队列连接回到界面线程
+    file_status_changed = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("本地论文管理器")
@@ -91,19 +96,39 @@ class LocalPapersViewer(QMainWindow):
         
         # 加载论文数据
         self.load_papers()
+        
+        # 启动本地文件状态扫描，界面只读取 file_status 表
+        self.file_status_changed.connect(self.refresh_current_view)
+        self.file_scanner = FileStatusScanner(
+            self.db_manager,
+            on_change=lambda changed: self.file_status_changed.emit()
+        )
+        self.file_scanner.start()
+    
+    def closeEvent(self, event):
+        """关闭窗口时停止后台扫描"""
+        self.file_scanner.stop()
+        super().closeEvent(event)
+    
+    def refresh_current_view(self):
+        """文件状态变化后刷新当前视图"""
+        if self.search_input.text().strip():
+            self.perform_search()
+        else:
+            self.load_papers()
     
     def load_papers(self):
         """加载所有论文"""
         session = self.db_manager.Session()
         try:
-            papers = session.query(Paper).all()
-            print(f"找到 {len(papers)} 篇论文")
+            rows = query_papers(session).all()
+            print(f"找到 {len(rows)} 篇论文")
             
-            self.display_papers(papers)
+            self.display_papers(rows)
             
             # 更新统计信息
-            total_papers = len(papers)
-            total_size = sum(os.path.getsize(p.local_path) for p in papers if p.local_path and os.path.exists(p.local_path))
+            total_papers = len(rows)
+            total_size = sum(status.size or 0 for _, status in rows if status is not None and status.file_exists)
             self.stats_label.setText(f"共 {total_papers} 篇论文 | 已下载: {self.format_size(total_size)}")
             
         except Exception as e:
@@ -122,12 +147,9 @@ class LocalPapersViewer(QMainWindow):
         session = self.db_manager.Session()
         try:
             # 搜索标题或作者
-            papers = session.query(Paper).filter(
-                (Paper.title.ilike(f'%{search_text}%')) |
-                Paper.authors.any(Author.name.ilike(f'%{search_text}%'))
-            ).all()
+            rows = search_papers(session, search_text).all()
             
-            self.display_papers(papers)
+            self.display_papers(rows)
             
         except Exception as e:
             print(f"搜索论文时出错: {str(e)}")
@@ -135,12 +157,14 @@ class LocalPapersViewer(QMainWindow):
         finally:
             session.close()
     
-    def display_papers(self, papers):
-        """在表格中显示论文"""
-        self.table.setRowCount(len(papers))
+    def display_papers(self, rows):
+        """在表格中显示论文，rows 为 (论文, 文件状态) 对"""
+        self.table.setRowCount(len(rows))
         
-        for row, paper in enumerate(papers):
+        for row, (paper, status) in enumerate(rows):
             try:
+                downloaded = status is not None and status.file_exists and status.path == paper.local_path
+                
                 # 标题
                 self.table.setItem(row, 0, QTableWidgetItem(paper.title))
                 
@@ -166,7 +190,7 @@ class LocalPapersViewer(QMainWindow):
                 
                 # 本地路径
                 path_item = QTableWidgetItem(paper.local_path or '未下载')
-                if paper.local_path and os.path.exists(paper.local_path):
+                if downloaded:
                     path_item.setForeground(Qt.GlobalColor.darkGreen)
                 else:
                     path_item.setForeground(Qt.GlobalColor.red)
@@ -174,7 +198,7 @@ class LocalPapersViewer(QMainWindow):
                 self.table.setItem(row, 7, path_item)
                 
                 # 操作按钮
-                if paper.local_path and os.path.exists(paper.local_path):
+                if downloaded:
                     open_button = QPushButton("打开")
                     open_button.clicked.connect(lambda checked, p=paper.local_path: self.open_paper(p))
                 else:
@@ -0,0 +1,16 @@
+from src.models.database import Paper, Author, FileStatus
+
+# 本地论文管理器使用的查询，不依赖界面，便于复用和基准测试
+
+def query_papers(session):
+    """论文及其本地文件状态的联合查询"""
+    return session.query(Paper, FileStatus).outerjoin(
+        FileStatus, FileStatus.paper_id == Paper.id
+    )
+
+def search_papers(session, search_text: str):
+    """按标题或作者名模糊搜索"""
+    return query_papers(session).filter(
+        (Paper.title.ilike(f'%{search_text}%')) |
+        Paper.authors.any(Author.name.ilike(f'%{search_text}%'))
+    )
@@ -0,0 +1,164 @@
+import os
+import sys
+from datetime import date
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "src"))
+
+import numpy as np
+from src.processors.burst_detector import BurstDetector
+
+def _detector(path, **options):
+    return BurstDetector(path, window_days=3, width=2 ** 10, depth=3, capacity=50,
+                         min_count=2, min_ratio=2.0, stop_words=[], **options)
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "bursts.npz")
+    detector = _detector(path)
+    for day in (date(2024, 1, 1), date(2024, 1, 2)):
+        detector.add("alpha beta", day)
+    for _ in range(4):
+        detector.add("gamma delta", date(2024, 1, 3))
+    detector.save()
+
+    loaded = BurstDetector.load(path)
+    assert loaded.day == detector.day
+    assert loaded.papers == detector.papers
+    assert loaded.history_papers == detector.history_papers
+    assert loaded.today.counts == detector.today.counts
+    assert loaded.completed == detector.completed
+    assert np.array_equal(loaded.today_sketch.table, detector.today_sketch.table)
+    for a, b in zip(loaded.history, detector.history):
+        assert np.array_equal(a.table, b.table)
+    assert loaded.bursts() == detector.bursts()
+
+def test_state_loads_under_both_module_names(tmp_path):
+    # 界面程序以 processors.* 导入，命令行以 src.processors.* 导入，状态文件必须通用
+    from processors.burst_detector import BurstDetector as GuiBurstDetector
+
+    path = str(tmp_path / "bursts.npz")
+    detector = GuiBurstDetector(path, stop_words=[])
+    detector.add("alpha beta", date(2024, 1, 1))
+    detector.save()
+
+    loaded = BurstDetector.load(path)
+    assert isinstance(loaded, BurstDetector)
+    assert loaded.papers == 1
+    with np.load(path, allow_pickle=False) as arrays:
+        assert set(arrays.files) == {"state", "today_sketch", "history"}
+
+def test_count_min_sketch_never_underestimates():
+    from src.processors.burst_detector import CountMinSketch
+
+    rng = np.random.default_rng(0)
+    items = [f"term{i}" for i in rng.integers(0, 500, size=5000)]
+    sketch = CountMinSketch(width=64, depth=4)
+    sketch.add_many(items)
+    unique, counts = np.unique(items, return_counts=True)
+    estimates = sketch.estimate_many(list(unique))
+    assert (estimates >= counts).all()
+    assert estimates.sum() > counts.sum()  # 宽度远小于项数，必然有碰撞
+
+    wide = CountMinSketch(width=2 ** 16, depth=4)
+    wide.add_many(["a", "b", "b"])
+    assert wide.estimate_many(["a", "b", "c"]).tolist() == [1, 2, 0]
+    wide.clear()
+    assert wide.estimate_many(["b"]).tolist() == [0]
+
+def test_space_saving_tracks_heavy_hitters_with_error_bounds():
+    from src.processors.burst_detector import SpaceSaving
+
+    rng = np.random.default_rng(1)
+    stream = ["heavy"] * 300 + ["medium"] * 120 + [f"rare{i}" for i in rng.integers(0, 2000, size=600)]
+    rng.shuffle(stream)
+    summary = SpaceSaving(capacity=20)
+    for item in stream:
+        summary.add(item)
+
+    assert len(summary.counts) == 20
+    top = {item: (count, error) for item, count, error in summary.top()}
+    truth = {item: stream.count(item) for item in top}
+    for item, (count, error) in top.items():
+        assert count - error <= truth[item] <= count
+    # 出现次数超过 总数/capacity 的项一定被跟踪
+    assert "heavy" in top and "medium" in top
+    assert summary.top(1)[0][0] == "heavy"
+
+def test_advance_rotates_window():
+    detector = _detector(None)
+    detector.add("alpha", date(2024, 1, 1))
+    detector.add("alpha", date(2024, 1, 1))
+    detector.add("beta", date(2024, 1, 2))
+    assert detector.day == date(2024, 1, 2)
+    assert detector.papers == 1
+    assert detector.history_papers == [2, 0, 0]
+    assert detector.history[0].estimate_many(["alpha"]).tolist() == [2]
+    assert date(2024, 1, 1) in detector.completed
+
+    # 跳过一天：空白的一天也占一个窗口位置
+    detector.add("gamma", date(2024, 1, 4))
+    assert detector.history_papers == [0, 1, 2]
+    assert detector.history[2].estimate_many(["alpha"]).tolist() == [2]
+
+    # 迟到的论文计入对应的历史窗口，超出窗口的被丢弃
+    detector.add("delta", date(2024, 1, 3))
+    detector.add("epsilon", date(2023, 12, 1))
+    assert detector.history_papers == [1, 1, 2]
+    assert detector.papers == 1
+
+    # 间隔超过窗口时整个窗口被清空
+    detector.add("zeta", date(2024, 2, 1))
+    assert detector.history_papers == [0, 0, 0]
+    assert all(not sketch.table.any() for sketch in detector.history)
+    assert detector.today.top() == [("zeta", 1, 0)]
+
+def test_commit_hook_counts_only_new_papers():
+    from src.models.database import DatabaseManager
+
+    db_manager = DatabaseManager("sqlite://")
+    detector = _detector(None)
+    db_manager.commit_hooks.append(detector.on_commit)
+    papers = [
+        {"title": f"Paper {i}", "abstract": "burst term", "authors": [], "keywords": [],
+         "url": f"https://example.org/{i}", "published_date": None}
+        for i in range(3)
+    ]
+    db_manager.add_papers(papers)
+    # 重复爬取：同样的论文再次入库被跳过，不再计数
+    db_manager.add_papers(papers)
+    assert detector.papers == 3
+    assert dict((term, count) for term, count, _ in detector.today.top())["burst term"] == 3
+
+def test_commit_hook_keys_counts_by_published_day(tmp_path):
+    from datetime import datetime
+    from src.models.database import DatabaseManager
+    from src.processors.paper_processor import PaperProcessor
+
+    path = str(tmp_path / "bursts.npz")
+    db_manager = DatabaseManager("sqlite://")
+    detector = _detector(path)
+    db_manager.commit_hooks.append(detector.on_commit)
+    papers = [
+        {"title": f"Paper {i}", "abstract": "quiet baseline", "authors": [], "keywords": [],
+         "url": f"https://example.org/old/{i}", "published_date": datetime(2024, 1, 4)}
+        for i in range(2)
+    ] + [
+        {"title": f"Paper {i}", "abstract": "burst term", "authors": [], "keywords": [],
+         "url": f"https://example.org/new/{i}", "published_date": datetime(2024, 1, 5, 13)}
+        for i in range(3)
+    ]
+    db_manager.add_papers(papers)
+    detector.save()
+    assert detector.day == date(2024, 1, 5)
+    assert detector.history_papers[0] == 2
+
+    # 日报按发布日期查询突发词
+    config = {
+        "classification": {"categories": [], "model_path": str(tmp_path / "no_model.joblib")},
+        "search": {"keywords": {}},
+        "burst": {"state_path": path},
+    }
+    processor = PaperProcessor(config, db_manager)
+    terms = [item["term"] for item in processor.daily_bursts(datetime(2024, 1, 5))]
+    assert "burst term" in terms
+    assert processor.daily_bursts(datetime(2024, 1, 4)) == []
@@ -0,0 +1,48 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.processors.dtm_store import DocumentTermStore
+
+def test_append_extends_vocabulary_and_latest_rows_in_place(tmp_path, monkeypatch):
+    store = DocumentTermStore(str(tmp_path))
+    store.append([1, 2], ["a" * 40, "b" * 40], ["graph neural network", "neural field"])
+    assert store.rows([1, 2]) == [0, 1]
+
+    # 追加时不重建 latest_rows，也不重写已有词表
+    monkeypatch.setattr(store, "_array", lambda name: (_ for _ in ()).throw(AssertionError(name)))
+    vocabulary_path = os.path.join(str(tmp_path), DocumentTermStore.VOCABULARY)
+    with open(vocabulary_path, "rb") as f:
+        before = f.read()
+    store.append([1, 3], ["c" * 40, "d" * 40], ["graph transformer", "café field"])
+    monkeypatch.undo()
+
+    with open(vocabulary_path, "rb") as f:
+        after = f.read()
+    assert after.startswith(before) and len(after) == store.meta["vocabulary_bytes"]
+    assert store.rows([1, 2, 3], ["c" * 40, "b" * 40, "d" * 40]) == [2, 1, 3]
+
+    reopened = DocumentTermStore(str(tmp_path))
+    assert reopened.vocabulary == store.vocabulary
+    assert reopened.latest_rows() == store.latest_rows()
+    assert (reopened.matrix() != store.matrix()).nnz == 0
+    assert reopened.matrix()[3, reopened.term_ids["café"]] == 1
+
+def test_unfinished_append_is_truncated(tmp_path):
+    store = DocumentTermStore(str(tmp_path))
+    store.append([1], ["a" * 40], ["alpha beta"])
+    # 模拟写入数组和词表后、写 meta 前中断
+    with open(os.path.join(str(tmp_path), DocumentTermStore.VOCABULARY), "ab") as f:
+        f.write("\nstale".encode("utf-8"))
+    with open(os.path.join(str(tmp_path), "data.bin"), "ab") as f:
+        f.write(np.ones(3, dtype=np.float32).tobytes())
+
+    reopened = DocumentTermStore(str(tmp_path))
+    assert reopened.vocabulary == ["alpha", "beta"]
+    reopened.append([2], ["b" * 40], ["beta gamma"])
+    again = DocumentTermStore(str(tmp_path))
+    assert again.vocabulary == ["alpha", "beta", "gamma"]
+    assert again.matrix().toarray().tolist() == [[1, 1, 0], [0, 1, 1]]
+    assert again.rows([1, 2]) == [0, 1]
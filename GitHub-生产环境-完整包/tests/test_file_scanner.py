@@ -0,0 +1,56 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.database import DatabaseManager, FileStatus, Paper
+from src.tools.file_scanner import FileStatusScanner
+
+def _setup(tmp_path, monkeypatch):
+    # 下载目录为相对路径时，库中存储的 local_path 也是相对路径
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("downloads/arxiv")
+    with open("downloads/arxiv/paper.pdf", "wb") as f:
+        f.write(b"%PDF-1.4")
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'papers.db'}")
+    db_manager.add_paper({"title": "Paper", "authors": [], "keywords": [], "url": "u",
+                          "local_path": os.path.join("downloads", "arxiv", "paper.pdf")})
+    session = db_manager.Session()
+    try:
+        paper_id = session.query(Paper.id).scalar()
+    finally:
+        session.close()
+    return db_manager, paper_id
+
+def _status(db_manager, paper_id) -> FileStatus:
+    session = db_manager.Session()
+    try:
+        return session.query(FileStatus).filter_by(paper_id=paper_id).one()
+    finally:
+        session.close()
+
+def test_event_with_absolute_path_refreshes_paper_stored_relative(tmp_path, monkeypatch):
+    db_manager, paper_id = _setup(tmp_path, monkeypatch)
+    scanner = FileStatusScanner(db_manager, watch=False)
+    assert scanner.scan() == 1
+    assert _status(db_manager, paper_id).size == 8
+
+    with open("downloads/arxiv/paper.pdf", "ab") as f:
+        f.write(b" more bytes")
+    # 文件监听事件携带绝对路径
+    scanner.mark_dirty(str(tmp_path / "downloads" / "arxiv" / "paper.pdf"))
+    assert scanner.scan(scanner._dirty_paths) == 1
+    status = _status(db_manager, paper_id)
+    assert status.size == 19
+    assert status.path == os.path.join("downloads", "arxiv", "paper.pdf")
+
+def test_full_scan_hashes_only_changed_files(tmp_path, monkeypatch):
+    db_manager, _ = _setup(tmp_path, monkeypatch)
+    assert FileStatusScanner(db_manager, watch=False).hash_files is False
+
+    scanner = FileStatusScanner(db_manager, watch=False, hash_files=True)
+    calls = []
+    file_hash = FileStatusScanner.file_hash
+    monkeypatch.setattr(scanner, "file_hash", lambda path: calls.append(path) or file_hash(path))
+    scanner.scan()
+    scanner.scan()
+    assert len(calls) == 1
@@ -0,0 +1,69 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import networkx as nx
+import numpy as np
+import pytest
+from src.processors.graph_engine import CitationGraph, CollaborationGraph
+
+def test_eigenvector_centrality_disconnected_is_deterministic_and_non_negative():
+    author_lists = [['a', 'b', 'c'], ['d', 'e', 'f'], ['g', 'h'], ['i', 'j']]
+    results = []
+    for _ in range(5):
+        graph = CollaborationGraph(author_lists)
+        results.append(graph.to_dict(graph.eigenvector_centrality()))
+    assert all(result == results[0] for result in results)
+
+    values = np.array(list(results[0].values()))
+    assert (values >= 0).all()
+    assert np.isclose(np.linalg.norm(values), 1.0)
+    # 两个三角形的主特征值并列最大，等权；两条孤立边为 0
+    for author in 'abcdef':
+        assert np.isclose(results[0][author], 1 / np.sqrt(6))
+    for author in 'ghij':
+        assert results[0][author] == 0.0
+
+def test_eigenvector_centrality_matches_networkx_on_leading_component():
+    rng = np.random.default_rng(0)
+    author_lists = [list(rng.choice(200, size=rng.integers(2, 5), replace=False)) for _ in range(120)]
+    graph = CollaborationGraph(author_lists)
+    result = graph.to_dict(graph.eigenvector_centrality())
+
+    reference_graph = nx.Graph()
+    for authors in author_lists:
+        reference_graph.add_edges_from((a, b) for a in authors for b in authors if a != b)
+    leading = max(nx.connected_components(reference_graph), key=len)
+    reference = nx.eigenvector_centrality_numpy(reference_graph.subgraph(leading))
+    for author, value in reference.items():
+        assert np.isclose(result[author], value, atol=1e-8)
+    assert all(result[author] == 0.0 for author in result if author not in leading)
+
+def _random_citation_graph(seed: int = 1):
+    """含悬挂节点、互引边和孤立节点的随机有向图"""
+    reference_graph = nx.gnp_random_graph(60, 0.06, seed=seed, directed=True)
+    graph = CitationGraph()
+    for node in reference_graph.nodes:
+        graph.add_node(node)
+    for source, target in reference_graph.edges:
+        graph.add_edge(source, target)
+    return graph, reference_graph
+
+def test_citation_graph_pagerank_matches_networkx():
+    graph, reference_graph = _random_citation_graph()
+    result = graph.to_dict(graph.pagerank(tol=1e-12, max_iter=1000))
+    reference = nx.pagerank(reference_graph, tol=1e-12, max_iter=1000)
+    assert result == pytest.approx(reference, abs=1e-9)
+
+def test_citation_graph_exact_betweenness_matches_networkx():
+    graph, reference_graph = _random_citation_graph()
+    result = graph.to_dict(graph.betweenness_centrality(k=None, batch_size=7))
+    reference = nx.betweenness_centrality(reference_graph, k=None)
+    assert result == pytest.approx(reference, abs=1e-12)
+
+def test_citation_graph_clustering_matches_networkx():
+    graph, reference_graph = _random_citation_graph()
+    result = graph.to_dict(graph.clustering())
+    reference = nx.clustering(reference_graph)
+    assert result == pytest.approx(reference, abs=1e-12)
+    assert graph.average_clustering() == pytest.approx(nx.average_clustering(reference_graph), abs=1e-12)
@@ -0,0 +1,42 @@
+import os
+import random
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src.processors.keyword_matcher import KeywordMatcher
+
+def _first_match(keywords, text):
+    """原 classify_paper 的逐个关键词检查，首个命中即返回"""
+    for category, category_keywords in keywords.items():
+        for keyword in category_keywords:
+            if keyword.lower() in text.lower():
+                return category
+    return None
+
+def _random_keywords(rng, alphabet, n_categories, per_category):
+    return {
+        f"c{i}": [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 5))) for _ in range(per_category)]
+        for i in range(n_categories)
+    }
+
+KEYWORD_SETS = [
+    # 互为前后缀的关键词、跨类别重复、大小写
+    {"a": ["hers", "His"], "b": ["she", "he"], "c": ["HIS", "ushers"], "d": ["s"]},
+    {"computer_vision": ["Segmentation", "transformer"], "industrial_vision": ["defect", "seg"],
+     "medical_imaging": ["MRI", "lesion", "transformer"]},
+    # 靠后的类别有空关键词时匹配任何文本
+    {"a": ["xyz"], "b": [""]},
+]
+
+@pytest.mark.parametrize("automaton_threshold", [0, 256], ids=["automaton", "default"])
+def test_matcher_matches_first_match_loop(automaton_threshold):
+    rng = random.Random(0)
+    keyword_sets = KEYWORD_SETS + [_random_keywords(rng, "abcAB", 6, rng.randint(1, 8)) for _ in range(30)]
+    for keywords in keyword_sets:
+        matcher = KeywordMatcher(keywords, automaton_threshold=automaton_threshold)
+        assert matcher.use_automaton == (automaton_threshold == 0)
+        texts = ["", "ushers", "This IS HIS", "Transformer-based MRI segmentation", "no hit"]
+        texts += [''.join(rng.choice("abcAB ") for _ in range(rng.randint(0, 30))) for _ in range(50)]
+        assert matcher.match_many(texts) == [_first_match(keywords, text) for text in texts]
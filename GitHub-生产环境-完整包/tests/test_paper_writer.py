@@ -0,0 +1,42 @@
+import os
+import sys
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.paper_writer import PaperWriter
+
+class _RecordingDB:
+    """记录 add_papers 调用的数据库替身，可阻塞写入"""
+
+    def __init__(self):
+        self.batches = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def add_papers(self, papers):
+        self.release.wait()
+        self.batches.append([p["url"] for p in papers])
+        return list(range(len(papers)))
+
+def test_flush_without_thread_writes_synchronously():
+    db = _RecordingDB()
+    writer = PaperWriter(db, batch_size=2)
+    for i in range(3):
+        writer.put({"url": f"u{i}"})
+    assert writer.flush(timeout=1)
+    assert db.batches == [["u0", "u1"], ["u2"]]
+    assert writer.written == 3
+
+def test_close_keeps_thread_until_it_stops():
+    db = _RecordingDB()
+    db.release.clear()
+    writer = PaperWriter(db, batch_size=1)
+    writer.start()
+    writer.put({"url": "u0"})
+    assert writer.close(timeout=0.1) is False
+    assert writer._thread is not None
+
+    db.release.set()
+    assert writer.close(timeout=5) is True
+    assert writer._thread is None
+    assert db.batches == [["u0"]]
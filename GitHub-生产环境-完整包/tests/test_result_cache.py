@@ -0,0 +1,46 @@
+import json
+import math
+import os
+import sys
+from datetime import date, datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from src.processors.result_cache import ResultCache
+
+def test_results_round_trip_through_json(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    dates = pd.Series([datetime(2024, 1, 1), datetime(2024, 1, 1), datetime(2024, 2, 3)])
+    monthly = dates.dt.to_period('M').value_counts().sort_index()
+    value = {
+        "daily_counts": dates.value_counts().sort_index().to_dict(),
+        "monthly_counts": monthly.to_dict(),
+        "trend": monthly.rolling(window=3).mean().to_dict(),
+        "key_papers": [("Paper", np.float64(0.25))],
+        "topics": {"Topic 1": [np.str_("vision")]},
+        "counts": {2024: np.int64(3), date(2024, 1, 1): 1},
+        "tagged": {"__tuple__": 1},
+    }
+    cache.put("key", value)
+    assert [entry.name for entry in os.scandir(str(tmp_path))] == ["key.json"]
+    with open(tmp_path / "key.json", encoding="utf-8") as f:
+        json.load(f)
+
+    hit, result = cache.get("key")
+    assert hit
+    assert result["daily_counts"] == value["daily_counts"]
+    assert result["monthly_counts"] == value["monthly_counts"]
+    assert list(result["trend"]) == list(value["trend"])
+    assert all(math.isnan(v) for v in result["trend"].values())
+    assert result["key_papers"] == [("Paper", 0.25)]
+    assert result["topics"] == {"Topic 1": ["vision"]}
+    assert result["counts"] == {2024: 3, date(2024, 1, 1): 1}
+    assert result["tagged"] == {"__tuple__": 1}
+
+def test_unsupported_values_are_not_cached(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put("key", {"value": object()})
+    assert cache.get("key") == (False, None)
+    assert os.listdir(str(tmp_path)) == []
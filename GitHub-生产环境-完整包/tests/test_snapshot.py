@@ -0,0 +1,61 @@
+import os
+import sys
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from src.models.database import DatabaseManager, Paper
+from src.processors.snapshot import CorpusSnapshot
+
+def _snapshot(tmp_path, format: str) -> CorpusSnapshot:
+    """两个分片的快照：第二次导出更新了部分论文的标题"""
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'papers.db'}")
+    db_manager.add_papers([
+        {"title": f"Paper {i}", "abstract": "text", "authors": [f"Author {i % 7}"], "keywords": [],
+         "url": f"https://example.org/{i}", "published_date": datetime(2024, 1, 1) + timedelta(days=i)}
+        for i in range(100)
+    ])
+    snapshot = CorpusSnapshot(str(tmp_path / "snapshot"), format=format)
+    snapshot.export(db_manager, chunk_size=30)
+
+    session = db_manager.Session()
+    for paper in session.query(Paper).filter(Paper.id % 10 == 0):
+        paper.title = f"Updated {paper.id}"
+        paper.updated_at = datetime.now() + timedelta(seconds=1)
+    session.commit()
+    session.close()
+    snapshot.export(db_manager, chunk_size=30)
+    assert len(snapshot.manifest["parts"]) == 2
+    return snapshot
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_iter_chunks_streams_parts_and_drops_superseded_rows(tmp_path, monkeypatch, format):
+    snapshot = _snapshot(tmp_path, format)
+    expected = snapshot.load("papers", ["id", "title"]).to_pylist()
+
+    # 只允许读取论文ID到最新分片的映射，不允许整表读入
+    read_all = CorpusSnapshot._read_all
+    def guarded_read_all(self, table, columns):
+        assert (table, columns) == ("papers", ["id", "_part"])
+        return read_all(self, table, columns)
+    monkeypatch.setattr(CorpusSnapshot, "_read_all", guarded_read_all)
+
+    # 记录从分片文件中一次读入的最大行数
+    peak = []
+    iter_part_batches = CorpusSnapshot._iter_part_batches
+    def counting_iter_part_batches(self, *args):
+        for data in iter_part_batches(self, *args):
+            peak.append(len(data))
+            yield data
+    monkeypatch.setattr(CorpusSnapshot, "_iter_part_batches", counting_iter_part_batches)
+
+    chunks = list(snapshot.iter_chunks("papers", ["id", "title"], chunk_size=8))
+    assert max(peak) <= 8
+    assert all(0 < len(chunk) <= 8 for chunk in chunks)
+    rows = sorted(((p.id, p.title) for chunk in chunks for p in chunk))
+    assert rows == sorted((row["id"], row["title"]) for row in expected)
+    assert dict(rows)[10] == "Updated 10"
+    assert len(rows) == 100
+
+    authors = [row for chunk in snapshot.iter_chunks("authors", ["paper_id", "name"], chunk_size=8) for row in chunk]
+    assert sorted(row.paper_id for row in authors) == list(range(1, 101))
@@ -0,0 +1,53 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src.processors.text_pipeline import TextPreprocessor
+
+TEXTS = [
+    "Transformers' attention: self-attention, cross-attention & more!",
+    "We trained 3 models on 1,024 images (2.5% noise) in 2023.",
+    "The cats were running; dogs' bones and mice, geese, analyses.",
+    "U.S.-based e-mail isn't cheap -- it's 10x faster... really?",
+    "中文 标题 与 English words mixed, with numbers 42 and 4.2",
+    "",
+]
+
+@pytest.fixture(scope="module")
+def nltk_parts():
+    """直接加载 NLTK 分词、词形还原和停用词，数据缺失时跳过（不触发下载）"""
+    from nltk.corpus import stopwords
+    from nltk.stem import WordNetLemmatizer
+    from nltk.tokenize import word_tokenize
+
+    try:
+        word_tokenize("probe text.")
+        lemmatizer = WordNetLemmatizer()
+        lemmatizer.lemmatize("probes")
+        stop_words = frozenset(stopwords.words('english'))
+    except LookupError as e:
+        lines = [line.strip() for line in str(e).splitlines() if line.strip().strip('*')]
+        pytest.skip(f"NLTK data missing: {lines[0] if lines else e}")
+    return word_tokenize, lemmatizer, stop_words
+
+def _reference(text, word_tokenize, lemmatizer, stop_words):
+    """原 PaperAnalyzer.preprocess_text 的逐篇处理流程"""
+    tokens = word_tokenize(text.lower())
+    tokens = [lemmatizer.lemmatize(token) for token in tokens]
+    tokens = [token for token in tokens if token not in stop_words and token.isalnum()]
+    return ' '.join(tokens)
+
+@pytest.mark.parametrize("workers, parallel_threshold", [(1, 1000), (2, 0)], ids=["serial", "pool"])
+def test_compat_mode_matches_reference(nltk_parts, workers, parallel_threshold):
+    word_tokenize, lemmatizer, stop_words = nltk_parts
+    expected = [_reference(text, word_tokenize, lemmatizer, stop_words) for text in TEXTS]
+
+    preprocessor = TextPreprocessor(stop_words, mode="compat", workers=workers,
+                                    chunk_size=2, parallel_threshold=parallel_threshold)
+    try:
+        assert preprocessor.process(TEXTS) == expected
+        assert [preprocessor.process_one(text) for text in TEXTS] == expected
+    finally:
+        preprocessor.close()
@@ -0,0 +1,48 @@
+import math
+import os
+import sys
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import select
+
+from benchmarks.synthetic import generate_corpus
+from src.models.database import DatabaseManager
+
+def _reference_top_terms(db_manager, start, end, k, exclude):
+    """在 Python 中对窗口内全部词计算得分并排序"""
+    store = db_manager.trend_store
+    table, daily = store.term_counts, store.daily_counts
+    with db_manager.engine.connect() as conn:
+        days = [row.day for row in conn.execute(select(daily.c.day, daily.c.paper_count))
+                if start <= row.day < end]
+        n_documents = sum(row.paper_count for row in conn.execute(select(daily.c.day, daily.c.paper_count))
+                          if row.day in days)
+        totals = {}
+        for term, day, count, df in conn.execute(select(table.c.term, table.c.day, table.c.term_count,
+                                                        table.c.doc_count)):
+            if day in days:
+                old_count, old_df = totals.get(term, (0, 0))
+                totals[term] = (old_count + count, old_df + df)
+    scores = [(term, count * (math.log((1 + n_documents) / (1 + df)) + 1))
+              for term, (count, df) in totals.items() if term not in exclude]
+    scores.sort(key=lambda item: (-item[1], item[0]))
+    return scores[:k]
+
+@pytest.mark.parametrize("k", [1, 5, 30])
+def test_top_terms_matches_full_ranking(tmp_path, k):
+    db_manager = DatabaseManager(f"sqlite:///{tmp_path / 'papers.db'}")
+    db_manager.add_papers(generate_corpus(300, 7, days=30))
+    with db_manager.engine.connect() as conn:
+        first_day = min(day for (day,) in conn.execute(select(db_manager.trend_store.daily_counts.c.day)))
+    first_day = datetime.strptime(first_day, "%Y-%m-%d")
+    exclude = {"learning", "model", "image"}
+
+    # 全部日期和前 5 天两个窗口
+    for start, end in [(datetime(2000, 1, 1), datetime(2100, 1, 1)), (first_day, first_day + timedelta(days=5))]:
+        result = db_manager.top_terms(start, end, k, exclude=exclude)
+        reference = _reference_top_terms(db_manager, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"),
+                                         k, exclude)
+        assert [term for term, _ in result] == [term for term, _ in reference]
+        assert [score for _, score in result] == pytest.approx([score for _, score in reference])